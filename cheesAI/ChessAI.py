@@ -1,102 +1,778 @@
 """
 AI hareketlerini idare etmek.
 """
+import queue
 import random
-
-piece_score = {"K": 0, "Q": 9, "R": 5, "B": 3, "N": 3, "p": 1}
-
-knight_scores = [[0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0],
-                 [0.1, 0.3, 0.5, 0.5, 0.5, 0.5, 0.3, 0.1],
-                 [0.2, 0.5, 0.6, 0.65, 0.65, 0.6, 0.5, 0.2],
-                 [0.2, 0.55, 0.65, 0.7, 0.7, 0.65, 0.55, 0.2],
-                 [0.2, 0.5, 0.65, 0.7, 0.7, 0.65, 0.5, 0.2],
-                 [0.2, 0.55, 0.6, 0.65, 0.65, 0.6, 0.55, 0.2],
-                 [0.1, 0.3, 0.5, 0.55, 0.55, 0.5, 0.3, 0.1],
-                 [0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0]]
-
-bishop_scores = [[0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.0],
-                 [0.2, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.2],
-                 [0.2, 0.4, 0.5, 0.6, 0.6, 0.5, 0.4, 0.2],
-                 [0.2, 0.5, 0.5, 0.6, 0.6, 0.5, 0.5, 0.2],
-                 [0.2, 0.4, 0.6, 0.6, 0.6, 0.6, 0.4, 0.2],
-                 [0.2, 0.6, 0.6, 0.6, 0.6, 0.6, 0.6, 0.2],
-                 [0.2, 0.5, 0.4, 0.4, 0.4, 0.4, 0.5, 0.2],
-                 [0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.0]]
-
-rook_scores = [[0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25],
-               [0.5, 0.75, 0.75, 0.75, 0.75, 0.75, 0.75, 0.5],
-               [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-               [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-               [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-               [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-               [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-               [0.25, 0.25, 0.25, 0.5, 0.5, 0.25, 0.25, 0.25]]
-
-queen_scores = [[0.0, 0.2, 0.2, 0.3, 0.3, 0.2, 0.2, 0.0],
-                [0.2, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.2],
-                [0.2, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.2],
-                [0.3, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.3],
-                [0.4, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.3],
-                [0.2, 0.5, 0.5, 0.5, 0.5, 0.5, 0.4, 0.2],
-                [0.2, 0.4, 0.5, 0.4, 0.4, 0.4, 0.4, 0.2],
-                [0.0, 0.2, 0.2, 0.3, 0.3, 0.2, 0.2, 0.0]]
-
-pawn_scores = [[0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8],
-               [0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7],
-               [0.3, 0.3, 0.4, 0.5, 0.5, 0.4, 0.3, 0.3],
-               [0.25, 0.25, 0.3, 0.45, 0.45, 0.3, 0.25, 0.25],
-               [0.2, 0.2, 0.2, 0.4, 0.4, 0.2, 0.2, 0.2],
-               [0.25, 0.15, 0.1, 0.2, 0.2, 0.1, 0.15, 0.25],
-               [0.25, 0.3, 0.3, 0.0, 0.0, 0.3, 0.3, 0.25],
-               [0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2]]
-
-piece_position_scores = {"wN": knight_scores,
-                         "bN": knight_scores[::-1],
-                         "wB": bishop_scores,
-                         "bB": bishop_scores[::-1],
-                         "wQ": queen_scores,
-                         "bQ": queen_scores[::-1],
-                         "wR": rook_scores,
-                         "bR": rook_scores[::-1],
-                         "wp": pawn_scores,
-                         "bp": pawn_scores[::-1]}
+import time
+import ChessBook
+import ChessEngine
+import ChessTablebase
 
 CHECKMATE = 1000
 STALEMATE = 0
-DEPTH = 3
+MAX_DEPTH = 32  # yinelemeli derinleştirmenin çıkabileceği en büyük derinlik
+TIME_LIMIT = 3.0  # hamle başına düşünme süresi (saniye)
+DEBUG_EVALUATION = False  # True ise artımlı skor her yaprakta tam hesaplamayla karşılaştırılır
+
+# transpozisyon tablosu kayıt türleri
+EXACT = 0  # skor tam değer
+LOWER_BOUND = 1  # beta kesmesi oldu, gerçek skor en az bu kadar
+UPPER_BOUND = 2  # hiçbir hamle alfayı geçemedi, gerçek skor en fazla bu kadar
+TRANSPOSITION_TABLE_SIZE = 1 << 18  # yuva sayısı, 2'nin kuvveti olmalı
+MAX_PLY = 64
+MOVE_ORDERING = True  # False ise hamleler yalnızca karıştırılır (eski davranış, karşılaştırma için)
+STAGED_MOVE_GENERATION = True  # iç düğümlerde hamleler aşama aşama üretilir; kesme olursa kalan aşamalar üretilmez
+QUIESCENCE = True  # False ise derinlik 0'da doğrudan skor döndürülür (eski davranış, karşılaştırma için)
+SEARCH_WORKERS = 1  # 1'den büyükse kök hamleleri bu kadar işçi süreç arasında paylaştırılır
+POOL_POLL_INTERVAL = 0.02  # paralel aramada kök (saniye), işçi sonucu beklerken bu aralıkla kesilip kesilmediğine bakar
+OPENING_BOOK_FILE = "book.bin"  # ChessBook.py ile oluşturulan açılış kitabı; dosya yoksa kitap kullanılmaz
+TABLEBASES = True  # ChessTablebase.py ile üretilen oyun sonu tabloları varsa 3-4 taşlı pozisyonlar aranmaz, okunur
+NULL_MOVE = True  # boş hamle budaması: sırayı rakibe verip sığ arama beta'yı geçiyorsa düğüm kesilir
+NULL_MOVE_REDUCTION = 2  # boş hamleden sonraki arama bu kadar daha sığdır
+LATE_MOVE_REDUCTIONS = True  # sıralamada geç gelen sessiz hamleler bir eksik derinlikte aranır
+LMR_FULL_DEPTH_MOVES = 4  # her düğümde ilk bu kadar hamle indirimsiz aranır
+LMR_MIN_DEPTH = 3  # indirim bu derinlik ve üstünde yapılır
+PRINCIPAL_VARIATION_SEARCH = True  # ilk hamleden sonrakiler önce boş pencereyle aranır
+ASPIRATION_WINDOWS = True  # kök, önceki iterasyonun skoru etrafında dar pencereyle aranır
+ASPIRATION_WINDOW = 0.5  # pencerenin yarı genişliği (piyon cinsinden)
+NULL_WINDOW = 0.01  # boş pencere genişliği; skorlar tam sayı olmadığından 1 kullanılamaz
+MATE_BOUND = CHECKMATE - MAX_PLY  # mutlak değeri en az bu kadar olan puan mattır: CHECKMATE - mata kalan ply
+TABLEBASE_WIN = CHECKMATE // 2  # tablodan okunan galibiyetin puanı, mata kalan yarım hamle sayısı kadar azaltılır
+DELTA_MARGIN = 2.0  # sakin aramada yenen taşın değeri bu pay eklenince bile alfaya ulaşmıyorsa yeme aranmaz (piyon)
+
+# MVV-LVA sıralaması için taş değerleri; şah en değersiz saldıran değil, en son tercih edilen saldırandır
+mvv_lva_values = {"p": 1, "N": 3, "B": 3, "R": 5, "Q": 9, "K": 10}
+# aynı değerler paketlenmiş hamledeki taş koduna göre dizilmiş hali; boş kare 0
+mvv_lva_codes = [mvv_lva_values.get(piece[1], 0) for piece in ChessEngine.code_pieces]
+# taş koduna göre malzeme değeri (piyon cinsinden); sakin aramadaki budamalar içindir
+material_codes = [ChessEngine.piece_score.get(piece[1], 0) for piece in ChessEngine.code_pieces]
+killer_moves = [[None, None] for ply in range(MAX_PLY)]  # her ply için beta kesmesi yapan son iki sessiz hamle
+history_scores = {}  # (taş kodu << 6 | bitiş karesi) -> kesme yapan sessiz hamlelerin birikmiş puanı
+# arama sayaçları; her biri aynı adlı bir global tamsayıdır, findBestMove her aramada sıfırlar
+SEARCH_COUNTERS = ("nodes_searched", "quiescence_nodes", "beta_cutoffs", "first_move_cutoffs", "tt_probes", "tt_hits",
+                   "tt_cutoffs", "null_move_tries", "null_move_cutoffs", "late_move_reductions", "late_move_researches",
+                   "pvs_researches", "aspiration_researches", "moves_generated")
+nodes_searched = 0  # sakin arama düğümleri dahil
+quiescence_nodes = 0
+beta_cutoffs = 0  # hamle döngüsünde beta'yı geçip kalan hamleleri kesen düğümler
+first_move_cutoffs = 0  # kesmeyi ilk hamlenin yaptığı düğümler; oran hamle sıralamasının kalitesini gösterir
+tt_probes = 0
+tt_hits = 0
+tt_cutoffs = 0  # transpozisyon tablosu kaydıyla aranmadan dönen düğümler
+# seçici aramanın sayaçları
+null_move_tries = 0
+null_move_cutoffs = 0
+late_move_reductions = 0
+late_move_researches = 0
+pvs_researches = 0  # boş pencerede alfayı geçip tam pencereyle yeniden aranan hamleler
+aspiration_researches = 0  # pencere dışına düşüp genişletilerek yeniden aranan kökler
+moves_generated = 0  # ana aramada üretilen hamle sayısı (sakin arama hariç)
+# üçgen ana varyant tablosu: pv_table[ply][ply:pv_length[ply]] o ply'dan başlayan en iyi hamle dizisidir
+pv_table = [[0] * (MAX_PLY + 1) for ply in range(MAX_PLY + 1)]
+pv_length = [0] * (MAX_PLY + 1)
+search_deadline = None  # aramanın durması gereken an (time.time()), None ise süre sınırı yok
+search_stopped = False
+search_interrupt = None  # None ya da argümansız fonksiyon; True döndürürse arama durur (ör. yeni komut geldi)
+opening_book = None  # ilk sorguda açılır; False ise kitap dosyası yok
+search_pool = None  # paralel arama için süreç havuzu; işçilerin transpozisyon tabloları aramalar arasında korunur
+search_pool_size = 0
+search_pool_stop = None  # havuzla paylaşılan multiprocessing.Event; kurulunca işçilerin araması durur
+
+
+class SearchStatistics:
+    """
+    findBestMove'un doldurduğu arama istatistikleri; her tamamlanan iterasyondan sonra geri çağırmaya verilir
+    ve sonuçla birlikte döndürülür. Süreçler arasında gönderilebilir (yalnızca sayılar ve listeler tutar).
+    counters SEARCH_COUNTERS adlarıyla o ana kadarki toplamlardır; paralel aramada işçilerin sayaçları da eklenir.
+    iterations her tamamlanan derinlik için (derinlik, skor, iterasyonun düğüm sayısı, iterasyon süresi, toplam süre)
+    demetlerinin listesidir.
+    """
+
+    def __init__(self):
+        self.depth = 0  # tamamlanan son iterasyonun derinliği; kitap ve tablo hamlesinde 0
+        self.score = None
+        self.line = []
+        self.elapsed = 0.0
+        self.counters = dict.fromkeys(SEARCH_COUNTERS, 0)
+        self.iterations = []
+
+    def update(self, elapsed):
+        """
+        Sayaçları ve geçen süreyi günceller.
+        """
+        self.counters = readCounters()
+        self.elapsed = elapsed
+
+    def addIteration(self, depth, score, line, elapsed):
+        previous_nodes = self.counters["nodes_searched"]
+        previous_elapsed = self.iterations[-1][4] if self.iterations else 0.0
+        self.update(elapsed)
+        self.depth = depth
+        self.score = score
+        self.line = list(line)
+        self.iterations.append((depth, score, self.counters["nodes_searched"] - previous_nodes,
+                                elapsed - previous_elapsed, elapsed))
+
+    def nodesPerSecond(self):
+        return self.counters["nodes_searched"] / self.elapsed if self.elapsed > 0 else 0.0
+
+    def firstMoveCutoffRate(self):
+        """
+        Beta kesmelerinin ne kadarını ilk denenen hamlenin yaptığı (0-1).
+        """
+        cutoffs = self.counters["beta_cutoffs"]
+        return self.counters["first_move_cutoffs"] / cutoffs if cutoffs else 0.0
+
+    def hashHitRate(self):
+        """
+        Transpozisyon tablosu sorgularının ne kadarında kayıt bulunduğu (0-1).
+        """
+        probes = self.counters["tt_probes"]
+        return self.counters["tt_hits"] / probes if probes else 0.0
+
+    def getSummaryLines(self, max_iterations=None):
+        """
+        Ekranda ya da konsolda gösterilecek kısa satırlar; max_iterations verilirse yalnızca son o kadar
+        iterasyonun süresi yazılır.
+        """
+        iterations = self.iterations if max_iterations is None else self.iterations[-max_iterations:]
+        counters = self.counters
+        lines = ["derinlik %d  skor %s" % (self.depth, "-" if self.score is None else "%.2f" % self.score),
+                 "düğüm %d (sakin %d)" % (counters["nodes_searched"], counters["quiescence_nodes"]),
+                 "%.0f düğüm/sn  %.2f sn" % (self.nodesPerSecond(), self.elapsed),
+                 "kesme %d  ilk hamle %%%.0f" % (counters["beta_cutoffs"], 100 * self.firstMoveCutoffRate()),
+                 "TT isabet %%%.0f  TT kesme %d" % (100 * self.hashHitRate(), counters["tt_cutoffs"])]
+        lines += ["  d%d: %.2f sn, %d düğüm" % (depth, iteration_time, nodes)
+                  for depth, score, nodes, iteration_time, elapsed in iterations]
+        return lines
+
+
+def resetCounters():
+    for name in SEARCH_COUNTERS:
+        globals()[name] = 0
+
+
+def readCounters():
+    return {name: globals()[name] for name in SEARCH_COUNTERS}
 
 
-def findBestMove(game_state, valid_moves, return_queue):
-    global next_move
-    next_move = None
+def addCounters(counters):
+    """
+    İşçi süreçten gelen sayaçları bu sürecin sayaçlarına ekler.
+    """
+    for name, value in counters.items():
+        globals()[name] += value
+
+
+class TranspositionTable:
+    """
+    Zobrist anahtarıyla adreslenen sabit boyutlu transpozisyon tablosu.
+    Her yuvada iki kayıt vardır: biri derinlik öncelikli (daha derin arama kalır),
+    diğeri her zaman değiştirilen (en son arama kalır). Kayıt: (anahtar, derinlik, tür, skor, en iyi hamle).
+    """
+
+    def __init__(self, size=TRANSPOSITION_TABLE_SIZE):
+        self.mask = size - 1
+        self.depth_preferred = [None] * size
+        self.always_replace = [None] * size
+
+    def probe(self, key):
+        """
+        Anahtara ait kaydı döndürür, yoksa None.
+        """
+        index = key & self.mask
+        entry = self.depth_preferred[index]
+        if entry is not None and entry[0] == key:
+            return entry
+        entry = self.always_replace[index]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, flag, score, move):
+        index = key & self.mask
+        entry = (key, depth, flag, score, move)
+        old_entry = self.depth_preferred[index]
+        if old_entry is None or old_entry[0] == key or depth >= old_entry[1]:
+            self.depth_preferred[index] = entry
+        else:
+            self.always_replace[index] = entry
+
+    def clear(self):
+        size = self.mask + 1
+        self.depth_preferred = [None] * size
+        self.always_replace = [None] * size
+
+
+transposition_table = TranspositionTable()
+
+
+def findBestMove(game_state, valid_moves, return_queue, time_limit=TIME_LIMIT, max_depth=MAX_DEPTH,
+                 workers=None, use_book=True, on_iteration=None):
+    """
+    Yinelemeli derinleştirme: 1, 2, 3... derinliklerde arar, süre dolduğunda durur
+    ve tamamlanan son iterasyonun en iyi hamlesini return_queue'ya koyar.
+    Her iterasyon bir öncekinin en iyi hamlesini önce dener; daha derin varyant transpozisyon tablosundan gelir.
+    time_limit None ise yalnızca max_depth'e kadar aranır.
+    Arama paketlenmiş tamsayı hamlelerle yapılır; valid_moves Move nesneleri de içerebilir, sonuç tamsayıdır.
+    workers (varsayılan SEARCH_WORKERS) 1'den büyükse her iterasyonun kök hamleleri süreç havuzunda aranır.
+    use_book ise önce açılış kitabına bakılır, pozisyon kitapta varsa arama yapılmaz.
+    Pozisyon oyun sonu tablosundaysa da arama yapılmaz, tablodaki en iyi hamle oynanır.
+    on_iteration verilirse her tamamlanan iterasyondan sonra SearchStatistics ile çağrılır.
+    (en iyi hamle, skor, ana varyant, istatistikler) döndürür; skor sıradaki taraf açısındandır,
+    kitap hamlesinde None'dır.
+    """
+    global search_deadline, search_stopped
+    if workers is None:
+        workers = SEARCH_WORKERS
+    resetCounters()
+    statistics = SearchStatistics()
+    if use_book:
+        book_move = findBookMove(game_state)
+        if book_move is not None:
+            statistics.line = [book_move]
+            return_queue.put(book_move)
+            return book_move, None, [book_move], statistics
+    if TABLEBASES:
+        tablebase_move = ChessTablebase.findTablebaseMove(game_state)
+        if tablebase_move is not None:
+            statistics.score = tablebaseScore(ChessTablebase.probe(game_state), 0)
+            statistics.line = [tablebase_move]
+            return_queue.put(tablebase_move)
+            return tablebase_move, statistics.score, [tablebase_move], statistics
+    for killers in killer_moves:
+        killers[0] = killers[1] = None
+    valid_moves = [move if isinstance(move, int) else move.packed for move in valid_moves]
     random.shuffle(valid_moves)
-    findMoveNegaMaxAlphaBeta(game_state, valid_moves, DEPTH, -CHECKMATE, CHECKMATE,
-                             1 if game_state.white_to_move else -1)
-    return_queue.put(next_move)
+    start_time = time.time()
+    search_deadline = None if time_limit is None else start_time + time_limit
+    search_stopped = False
+    turn_multiplier = 1 if game_state.white_to_move else -1
+    best_line = []
+    best_score = 0
+    for depth in range(1, max_depth + 1):
+        if workers > 1:
+            score = searchRootParallel(game_state, valid_moves, depth, turn_multiplier, workers)
+        else:
+            score = searchRoot(game_state, valid_moves, depth, turn_multiplier, best_score)
+        line = pv_table[0][:pv_length[0]]
+        if search_stopped:
+            if not best_line:
+                best_line = line  # ilk iterasyon bile bitmediyse yarım sonucu kullan
+            break
+        if line:  # hiçbir hamle alfayı geçemediyse (her hamle mat oluyor) önceki varyant korunur
+            best_line = extendPrincipalVariation(game_state, line, depth)
+            valid_moves.remove(line[0])
+            valid_moves.insert(0, line[0])
+        best_score = score
+        statistics.addIteration(depth, score, best_line, time.time() - start_time)
+        if on_iteration is not None:
+            on_iteration(statistics)
+        if abs(score) >= MATE_BOUND:
+            break  # mat bulundu, daha derine inmeye gerek yok
+        # bir sonraki iterasyon kalan süreye sığmayacaksa başlama;
+        # süre sınırı arama sırasında da konabilir (düşünme isabetinde), bu yüzden search_deadline okunur
+        if search_deadline is not None and time.time() - start_time > (search_deadline - start_time) / 2:
+            break
+    best_move = best_line[0] if best_line else None
+    statistics.update(time.time() - start_time)
+    return_queue.put(best_move)
+    return best_move, best_score, best_line, statistics
+
+def findBookMove(game_state):
+    """
+    Açılış kitabından ağırlıklı rastgele bir hamle; kitap yoksa ya da pozisyon kitapta değilse None.
+    """
+    global opening_book
+    if opening_book is None:
+        try:
+            opening_book = ChessBook.OpeningBook(OPENING_BOOK_FILE)
+        except OSError:
+            opening_book = False
+    if opening_book is False:
+        return None
+    return opening_book.chooseMove(game_state)
 
 
-def findMoveNegaMaxAlphaBeta(game_state, valid_moves, depth, alpha, beta, turn_multiplier):
-    global next_move
+def findMoveNegaMaxAlphaBeta(game_state, valid_moves, depth, alpha, beta, turn_multiplier, ply=0, allow_null=True):
+    """
+    Ana varyant araması (PVS): ilk hamle tam pencereyle, diğerleri yalnızca alfayı geçip geçmediklerini
+    öğrenmek için boş pencereyle aranır; geçen hamle tam pencereyle yeniden aranır.
+    Alfayı geçen hamlenin varyantı pv_table[ply]'a yazılır, kökün varyantı pv_table[0]'dadır.
+    allow_null False ise bu düğümde boş hamle denenmez (art arda iki boş hamle yapılmaz).
+    valid_moves None ise hamleler bu düğümde üretilir; STAGED_MOVE_GENERATION açıksa aşama aşama.
+    """
+    global nodes_searched, search_stopped, moves_generated, beta_cutoffs, first_move_cutoffs
+    global tt_probes, tt_hits, tt_cutoffs
+    global null_move_tries, null_move_cutoffs, late_move_reductions, late_move_researches, pvs_researches
+    nodes_searched += 1
+    pv_length[ply] = ply
+    if nodes_searched & 63 == 0 and isSearchInterrupted():
+        search_stopped = True
+    if search_stopped:
+        return 0
+    if TABLEBASES and ply != 0 and game_state.piece_count <= ChessTablebase.MAX_PIECES:
+        value = ChessTablebase.probe(game_state)
+        if value is not None:
+            return tablebaseScore(value, ply)
     if depth == 0:
-        return turn_multiplier * scoreBoard(game_state)
-    # sırayı taşı - daha sonra uygula // YAPILACAK
+        if QUIESCENCE:
+            return quiescenceSearch(game_state, alpha, beta, turn_multiplier, ply, True)
+        if valid_moves is None:
+            game_state.hasLegalMove()  # leafScore mat ve pat bayraklarına bakar; hamle listesi gerekmez
+        return leafScore(game_state, turn_multiplier, ply)
+    if valid_moves is not None and (game_state.checkmate or game_state.stalemate):
+        return leafScore(game_state, turn_multiplier, ply)
+    # transpozisyon tablosuna bak; kesme yalnızca boş pencereli düğümlerde yapılır: kökte ve ana varyant
+    # düğümlerinde (tam pencere) kesme varyantı pv_table'a yazılmadan döndürür ve ana varyant kısalırdı
+    key = game_state.zobrist_key
+    original_alpha = alpha
+    hash_move = None
+    entry = transposition_table.probe(key)
+    tt_probes += 1
+    if entry is not None:
+        tt_hits += 1
+        hash_move = entry[4]
+        if entry[1] >= depth and ply != 0 and beta - alpha <= 2 * NULL_WINDOW:
+            entry_score = scoreFromTable(entry[3], ply)
+            if entry[2] == EXACT:
+                tt_cutoffs += 1
+                return entry_score
+            if entry[2] == LOWER_BOUND and entry_score > alpha:
+                alpha = entry_score
+            elif entry[2] == UPPER_BOUND and entry_score < beta:
+                beta = entry_score
+            if alpha >= beta:
+                tt_cutoffs += 1
+                return entry_score
+    # valid_moves bu pozisyonda üretildiyse in_check bu düğüme aittir; alt aramalar değiştirmeden önce saklanır
+    in_check = game_state.in_check if valid_moves is not None else game_state.inCheck()
+    staged = MOVE_ORDERING and STAGED_MOVE_GENERATION
+    if NULL_MOVE and allow_null and ply != 0 and depth > NULL_MOVE_REDUCTION and not in_check and \
+            beta < MATE_BOUND and game_state.hasNonPawnMaterial():
+        null_move_tries += 1
+        game_state.makeNullMove()
+        null_depth = depth - 1 - NULL_MOVE_REDUCTION
+        next_moves = game_state.getValidMoves() if not staged and null_depth > 0 else None
+        score = -findMoveNegaMaxAlphaBeta(game_state, next_moves, null_depth, -beta, -beta + NULL_WINDOW,
+                                          -turn_multiplier, ply + 1, False)
+        game_state.undoNullMove()
+        if search_stopped:
+            return 0
+        if score >= beta:
+            null_move_cutoffs += 1
+            return beta
+    staged_moves = None
+    if valid_moves is None:
+        if staged:
+            valid_moves = staged_moves = game_state.getStagedMoves(hash_move, killer_moves[ply], captureOrderScore,
+                                                                   historyScore)
+        else:
+            valid_moves = game_state.getValidMoves()
+            moves_generated += len(valid_moves)
+            if game_state.checkmate or game_state.stalemate:
+                return leafScore(game_state, turn_multiplier, ply)
+            if MOVE_ORDERING:
+                valid_moves = orderMoves(valid_moves, hash_move, ply)
+    elif MOVE_ORDERING:
+        valid_moves = orderMoves(valid_moves, hash_move, ply)
     max_score = -CHECKMATE
-    for move in valid_moves:
+    best_move = None
+    for move_index, move in enumerate(valid_moves):
         game_state.makeMove(move)
-        next_moves = game_state.getValidMoves()
-        score = -findMoveNegaMaxAlphaBeta(game_state, next_moves, depth - 1, -beta, -alpha, -turn_multiplier)
+        # ufuk düğümünde tam hamle listesi gerekmez: sakin arama kendi taktik hamlelerini üretir,
+        # sakin arama kapalıysa yalnızca hasLegalMove ile oyunun bitip bitmediğine bakılır;
+        # aşamalı üretimde alt düğüm hamlelerini kendisi üretir
+        next_moves = game_state.getValidMoves() if not staged and depth > 1 else None
+        if next_moves is not None:
+            moves_generated += len(next_moves)
+        # geç gelen sessiz hamle bir eksik derinlikte aranır; alfayı geçerse tam derinlikte yeniden aranır
+        # (hamlenin şah çekip çekmediği en son, diğer koşullar sağlandığında denetlenir)
+        reduction = 1 if LATE_MOVE_REDUCTIONS and ply != 0 and depth >= LMR_MIN_DEPTH and \
+            move_index >= LMR_FULL_DEPTH_MOVES and not in_check and not move & ChessEngine.MOVE_TACTICAL and \
+            move not in killer_moves[ply] and not game_state.inCheck() else 0
+        if move_index != 0 and (PRINCIPAL_VARIATION_SEARCH or reduction):
+            late_move_reductions += reduction
+            score = -findMoveNegaMaxAlphaBeta(game_state, next_moves, depth - 1 - reduction, -alpha - NULL_WINDOW,
+                                              -alpha, -turn_multiplier, ply + 1)
+            if reduction and score > alpha and not search_stopped:
+                late_move_researches += 1
+                score = -findMoveNegaMaxAlphaBeta(game_state, next_moves, depth - 1,
+                                                  -alpha - NULL_WINDOW if PRINCIPAL_VARIATION_SEARCH else -beta,
+                                                  -alpha, -turn_multiplier, ply + 1)
+            if PRINCIPAL_VARIATION_SEARCH and alpha < score < beta and not search_stopped:
+                pvs_researches += 1
+                score = -findMoveNegaMaxAlphaBeta(game_state, next_moves, depth - 1, -beta, -alpha,
+                                                  -turn_multiplier, ply + 1)
+        else:
+            score = -findMoveNegaMaxAlphaBeta(game_state, next_moves, depth - 1, -beta, -alpha, -turn_multiplier,
+                                              ply + 1)
+        game_state.undoMove()
+        if search_stopped:
+            return 0
         if score > max_score:
             max_score = score
-            if depth == DEPTH:
-                next_move = move
-        game_state.undoMove()
+            best_move = move
         if max_score > alpha:
             alpha = max_score
+            updatePrincipalVariation(move, ply)
         if alpha >= beta:
+            beta_cutoffs += 1
+            if move_index == 0:
+                first_move_cutoffs += 1
+            if not move & ChessEngine.MOVE_TACTICAL:
+                storeKillerMove(move, depth, ply)
             break
+    if staged_moves is not None:
+        moves_generated += staged_moves.generated_count
+        if staged_moves.move_count == 0:  # hiç geçerli hamle yok
+            return -CHECKMATE + ply if in_check else STALEMATE
+    if max_score <= original_alpha:
+        flag = UPPER_BOUND
+    elif max_score >= beta:
+        flag = LOWER_BOUND
+    else:
+        flag = EXACT
+    transposition_table.store(key, depth, flag, scoreToTable(max_score, ply), best_move)
     return max_score
 
 
+def updatePrincipalVariation(move, ply):
+    """
+    Üçgen varyant tablosu: bu ply'ın varyantı, hamle ve ardından bir alt ply'ın varyantıdır.
+    """
+    line = pv_table[ply]
+    line[ply] = move
+    child_length = pv_length[ply + 1]
+    line[ply + 1:child_length] = pv_table[ply + 1][ply + 1:child_length]
+    pv_length[ply] = max(child_length, ply + 1)
+
+
+def extendPrincipalVariation(game_state, line, depth):
+    """
+    Varyant derinlikten kısaysa transpozisyon tablosundaki en iyi hamlelerle tamamlar.
+    Skorlar tam sayı olmadığından ana varyant düğümünde pencere kayan nokta farkı kadar daralabilir;
+    böyle bir pencerede aranan hamle tablodan kesilip varyantını yazmadan döner ve varyant kısalır.
+    Tablodaki hamle pozisyonda geçerli değilse tamamlama orada durur.
+    """
+    line = list(line)
+    for move in line:
+        game_state.makeMove(move)
+    while len(line) < depth:
+        entry = transposition_table.probe(game_state.zobrist_key)
+        if entry is None or entry[4] is None or entry[4] not in game_state.getValidMoves():
+            break
+        line.append(entry[4])
+        game_state.makeMove(entry[4])
+    for move in line:
+        game_state.undoMove()
+    return line
+
+
+def searchRoot(game_state, valid_moves, depth, turn_multiplier, previous_score):
+    """
+    Kökü bir önceki iterasyonun skoru etrafında dar bir pencereyle (aspiration) arar.
+    Skor pencerenin dışına düşerse o taraf genişletilip yeniden aranır; pencere her seferinde iki katına çıkar.
+    """
+    global aspiration_researches
+    if not ASPIRATION_WINDOWS or depth == 1 or abs(previous_score) >= TABLEBASE_WIN - MAX_PLY:
+        return findMoveNegaMaxAlphaBeta(game_state, valid_moves, depth, -CHECKMATE, CHECKMATE, turn_multiplier)
+    window = ASPIRATION_WINDOW
+    alpha = previous_score - window
+    beta = previous_score + window
+    while True:
+        score = findMoveNegaMaxAlphaBeta(game_state, valid_moves, depth, alpha, beta, turn_multiplier)
+        if search_stopped:
+            return score
+        if score <= alpha and alpha > -CHECKMATE:
+            alpha = max(alpha - window, -CHECKMATE)
+        elif score >= beta and beta < CHECKMATE:
+            beta = min(beta + window, CHECKMATE)
+        else:
+            return score
+        aspiration_researches += 1
+        window *= 2
+
+
+def isSearchInterrupted():
+    """
+    Süre dolduysa ya da search_interrupt durmayı istiyorsa True; 64 düğümde bir sorulur.
+    """
+    if search_deadline is not None and time.time() > search_deadline:
+        return True
+    return search_interrupt is not None and search_interrupt()
+
+
+def getSearchPool(workers):
+    """
+    Verilen boyutta süreç havuzunu döndürür; boyut değiştiyse eski havuz kapatılıp yenisi açılır.
+    """
+    global search_pool, search_pool_size, search_pool_stop
+    if search_pool is None or search_pool_size != workers:
+        import multiprocessing  # tek süreçli aramada (ve UCI başlangıcında) içe aktarma süresi harcanmasın
+        closeSearchPool()
+        search_pool_stop = multiprocessing.Event()
+        search_pool = multiprocessing.Pool(workers, initializer=initSearchWorker, initargs=(search_pool_stop,))
+        search_pool_size = workers
+    return search_pool
+
+
+def initSearchWorker(stop_event):
+    """
+    İşçi süreç başlarken çalışır: ana süreçten kalan kesme fonksiyonu bu süreçte geçerli değildir,
+    yerine ana sürecin kurduğu paylaşılan olay sorulur.
+    """
+    global search_interrupt
+    search_interrupt = stop_event.is_set
+
+
+def closeSearchPool():
+    global search_pool, search_pool_size, search_pool_stop
+    if search_pool is not None:
+        search_pool.terminate()
+        search_pool.join()
+        search_pool = None
+        search_pool_size = 0
+        search_pool_stop = None
+
+
+def searchRootParallel(game_state, valid_moves, depth, turn_multiplier, workers):
+    """
+    Kök bölme: önce ilk (bir önceki iterasyonun en iyisi) hamle tam pencereyle aranır,
+    kalan kök hamleleri işçilere teker teker dağıtılır. Her yeni iş o ana kadar bulunan en iyi skoru
+    alfa olarak alır, böylece işçiler sıralı aramadaki gibi kesme yapabilir.
+    Sıralı aramadaki gibi skoru döndürür ve en iyi varyantı pv_table[0]'a yazar.
+    """
+    global search_stopped
+    pool = getSearchPool(workers)
+    search_pool_stop.clear()
+    completed = queue.Queue()
+    pv_length[0] = 0
+    pool.apply_async(searchRootMove, ((game_state, valid_moves[0], depth, -CHECKMATE, CHECKMATE, turn_multiplier,
+                                       search_deadline),), callback=completed.put, error_callback=completed.put)
+    result = waitForRootMove(completed)
+    if isinstance(result, BaseException):
+        raise result
+    line, alpha, counters, stopped = result
+    addCounters(counters)
+    if stopped:
+        search_stopped = True
+        return 0
+    setRootVariation(line)
+    pending = list(valid_moves[1:])
+    running = 0
+    while pending or running:
+        while pending and running < workers and not search_stopped:
+            task = (game_state, pending.pop(0), depth, alpha, CHECKMATE, turn_multiplier, search_deadline)
+            pool.apply_async(searchRootMove, (task,), callback=completed.put, error_callback=completed.put)
+            running += 1
+        if running == 0:
+            break
+        result = waitForRootMove(completed)
+        running -= 1
+        if isinstance(result, BaseException):
+            raise result
+        line, score, counters, stopped = result
+        addCounters(counters)
+        if stopped:
+            search_stopped = True  # süre doldu ya da arama kesildi; kalan işler hemen döner
+        elif score > alpha:
+            alpha = score
+            setRootVariation(line)
+    return 0 if search_stopped else alpha
+
+
+def waitForRootMove(completed):
+    """
+    İşçiden gelecek sonucu beklerken aramanın kesilip kesilmediğine bakar (süre ya da search_interrupt);
+    kesildiyse search_stopped kurulur ve paylaşılan olayla işçiler durdurulur, sonuç yine de beklenir.
+    """
+    global search_stopped
+    while True:
+        try:
+            return completed.get(timeout=POOL_POLL_INTERVAL)
+        except queue.Empty:
+            if not search_stopped and isSearchInterrupted():
+                search_stopped = True
+                search_pool_stop.set()
+
+
+def setRootVariation(line):
+    pv_table[0][:len(line)] = line
+    pv_length[0] = len(line)
+
+
+def searchRootMove(task):
+    """
+    İşçi süreçte tek bir kök hamlesini (alpha, beta) penceresiyle arar.
+    (hamle ile başlayan varyant, skor, sayaçlar, süre doldu mu) döndürür.
+    """
+    global search_deadline, search_stopped
+    game_state, move, depth, alpha, beta, turn_multiplier, deadline = task
+    resetCounters()
+    search_deadline = deadline
+    search_stopped = False
+    game_state.makeMove(move)
+    score = -findMoveNegaMaxAlphaBeta(game_state, None, depth - 1, -beta, -alpha, -turn_multiplier, 1)
+    return [move] + pv_table[1][1:pv_length[1]], score, readCounters(), search_stopped
+
+
+def quiescenceSearch(game_state, alpha, beta, turn_multiplier, ply, first_ply=False):
+    """
+    Ufukta yalnızca taş yemeleri ve terfileri arar, böylece bir taş alışverişinin ortasında değerlendirme yapılmaz.
+    Yan taraf hiçbir taktik hamle yapmayıp durabilir (stand pat): statik skor beta'yı geçiyorsa hemen kesilir.
+    Yalnızca sakin aramanın ilk ply'ında şah altındaysa durmak serbest değildir, tüm kaçış hamleleri aranır
+    ve kaçış yoksa mattır; daha derinde şah altında da yalnızca taktik kaçışlar aranır, yoksa statik skor döner.
+    Böylece sessiz kaçışlar zinciri aramayı sınırsız uzatamaz.
+    Budamalar (terfiler hariç): yenen taşın değeri DELTA_MARGIN ile bile alfaya ulaştırmıyorsa (delta budaması)
+    ya da daha değerli bir taş, rakibin koruduğu daha değersiz bir taşı yiyorsa (açıkça malzeme kaybettiren yeme)
+    hamle aranmaz.
+    """
+    global nodes_searched, search_stopped, quiescence_nodes
+    nodes_searched += 1
+    quiescence_nodes += 1
+    if nodes_searched & 63 == 0 and isSearchInterrupted():
+        search_stopped = True
+    if search_stopped:
+        return 0
+    if ply >= MAX_PLY:
+        return leafScore(game_state, turn_multiplier, ply)
+    in_check = game_state.inCheck()
+    if in_check and first_ply:
+        moves = game_state.getValidMoves()
+        if len(moves) == 0:
+            return -CHECKMATE + ply
+        max_score = -CHECKMATE
+        stand_pat = None
+    else:
+        stand_pat = max_score = turn_multiplier * scoreBoard(game_state)
+        if max_score >= beta:
+            return max_score
+        if max_score > alpha:
+            alpha = max_score
+        moves = game_state.getCaptureMoves()
+    for move in sorted(moves, key=captureOrderScore, reverse=True):
+        if stand_pat is not None and not move >> 23 & 15:
+            captured_value = material_codes[move >> 16 & 15]
+            if stand_pat + captured_value + DELTA_MARGIN <= alpha:
+                continue
+            end_square = move >> 6 & 63
+            if material_codes[move >> 12 & 15] > captured_value and \
+                    game_state.squareUnderAttack(end_square >> 3, end_square & 7):
+                continue
+        game_state.makeMove(move)
+        score = -quiescenceSearch(game_state, -beta, -alpha, -turn_multiplier, ply + 1)
+        game_state.undoMove()
+        if search_stopped:
+            return 0
+        if score > max_score:
+            max_score = score
+            if score > alpha:
+                if score >= beta:
+                    break
+                alpha = score
+    return max_score
+
+
+def leafScore(game_state, turn_multiplier, ply):
+    """
+    Sıradaki taraf açısından yaprak puanı. Mat edilen taraf -CHECKMATE + ply alır: kökten mata olan uzaklık
+    puanda saklanır, yakın mat uzak mattan iyi sayılır ve UCI mat uzaklığını puandan hesaplar.
+    """
+    if game_state.checkmate:
+        return -CHECKMATE + ply
+    return turn_multiplier * scoreBoard(game_state)
+
+
+def tablebaseScore(value, ply):
+    """
+    Oyun sonu tablosu değerini sıradaki taraf açısından arama puanına çevirir;
+    kökten mata olan uzaklık kısaldıkça galibiyet puanı artar.
+    """
+    if value > 0:
+        return TABLEBASE_WIN - ply - value
+    if value < 0:
+        return -TABLEBASE_WIN + ply - value - 1
+    return STALEMATE
+
+
+def scoreToTable(score, ply):
+    """
+    Mat puanları ve oyun sonu tablosundan gelen galibiyet ve yenilgi puanları köke göre mata uzaklık içerir;
+    transpozisyon tablosuna düğüme göre yazılır ki pozisyon başka bir ply'da tekrar karşılaşıldığında uzaklık
+    doğru kalsın. ±CHECKMATE pencere sınırıdır; o ve değerlendirme puanları ply'dan bağımsızdır, değiştirilmez.
+    """
+    if TABLEBASE_WIN // 2 < score < CHECKMATE:
+        return score + ply
+    if -CHECKMATE < score < -TABLEBASE_WIN // 2:
+        return score - ply
+    return score
+
+
+def scoreFromTable(score, ply):
+    """
+    scoreToTable'ın tersi: transpozisyon tablosundaki düğüme göre puanı bu ply'daki köke göre puana çevirir.
+    """
+    if TABLEBASE_WIN // 2 < score < CHECKMATE:
+        return score - ply
+    if -CHECKMATE < score < -TABLEBASE_WIN // 2:
+        return score + ply
+    return score
+
+
+def captureOrderScore(move):
+    """
+    MVV-LVA: önce en değerli taşı en değersiz taşla yiyen hamleler; terfiler vezir yemek gibi sayılır.
+    """
+    if move >> 16 & 15:
+        return 10 * mvv_lva_codes[move >> 16 & 15] - mvv_lva_codes[move >> 12 & 15]
+    if move >> 23 & 15:
+        return 10 * mvv_lva_values["Q"]
+    return 0
+
+
+def historyScore(move):
+    """
+    Sessiz hamlenin geçmiş puanı: bu taşın bu kareye gidişi daha önce kaç kez (ve ne derinlikte) kesme yaptı.
+    """
+    return history_scores.get(move >> 6 & 1023, 0)
+
+
+def orderMoves(valid_moves, hash_move, ply):
+    """
+    Hamleleri alfa-beta kesmelerini erkene çekecek şekilde sıralar:
+    önce transpozisyon tablosundaki hamle, sonra MVV-LVA'ya göre taş yemeler ve terfiler,
+    sonra bu ply'ın katil hamleleri, en son geçmiş puanına göre sessiz hamleler.
+    Sıralama kararlıdır, bu yüzden eşit puanlı hamleler gelen sırasını korur.
+    """
+    killers = killer_moves[ply]
+
+    def moveOrderScore(move):
+        if move == hash_move:
+            return 1000000
+        if move & ChessEngine.MOVE_TACTICAL:
+            return 100000 + captureOrderScore(move)
+        if move == killers[0]:
+            return 90000
+        if move == killers[1]:
+            return 80000
+        return historyScore(move)
+
+    return sorted(valid_moves, key=moveOrderScore, reverse=True)
+
+
+def storeKillerMove(move, depth, ply):
+    """
+    Beta kesmesi yapan sessiz hamleyi katil hamlelere ve geçmiş tablosuna kaydeder.
+    """
+    killers = killer_moves[ply]
+    if move != killers[0]:
+        killers[1] = killers[0]
+        killers[0] = move
+    history_key = move >> 6 & 1023
+    history_scores[history_key] = min(history_scores.get(history_key, 0) + depth * depth, 50000)
+
+
 def scoreBoard(game_state):
     """
     Tahtayı puanlayın. Pozitif puan beyaz için, negatif puan siyah için iyidir.
@@ -108,19 +784,12 @@ def scoreBoard(game_state):
             return CHECKMATE  # beyazlar kazandı
     elif game_state.stalemate:
         return STALEMATE
-    score = 0
-    for row in range(len(game_state.board)):
-        for col in range(len(game_state.board[row])):
-            piece = game_state.board[row][col]
-            if piece != "--":
-                piece_position_score = 0
-                if piece[1] != "K":
-                    piece_position_score = piece_position_scores[piece][row][col]
-                if piece[0] == "w":
-                    score += piece_score[piece[1]] + piece_position_score
-                if piece[0] == "b":
-                    score -= piece_score[piece[1]] + piece_position_score
-
+    score = game_state.material_score + game_state.position_score
+    if DEBUG_EVALUATION:
+        material_score, position_score = game_state.computeEvaluation()
+        assert game_state.material_score == material_score and abs(game_state.position_score - position_score) < 1e-6, \
+            "artımlı skor (%s, %s) tam hesaplamayla (%s, %s) uyuşmuyor" % (
+                game_state.material_score, game_state.position_score, material_score, position_score)
     return score
 
 
@@ -0,0 +1,124 @@
+"""
+Toplu pozisyon analizi.
+EPD ya da FEN dosyasındaki pozisyonları satır satır okur, her birinde sabit bütçeyle findBestMove çalıştırır
+ve sonucu hemen çıktı dosyasına yazar. Dosya hiçbir zaman bütünüyle belleğe alınmaz,
+bu yüzden bellek kullanımı dosya boyutundan bağımsızdır.
+Çıktı sekmeyle ayrılmış satırlardır: id, FEN, en iyi hamle, düğüm sayısı, süre, skor, ana varyant.
+Skor sıradaki taraf açısındandır (piyon cinsinden).
+Kullanım: python ChessAnalysis.py positions.epd [--output sonuc.tsv] [--time 1.0 | --depth 3] [--start 0]
+"""
+import argparse
+import queue
+import sys
+import time
+import ChessAI
+import ChessEngine
+
+
+def parseEpdLine(line):
+    """
+    EPD ya da FEN satırını (fen, işlemler) olarak ayırır; boş ve yorum satırları için None.
+    EPD'de ilk dört alan pozisyondur, ardından "bm Qd1; id \"...\";" gibi işlemler gelir.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    fields = line.split(None, 4)
+    if len(fields) < 4:
+        raise ValueError("Geçersiz EPD: " + line)
+    fen = " ".join(fields[:4])
+    rest = fields[4] if len(fields) > 4 else ""
+    # FEN satırlarında dört alandan sonra iki sayaç gelir
+    counters = rest.split(None, 2)
+    if len(counters) >= 2 and counters[0].isdigit() and counters[1].isdigit():
+        fen += " " + counters[0] + " " + counters[1]
+        rest = counters[2] if len(counters) > 2 else ""
+    operations = {}
+    for operation in rest.split(";"):
+        operation = operation.strip()
+        if operation:
+            opcode, _, operand = operation.partition(" ")
+            operations[opcode] = operand.strip().strip('"')
+    return fen, operations
+
+
+def readPositions(lines, start=0):
+    """
+    Boş ve yorum olmayan satırlardan (sıra numarası, satır) üretir; satırlar tembel olarak okunur ve burada
+    ayrıştırılmaz, böylece bozuk bir satır yalnızca kendi pozisyonunda hata verir.
+    İlk start pozisyon atlanır, böylece yarıda kalan bir analiz kaldığı yerden sürdürülebilir.
+    """
+    index = 0
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if index >= start:
+            yield index, line
+        index += 1
+
+
+def analysePosition(fen, time_limit, max_depth):
+    """
+    Tek pozisyonu arar ve (en iyi hamle, düğüm sayısı, süre, skor, ana varyant) döndürür;
+    geçerli hamle yoksa hamle "-"dir.
+    """
+    game_state = ChessEngine.GameState(fen)
+    valid_moves = game_state.getValidMoves()
+    if not valid_moves:
+        return "-", 0, 0.0, "-", ""
+    return_queue = queue.Queue()
+    start_time = time.perf_counter()
+    best_move, score, line, statistics = ChessAI.findBestMove(game_state, valid_moves, return_queue,
+                                                              time_limit=time_limit, max_depth=max_depth,
+                                                              use_book=False)
+    elapsed = time.perf_counter() - start_time
+    if best_move is None:
+        best_move = ChessAI.findRandomMove(valid_moves)
+        line = [best_move]
+    return (ChessEngine.Move.fromPacked(best_move).getUciNotation(), statistics.counters["nodes_searched"], elapsed,
+            "%.2f" % score,
+            " ".join(ChessEngine.Move.fromPacked(move).getUciNotation() for move in line))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EPD/FEN dosyasındaki pozisyonların toplu analizi")
+    parser.add_argument("input", help="her satırında bir EPD ya da FEN bulunan dosya ('-' standart girdi)")
+    parser.add_argument("--output", help="sonuç dosyası, verilmezse standart çıktı (var olan dosyaya eklenir)")
+    parser.add_argument("--time", type=float, default=1.0, help="pozisyon başına süre (saniye)")
+    parser.add_argument("--depth", type=int, help="sabit derinlik; verilirse süre sınırı kullanılmaz")
+    parser.add_argument("--start", type=int, default=0, help="baştan atlanacak pozisyon sayısı")
+    args = parser.parse_args()
+    time_limit = None if args.depth is not None else args.time
+    max_depth = args.depth if args.depth is not None else ChessAI.MAX_DEPTH
+
+    input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output_file = sys.stdout if args.output is None else open(args.output, "a", encoding="utf-8")
+    total_positions = 0
+    total_nodes = 0
+    start_time = time.perf_counter()
+    try:
+        for index, text in readPositions(input_file, args.start):
+            fen, operations = text, {}
+            try:
+                fen, operations = parseEpdLine(text)
+                best_move, nodes, elapsed, score, line = analysePosition(fen, time_limit, max_depth)
+            except ValueError as error:  # bozuk satır tüm analizi durdurmasın
+                best_move, nodes, elapsed, score, line = "hata: " + str(error), 0, 0.0, "-", ""
+            output_file.write("%s\t%s\t%s\t%d\t%.3f\t%s\t%s\n" % (operations.get("id", str(index)), fen, best_move,
+                                                                  nodes, elapsed, score, line))
+            output_file.flush()
+            total_positions += 1
+            total_nodes += nodes
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+    elapsed = time.perf_counter() - start_time
+    print("%d pozisyon, %d düğüm, %.1f sn, %.0f düğüm/sn" % (total_positions, total_nodes, elapsed,
+                                                           total_nodes / max(elapsed, 1e-9)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
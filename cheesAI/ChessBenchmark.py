@@ -0,0 +1,209 @@
+"""
+Arama kıyaslaması.
+Sabit pozisyonlarda findBestMove'un ziyaret ettiği düğüm sayısını ve süresini ölçer.
+--memory ile arama sırasındaki en yüksek bellek kullanımı ve hamle listelerinin boyutu raporlanır.
+--workers 1,2,4,8,16 ile paralel aramanın işçi sayısına göre hızlanma eğrisi raporlanır.
+--selective ile boş hamle budaması ve geç hamle indirimi açık/kapalı düğüm sayısı ve derinliğe ulaşma süresi raporlanır.
+--staged ile aşamalı hamle üretimi açık/kapalı düğüm başına üretilen hamle sayısı ve süre raporlanır.
+Kullanım: python ChessBenchmark.py [--depth 3] [--memory] [--workers 1,2,4] [--selective] [--staged]
+"""
+import argparse
+import queue
+import random
+import sys
+import time
+import tracemalloc
+import ChessAI
+import ChessEngine
+
+# başlangıç pozisyonundan oynanan hamle dizileriyle tanımlanan kıyaslama pozisyonları
+BENCHMARK_POSITIONS = {
+    "başlangıç": "",
+    "italyan": "e2e4 e7e5 g1f3 b8c6 f1c4 g8f6 d2d3 f8c5",
+    "sicilya": "e2e4 c7c5 g1f3 d7d6 d2d4 c5d4 f3d4 g8f6 b1c3 a7a6",
+    "vezir gambiti": "d2d4 d7d5 c2c4 e7e6 b1c3 g8f6 c1g5 f8e7 e2e3 e8g8",
+    "taş alışverişi": "e2e4 d7d5 e4d5 d8d5 b1c3 d5a5 d2d4 g8f6 g1f3 c8f5 f1c4 e7e6",
+}
+
+
+def findMoveByNotation(game_state, move_string):
+    """
+    "e2e4" biçimindeki (terfide "e7e8q") hamleyi geçerli hamleler arasında bulur.
+    """
+    for move in game_state.getValidMoveObjects():
+        if move.getUciNotation() == move_string:
+            return move
+    raise ValueError("Geçersiz hamle: " + move_string)
+
+
+def loadPosition(move_strings, state_class=ChessEngine.GameState):
+    game_state = state_class()
+    for move_string in move_strings.split():
+        game_state.makeMove(findMoveByNotation(game_state, move_string))
+    return game_state
+
+
+def resetSearch(move_ordering):
+    """
+    Arama tablolarını temizler; böylece her ölçüm aynı başlangıçtan yapılır.
+    """
+    ChessAI.MOVE_ORDERING = move_ordering
+    ChessAI.transposition_table.clear()
+    ChessAI.history_scores.clear()
+    random.seed(0)
+
+
+def runSearch(game_state, move_ordering, depth):
+    """
+    Temiz arama tablolarıyla tek bir arama yapar ve (hamle, düğüm sayısı, süre) döndürür.
+    """
+    resetSearch(move_ordering)
+    return_queue = queue.Queue()
+    start_time = time.perf_counter()
+    ChessAI.findBestMove(game_state, game_state.getValidMoves(), return_queue, time_limit=None, max_depth=depth,
+                         use_book=False)
+    elapsed = time.perf_counter() - start_time
+    return return_queue.get(), ChessAI.nodes_searched, elapsed
+
+
+def moveListSize(moves):
+    """
+    Hamle listesinin ve içindeki hamlelerin bayt cinsinden toplam boyutu.
+    """
+    return sys.getsizeof(moves) + sum(sys.getsizeof(move) for move in moves)
+
+
+def reportMemory(depth):
+    """
+    Her pozisyonda sıralamalı aramanın en yüksek bellek kullanımını, arama boyunca ayrılıp arama sonunda
+    hâlâ ayrılmış olan bellek bloklarını (aramadan önceki ve sonraki tracemalloc anlık görüntülerinin farkı;
+    çoğu transpozisyon tablosu kayıtları) ve bunun düğüm başına düşen sayısını yazdırır.
+    tracemalloc serbest bırakılan blokları saymaz; düğüm başına blok, arama sonunda kalan ayırmaların oranıdır.
+    """
+    print("%-16s %8s %12s %12s %10s %10s" % ("pozisyon", "hamle", "liste bayt", "tepe KB", "blok", "blok/düğüm"))
+    for name, move_strings in BENCHMARK_POSITIONS.items():
+        game_state = loadPosition(move_strings)
+        moves = game_state.getValidMoves()
+        resetSearch(True)
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        ChessAI.findBestMove(game_state, moves, queue.Queue(), time_limit=None, max_depth=depth, use_book=False)
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        blocks = sum(statistic.count_diff for statistic in after.compare_to(before, "filename"))
+        print("%-16s %8d %12d %12.1f %10d %10.2f" % (name, len(moves), moveListSize(moves), peak / 1024.0, blocks,
+                                                     blocks / ChessAI.nodes_searched))
+
+
+def reportSpeedup(depth, worker_counts):
+    """
+    Her işçi sayısı için tüm pozisyonları sabit derinliğe kadar arar, toplam süreyi ve
+    tek süreçli aramaya göre hızlanmayı yazdırır. Her ölçüm soğuk tablolarla ve yeni havuzla başlar.
+    """
+    print("%-8s %12s %9s %9s" % ("işçi", "düğüm", "sn", "hızlanma"))
+    base_time = None
+    for workers in worker_counts:
+        total_nodes = 0
+        total_time = 0.0
+        for move_strings in BENCHMARK_POSITIONS.values():
+            game_state = loadPosition(move_strings)
+            resetSearch(True)
+            ChessAI.closeSearchPool()
+            if workers > 1:
+                ChessAI.getSearchPool(workers)  # süreç başlatma süresi ölçüme girmesin
+            start_time = time.perf_counter()
+            ChessAI.findBestMove(game_state, game_state.getValidMoves(), queue.Queue(), time_limit=None,
+                                 max_depth=depth, workers=workers, use_book=False)
+            total_time += time.perf_counter() - start_time
+            total_nodes += ChessAI.nodes_searched
+        if base_time is None:
+            base_time = total_time
+        print("%-8d %12d %9.2f %8.2fx" % (workers, total_nodes, total_time, base_time / total_time))
+    ChessAI.closeSearchPool()
+
+
+def reportSelective(depth):
+    """
+    Boş hamle budaması ve geç hamle indiriminin dört açık/kapalı bileşimi için tüm pozisyonları
+    sabit derinliğe kadar arar; toplam düğüm, derinliğe ulaşma süresi ve tekniklerin sayaçlarını yazdırır.
+    """
+    print("%-10s %12s %9s %10s %10s %10s %10s" % ("ayar", "düğüm", "sn", "boş dene", "boş kesme", "indirim",
+                                                  "yeniden"))
+    for name, null_move, late_move_reductions in (("kapalı", False, False), ("boş hamle", True, False),
+                                                  ("LMR", False, True), ("ikisi", True, True)):
+        ChessAI.NULL_MOVE = null_move
+        ChessAI.LATE_MOVE_REDUCTIONS = late_move_reductions
+        totals = [0] * 6
+        for move_strings in BENCHMARK_POSITIONS.values():
+            move, nodes, elapsed = runSearch(loadPosition(move_strings), True, depth)
+            for i, value in enumerate((nodes, elapsed, ChessAI.null_move_tries, ChessAI.null_move_cutoffs,
+                                       ChessAI.late_move_reductions, ChessAI.late_move_researches)):
+                totals[i] += value
+        print("%-10s %12d %9.2f %10d %10d %10d %10d" % (name, *totals))
+    ChessAI.NULL_MOVE = ChessAI.LATE_MOVE_REDUCTIONS = True
+
+
+def reportStaged(depth):
+    """
+    Aşamalı hamle üretimi kapalı ve açıkken her pozisyonu sabit derinliğe kadar arar;
+    düğüm sayısını, ana aramada üretilen hamle sayısını, düğüm başına üretilen hamleyi ve süreyi yazdırır.
+    """
+    print("%-16s %-7s %10s %10s %10s %9s" % ("pozisyon", "aşamalı", "düğüm", "hamle", "hamle/düğüm", "sn"))
+    totals = {False: [0, 0, 0.0], True: [0, 0, 0.0]}
+    for name, move_strings in BENCHMARK_POSITIONS.items():
+        for staged in (False, True):
+            ChessAI.STAGED_MOVE_GENERATION = staged
+            move, nodes, elapsed = runSearch(loadPosition(move_strings), True, depth)
+            for i, value in enumerate((nodes, ChessAI.moves_generated, elapsed)):
+                totals[staged][i] += value
+            print("%-16s %-7s %10d %10d %10.2f %9.2f" % (name, "açık" if staged else "kapalı", nodes,
+                                                        ChessAI.moves_generated, ChessAI.moves_generated / nodes,
+                                                        elapsed))
+    for staged in (False, True):
+        nodes, moves, elapsed = totals[staged]
+        print("%-16s %-7s %10d %10d %10.2f %9.2f" % ("toplam", "açık" if staged else "kapalı", nodes, moves,
+                                                    moves / nodes, elapsed))
+    ChessAI.STAGED_MOVE_GENERATION = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Karıştırma ve hamle sıralaması ile düğüm sayısı karşılaştırması")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--memory", action="store_true", help="bellek kullanımını raporla")
+    parser.add_argument("--workers", help="virgülle ayrılmış işçi sayıları, ör. 1,2,4,8,16")
+    parser.add_argument("--selective", action="store_true", help="boş hamle budaması ve LMR karşılaştırması")
+    parser.add_argument("--staged", action="store_true", help="aşamalı hamle üretimi karşılaştırması")
+    args = parser.parse_args()
+    if args.memory:
+        reportMemory(args.depth)
+        return
+    if args.workers:
+        reportSpeedup(args.depth, [int(workers) for workers in args.workers.split(",")])
+        return
+    if args.selective:
+        reportSelective(args.depth)
+        return
+    if args.staged:
+        reportStaged(args.depth)
+        return
+
+    total_nodes = {False: 0, True: 0}
+    total_time = {False: 0.0, True: 0.0}
+    print("%-16s %12s %9s %12s %9s %8s" % ("pozisyon", "karıştırma", "sn", "sıralama", "sn", "oran"))
+    for name, move_strings in BENCHMARK_POSITIONS.items():
+        results = {}
+        for move_ordering in (False, True):
+            move, nodes, elapsed = runSearch(loadPosition(move_strings), move_ordering, args.depth)
+            results[move_ordering] = (nodes, elapsed)
+            total_nodes[move_ordering] += nodes
+            total_time[move_ordering] += elapsed
+        print("%-16s %12d %9.2f %12d %9.2f %7.1f%%" % (name, results[False][0], results[False][1], results[True][0],
+                                                       results[True][1], 100.0 * results[True][0] / results[False][0]))
+    print("%-16s %12d %9.2f %12d %9.2f %7.1f%%" % ("toplam", total_nodes[False], total_time[False], total_nodes[True],
+                                                   total_time[True], 100.0 * total_nodes[True] / total_nodes[False]))
+    ChessAI.MOVE_ORDERING = True
+
+
+if __name__ == "__main__":
+    main()
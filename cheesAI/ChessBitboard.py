@@ -0,0 +1,360 @@
+"""
+Bitboard tabanlı oyun durumu.
+GameState ile aynı arayüzü sunar (makeMove, undoMove, getValidMoves, white_to_move, move_log, checkmate, stalemate),
+fakat hamleleri her taş türü ve renk için tutulan 64 bitlik tamsayılardan üretir.
+Kare numarası satır * 8 + sütundur; 0. bit a8, 63. bit h1 karesidir.
+Hız kazancı yoktur: makeMove ve undoMove tahta listesi, Zobrist anahtarı ve artımlı skor için GameState'in
+tüm işini yapar, üstüne bitleri çevirir; liste tabanlı üretici de saldırı haritalarıyla hızlandığından
+iki arka uç perft'te aşağı yukarı aynı düğüm/sn'ye ulaşır (pozisyona göre 0.9-1.25 kat).
+Bu sınıf bitboard üreticisinin doğruluğunu ve hızını liste üreticisiyle karşılaştırmak içindir.
+Kullanım (perft karşılaştırması): python ChessBitboard.py [--depth 3]
+"""
+import argparse
+import time
+import ChessEngine
+from ChessEngine import code_pieces, piece_codes, promotion_codes, MOVE_ENPASSANT, MOVE_CASTLE
+
+PIECES = ("wp", "wN", "wB", "wR", "wQ", "wK", "bp", "bN", "bB", "bR", "bQ", "bK")
+ROOK_DIRECTIONS = ((-1, 0), (0, -1), (1, 0), (0, 1))
+BISHOP_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+def buildStepAttacks(steps):
+    """
+    Her kare için verilen adımlarla tek hamlede ulaşılabilen karelerin maskesi.
+    """
+    attacks = []
+    for square in range(64):
+        row, col = divmod(square, 8)
+        mask = 0
+        for d_row, d_col in steps:
+            end_row, end_col = row + d_row, col + d_col
+            if 0 <= end_row <= 7 and 0 <= end_col <= 7:
+                mask |= 1 << (end_row * 8 + end_col)
+        attacks.append(mask)
+    return attacks
+
+
+def buildRays(direction):
+    """
+    Her kare için verilen yönde tahtanın kenarına kadar uzanan ışının maskesi (kare hariç).
+    """
+    rays = []
+    for square in range(64):
+        row, col = divmod(square, 8)
+        mask = 0
+        end_row, end_col = row + direction[0], col + direction[1]
+        while 0 <= end_row <= 7 and 0 <= end_col <= 7:
+            mask |= 1 << (end_row * 8 + end_col)
+            end_row, end_col = end_row + direction[0], end_col + direction[1]
+        rays.append(mask)
+    return rays
+
+
+knight_attacks = buildStepAttacks(((-2, -1), (-2, 1), (-1, 2), (1, 2), (2, -1), (2, 1), (-1, -2), (1, -2)))
+king_attacks = buildStepAttacks(((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)))
+# pawn_attacks["w"][kare]: o karedeki beyaz piyonun saldırdığı kareler
+pawn_attacks = {"w": buildStepAttacks(((-1, -1), (-1, 1))), "b": buildStepAttacks(((1, -1), (1, 1)))}
+# (ışın maskeleri, yön artan kare numarasına mı gidiyor) çiftleri
+rook_rays = [(buildRays(direction), direction[0] * 8 + direction[1] > 0) for direction in ROOK_DIRECTIONS]
+bishop_rays = [(buildRays(direction), direction[0] * 8 + direction[1] > 0) for direction in BISHOP_DIRECTIONS]
+
+
+def slidingAttacks(square, occupancy, rays):
+    """
+    Kaleden veya filden gelen saldırılar: her ışın ilk engelde (engel dahil) kesilir.
+    """
+    attacks = 0
+    for ray_masks, positive in rays:
+        ray = ray_masks[square]
+        blockers = ray & occupancy
+        if blockers:
+            if positive:
+                first_blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                first_blocker = blockers.bit_length() - 1
+            ray ^= ray_masks[first_blocker]
+        attacks |= ray
+    return attacks
+
+
+def iterateSquares(bitboard):
+    """
+    Bitboard'daki dolu karelerin numaralarını küçükten büyüğe üretir.
+    """
+    while bitboard:
+        lowest_bit = bitboard & -bitboard
+        yield lowest_bit.bit_length() - 1
+        bitboard ^= lowest_bit
+
+
+class BitboardGameState(ChessEngine.GameState):
+    def __init__(self, fen=None):
+        """
+        Tahta listesi (board) arayüz ve Move nesneleri için korunur; hamle üretimi bitboard'lardan yapılır.
+        """
+        ChessEngine.GameState.__init__(self, fen)
+        self.loadBitboards()
+
+    def loadFen(self, fen):
+        ChessEngine.GameState.loadFen(self, fen)
+        self.loadBitboards()
+
+    def loadBitboards(self):
+        """
+        Bitboard'ları ve renk doluluk maskelerini tahta listesinden yeniden kurar.
+        """
+        self.bitboards = {piece: 0 for piece in PIECES}
+        self.occupancy = {"w": 0, "b": 0}
+        for row in range(8):
+            for col in range(8):
+                piece = self.board[row][col]
+                if piece != "--":
+                    self.bitboards[piece] |= 1 << (row * 8 + col)
+                    self.occupancy[piece[0]] |= 1 << (row * 8 + col)
+
+    def makeMove(self, move):
+        if not isinstance(move, int):
+            move = move.packed
+        ChessEngine.GameState.makeMove(self, move)
+        self.flipMoveBits(move)
+
+    def undoMove(self):
+        if len(self.move_log) != 0:
+            move = self.move_log[-1]
+            self.flipMoveBits(move)
+            ChessEngine.GameState.undoMove(self)
+
+    def flipMoveBits(self, move):
+        """
+        Hamlenin değiştirdiği bitleri çevirir; XOR olduğu için yapma ve geri alma için aynıdır.
+        """
+        piece_moved = code_pieces[move >> 12 & 15]
+        piece_placed = code_pieces[move >> 23 & 15] if move >> 23 & 15 else piece_moved
+        color = piece_moved[0]
+        start_bit = 1 << (move & 63)
+        end_bit = 1 << (move >> 6 & 63)
+        self.bitboards[piece_moved] ^= start_bit
+        self.bitboards[piece_placed] ^= end_bit
+        self.occupancy[color] ^= start_bit | end_bit
+        if move >> 16 & 15:
+            piece_captured = code_pieces[move >> 16 & 15]
+            # geçerken almada yenen piyon başlangıç satırında, bitiş sütunundadır
+            captured_bit = 1 << ((move & 56) | (move >> 6 & 7)) if move & MOVE_ENPASSANT else end_bit
+            self.bitboards[piece_captured] ^= captured_bit
+            self.occupancy[piece_captured[0]] ^= captured_bit
+        if move & MOVE_CASTLE:
+            end_square = move >> 6 & 63
+            if end_square > move & 63:  # şah kanadı
+                rook_bits = (1 << (end_square + 1)) | (1 << (end_square - 1))
+            else:  # vezir kanadı
+                rook_bits = (1 << (end_square - 2)) | (1 << (end_square + 1))
+            self.bitboards[color + "R"] ^= rook_bits
+            self.occupancy[color] ^= rook_bits
+
+    def isSquareAttacked(self, square, by_color, occupancy, removed=0):
+        """
+        by_color renkli taşlardan biri kareye saldırıyor mu?
+        occupancy hamle sonrası doluluktur; removed ile alınan taşın biti saldıranlardan çıkarılır.
+        """
+        bitboards = self.bitboards
+        keep = ~removed
+        if knight_attacks[square] & bitboards[by_color + "N"] & keep:
+            return True
+        if king_attacks[square] & bitboards[by_color + "K"]:
+            return True
+        # kareye saldıran piyonlar, kareden karşı renk piyon gibi bakınca görülen karelerdedir
+        if pawn_attacks["b" if by_color == "w" else "w"][square] & bitboards[by_color + "p"] & keep:
+            return True
+        queens = bitboards[by_color + "Q"]
+        if slidingAttacks(square, occupancy, rook_rays) & (bitboards[by_color + "R"] | queens) & keep:
+            return True
+        if slidingAttacks(square, occupancy, bishop_rays) & (bitboards[by_color + "B"] | queens) & keep:
+            return True
+        return False
+
+    def squareUnderAttack(self, row, col):
+        enemy_color = "b" if self.white_to_move else "w"
+        return self.isSquareAttacked(row * 8 + col, enemy_color, self.occupancy["w"] | self.occupancy["b"])
+
+    def inCheck(self):
+        ally_color = "w" if self.white_to_move else "b"
+        king_square = self.bitboards[ally_color + "K"].bit_length() - 1
+        return self.isSquareAttacked(king_square, "b" if self.white_to_move else "w",
+                                     self.occupancy["w"] | self.occupancy["b"])
+
+    def getPinnedPieces(self, king_square, ally_color, enemy_color, occupancy):
+        """
+        Şaha doğru açmaza alınmış dost taşların maskesi.
+        """
+        pinned = 0
+        own = self.occupancy[ally_color]
+        queens = self.bitboards[enemy_color + "Q"]
+        for rays, sliders in ((rook_rays, self.bitboards[enemy_color + "R"] | queens),
+                              (bishop_rays, self.bitboards[enemy_color + "B"] | queens)):
+            for ray_masks, positive in rays:
+                blockers = ray_masks[king_square] & occupancy
+                if not blockers:
+                    continue
+                first_bit = blockers & -blockers if positive else 1 << (blockers.bit_length() - 1)
+                if not first_bit & own:
+                    continue
+                blockers ^= first_bit
+                if not blockers:
+                    continue
+                second_bit = blockers & -blockers if positive else 1 << (blockers.bit_length() - 1)
+                if second_bit & sliders:
+                    pinned |= first_bit
+        return pinned
+
+    def getValidMoves(self):
+        """
+        Şahlar dikkate alınarak tüm hareketler, paketlenmiş tamsayılar olarak.
+        """
+        moves = self.generateMoves(False)
+        if len(moves) == 0:
+            if self.in_check:
+                self.checkmate = True
+            else:
+                self.stalemate = True
+        else:
+            self.checkmate = False
+            self.stalemate = False
+        return moves
+
+    def getCaptureMoves(self):
+        """
+        Yalnızca geçerli taş yeme ve terfi hamleleri; hedef maskesi rakip taşlarla sınırlanır.
+        """
+        return self.generateMoves(True)
+
+    def generateMoves(self, captures_only):
+        """
+        Açmazdaki taşlar, şah hamleleri, geçerken alma ve şah altındaki tüm hamleler
+        hamle sonrası doluluk üzerinden şaha saldırı sorgusuyla denetlenir.
+        captures_only ise sessiz hamleler (terfi olmayan piyon itişleri, rok, boş kareye gidişler) üretilmez.
+        """
+        moves = []
+        board = self.board
+        bitboards = self.bitboards
+        if self.white_to_move:
+            ally_color, enemy_color, forward, start_row, last_row = "w", "b", -8, 6, 0
+        else:
+            ally_color, enemy_color, forward, start_row, last_row = "b", "w", 8, 1, 7
+        own = self.occupancy[ally_color]
+        enemy = self.occupancy[enemy_color]
+        occupancy = own | enemy
+        empty = ~occupancy
+        king_square = bitboards[ally_color + "K"].bit_length() - 1
+        self.in_check = self.isSquareAttacked(king_square, enemy_color, occupancy)
+        must_verify = -1 if self.in_check else self.getPinnedPieces(king_square, ally_color, enemy_color, occupancy)
+
+        def addMove(base, end_square, is_enpassant_move=False):
+            start_bit = 1 << (base & 63)
+            end_bit = 1 << end_square
+            if must_verify & start_bit or is_enpassant_move:
+                removed = 1 << (end_square - forward) if is_enpassant_move else end_bit
+                after = (occupancy ^ start_bit ^ removed) | end_bit
+                if self.isSquareAttacked(king_square, enemy_color, after, removed):
+                    return
+            if is_enpassant_move:
+                moves.append(base | end_square << 6 | enemy_pawn_code << 16 | MOVE_ENPASSANT)
+            else:
+                moves.append(base | end_square << 6 | piece_codes[board[end_square >> 3][end_square & 7]] << 16)
+
+        # piyonlar
+        enpassant_bit = 0
+        if self.enpassant_possible != ():
+            enpassant_bit = 1 << (self.enpassant_possible[0] * 8 + self.enpassant_possible[1])
+        pawn_code = piece_codes[ally_color + "p"] << 12
+        enemy_pawn_code = piece_codes[enemy_color + "p"]
+        for square in iterateSquares(bitboards[ally_color + "p"]):
+            base = square | pawn_code
+            one_step = square + forward
+            first_move = len(moves)
+            if empty & (1 << one_step) and (not captures_only or one_step >> 3 == last_row):
+                addMove(base, one_step)
+                if square >> 3 == start_row and not captures_only and empty & (1 << (one_step + forward)):
+                    addMove(base, one_step + forward)
+            attacks = pawn_attacks[ally_color][square]
+            for end_square in iterateSquares(attacks & enemy):
+                addMove(base, end_square)
+            if attacks & enpassant_bit:
+                addMove(base, enpassant_bit.bit_length() - 1, is_enpassant_move=True)
+            if one_step >> 3 == last_row:  # her terfi hamlesi dört taşa açılır
+                promotions = moves[first_move:]
+                del moves[first_move:]
+                for move in promotions:
+                    for promotion_code in promotion_codes[ally_color]:
+                        moves.append(move | promotion_code)
+        # atlar ve kayan taşlar
+        not_own = enemy if captures_only else ~own
+        knight_code = piece_codes[ally_color + "N"] << 12
+        for square in iterateSquares(bitboards[ally_color + "N"]):
+            for end_square in iterateSquares(knight_attacks[square] & not_own):
+                addMove(square | knight_code, end_square)
+        queens = bitboards[ally_color + "Q"]
+        queen_code = piece_codes[ally_color + "Q"] << 12
+        bishop_code = piece_codes[ally_color + "B"] << 12
+        rook_code = piece_codes[ally_color + "R"] << 12
+        for square in iterateSquares(bitboards[ally_color + "B"] | queens):
+            base = square | (queen_code if queens & (1 << square) else bishop_code)
+            for end_square in iterateSquares(slidingAttacks(square, occupancy, bishop_rays) & not_own):
+                addMove(base, end_square)
+        for square in iterateSquares(bitboards[ally_color + "R"] | queens):
+            base = square | (queen_code if queens & (1 << square) else rook_code)
+            for end_square in iterateSquares(slidingAttacks(square, occupancy, rook_rays) & not_own):
+                addMove(base, end_square)
+        # şah: şahın kendisi dolulukta olmadan hedef kare denetlenir ki kendi gölgesine kaçamasın
+        king_bit = 1 << king_square
+        base = king_square | piece_codes[ally_color + "K"] << 12
+        for end_square in iterateSquares(king_attacks[king_square] & not_own):
+            end_bit = 1 << end_square
+            if not self.isSquareAttacked(end_square, enemy_color, (occupancy ^ king_bit) | end_bit, end_bit):
+                moves.append(base | end_square << 6 | piece_codes[board[end_square >> 3][end_square & 7]] << 16)
+        # rok
+        if not self.in_check and not captures_only:
+            self.getBitboardCastleMoves(king_square, ally_color, enemy_color, occupancy, moves)
+        return moves
+
+    def getBitboardCastleMoves(self, king_square, ally_color, enemy_color, occupancy, moves):
+        castling_rights = self.current_castling_rights
+        if ally_color == "w":
+            kingside, queenside = castling_rights.wks, castling_rights.wqs
+        else:
+            kingside, queenside = castling_rights.bks, castling_rights.bqs
+        king_code = piece_codes[ally_color + "K"] << 12
+        if kingside and not occupancy & (0b11 << (king_square + 1)):
+            if not self.isSquareAttacked(king_square + 1, enemy_color, occupancy) and \
+                    not self.isSquareAttacked(king_square + 2, enemy_color, occupancy):
+                moves.append(king_square | (king_square + 2) << 6 | king_code | MOVE_CASTLE)
+        if queenside and not occupancy & (0b111 << (king_square - 3)):
+            if not self.isSquareAttacked(king_square - 1, enemy_color, occupancy) and \
+                    not self.isSquareAttacked(king_square - 2, enemy_color, occupancy):
+                moves.append(king_square | (king_square - 2) << 6 | king_code | MOVE_CASTLE)
+
+
+def main():
+    import ChessBenchmark
+    import ChessPerft
+    parser = argparse.ArgumentParser(description="Liste tabanlı ve bitboard tabanlı hamle üreticisinin perft karşılaştırması")
+    parser.add_argument("--depth", type=int, default=3)
+    args = parser.parse_args()
+
+    print("%-16s %10s %10s %10s %10s %7s" % ("pozisyon", "düğüm", "liste n/s", "bitboard", "bit n/s", "oran"))
+    all_match = True
+    for name, move_strings in ChessBenchmark.BENCHMARK_POSITIONS.items():
+        results = []
+        for state_class in (ChessEngine.GameState, BitboardGameState):
+            game_state = ChessBenchmark.loadPosition(move_strings, state_class)
+            start_time = time.perf_counter()
+            nodes = ChessPerft.perft(game_state, args.depth)
+            results.append((nodes, nodes / (time.perf_counter() - start_time)))
+        all_match = all_match and results[0][0] == results[1][0]
+        print("%-16s %10d %10.0f %10d %10.0f %6.2fx" % (name, results[0][0], results[0][1], results[1][0], results[1][1],
+                                                        results[1][1] / results[0][1]))
+    print("düğüm sayıları " + ("eşleşiyor" if all_match else "EŞLEŞMİYOR"))
+
+
+if __name__ == "__main__":
+    main()
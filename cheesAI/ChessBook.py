@@ -0,0 +1,213 @@
+"""
+Açılış kitabı.
+Kitap, Zobrist anahtarına göre sıralanmış 16 baytlık kayıtlardan oluşan ikili bir dosyadır:
+anahtar (8 bayt), paketlenmiş hamle (4 bayt), ağırlık (2 bayt), boşluk (2 bayt); büyük endian.
+Dosya mmap ile salt okunur açılır ve ikili aramayla sorgulanır, belleğe yüklenmez;
+işletim sistemi sayfaları paylaştığından aynı kitabı açan tüm motor süreçleri tek kopyayı kullanır.
+Anahtarlar bu motorun Zobrist tablolarına bağlıdır, Polyglot kitaplarıyla uyumlu değildir.
+Kitap PGN dosyalarından oluşturulur: her oyunun ilk hamlelerinde, oynayan taraf kazandıysa 2,
+berabere ya da sonuç bilinmiyorsa 1 ağırlık eklenir; kaybeden tarafın hamleleri eklenmez.
+Kullanım: python ChessBook.py oyunlar.pgn [diger.pgn ...] [--output book.bin] [--plies 20]
+          python ChessBook.py --probe "FEN" [--output book.bin]
+"""
+import argparse
+import mmap
+import os
+import random
+import re
+import struct
+import ChessEngine
+
+ENTRY = struct.Struct(">QIH2x")
+MAX_WEIGHT = 0xFFFF
+RESULT_TOKENS = ("1-0", "0-1", "1/2-1/2", "*")
+
+
+class OpeningBook:
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        self.entry_count = size // ENTRY.size
+        # boş dosya eşlenemez; o durumda kitap hiç kayıt içermez
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.entry_count else None
+
+    def findFirstEntry(self, key):
+        """
+        Anahtarı key olan ilk kaydın sırası (ikili arama); yoksa key'den büyük ilk kaydın sırası.
+        """
+        low, high = 0, self.entry_count
+        while low < high:
+            middle = (low + high) // 2
+            if ENTRY.unpack_from(self.data, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def getMoves(self, key):
+        """
+        Pozisyonun kitaptaki [(hamle, ağırlık), ...] listesi.
+        """
+        moves = []
+        index = self.findFirstEntry(key)
+        while index < self.entry_count:
+            entry_key, move, weight = ENTRY.unpack_from(self.data, index * ENTRY.size)
+            if entry_key != key:
+                break
+            moves.append((move, weight))
+            index += 1
+        return moves
+
+    def chooseMove(self, game_state):
+        """
+        Kitaptaki geçerli hamlelerden ağırlığa göre rastgele birini seçer; yoksa None.
+        """
+        valid_moves = game_state.getValidMoves()
+        moves = [(move, weight) for move, weight in self.getMoves(game_state.zobrist_key) if move in valid_moves]
+        if not moves:
+            return None
+        return random.choices([move for move, weight in moves], [weight for move, weight in moves])[0]
+
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+        self.file.close()
+
+
+def findMoveBySan(game_state, san):
+    """
+    Standart cebirsel gösterimdeki ("Nbd7", "exd5", "e8=Q+", "O-O") hamleyi geçerli hamleler arasında bulur.
+    """
+    san = san.rstrip("+#!?")
+    if san in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        end_col = 6 if len(san) == 3 else 2
+        for move in game_state.getValidMoveObjects():
+            if move.is_castle_move and move.end_col == end_col:
+                return move
+        raise ValueError("Geçersiz hamle: " + san)
+    promotion_piece = ""
+    if "=" in san:
+        san, promotion_piece = san.split("=")
+    elif san[-1] in "QRBN" and len(san) > 2 and san[-2] in "18":
+        san, promotion_piece = san[:-1], san[-1]
+    piece = san[0] if san[0] in "NBRQK" else "p"
+    if piece != "p":
+        san = san[1:]
+    if len(san) < 2:
+        raise ValueError("Geçersiz hamle: " + san)
+    end_square = san[-2:]
+    disambiguation = san[:-2].replace("x", "")
+    for move in game_state.getValidMoveObjects():
+        if move.piece_moved[1] != piece or move.getRankFile(move.end_row, move.end_col) != end_square:
+            continue
+        start_square = move.getRankFile(move.start_row, move.start_col)
+        if any(char not in start_square for char in disambiguation):
+            continue
+        if move.getPromotionPiece() != promotion_piece and (promotion_piece or move.getPromotionPiece() != "Q"):
+            continue
+        return move
+    raise ValueError("Geçersiz hamle: " + san)
+
+
+def readPgnGames(lines):
+    """
+    PGN satırlarından (sonuç, [SAN hamleleri]) demetleri üretir; dosya oyun oyun okunur.
+    Yorumlar, varyantlar, hamle numaraları ve NAG'ler atlanır.
+    """
+    result = "*"
+    movetext = []
+    for line in lines:
+        line = line.strip()
+        if line.startswith("["):
+            if movetext:
+                yield result, parseMovetext(" ".join(movetext))
+                movetext = []
+                result = "*"
+            match = re.match(r'\[Result\s+"([^"]*)"\]', line)
+            if match:
+                result = match.group(1)
+        elif line and not line.startswith("%"):
+            movetext.append(line.split(";")[0])
+    if movetext:
+        yield result, parseMovetext(" ".join(movetext))
+
+
+def parseMovetext(movetext):
+    text = re.sub(r"\{[^}]*\}", " ", movetext)
+    # iç içe varyantları kaldır
+    depth = 0
+    main_line = []
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            main_line.append(char)
+    moves = []
+    for token in "".join(main_line).split():
+        token = re.sub(r"^\d+\.+", "", token)
+        if not token or token.startswith("$") or token in RESULT_TOKENS:
+            continue
+        moves.append(token)
+    return moves
+
+
+def buildBook(pgn_paths, output_path, plies=20):
+    """
+    PGN dosyalarındaki oyunların ilk plies yarım hamlesinden kitap oluşturur. (oyun, kayıt) sayısını döndürür.
+    """
+    weights = {}
+    game_count = 0
+    for pgn_path in pgn_paths:
+        with open(pgn_path, encoding="utf-8", errors="replace") as pgn_file:
+            for result, san_moves in readPgnGames(pgn_file):
+                game_count += 1
+                game_state = ChessEngine.GameState()
+                for san in san_moves[:plies]:
+                    try:
+                        move = findMoveBySan(game_state, san)
+                    except ValueError:
+                        break  # okunamayan hamleden sonrası atlanır
+                    if result == "1-0":
+                        weight = 2 if game_state.white_to_move else 0
+                    elif result == "0-1":
+                        weight = 0 if game_state.white_to_move else 2
+                    else:
+                        weight = 1
+                    if weight:
+                        moves = weights.setdefault(game_state.zobrist_key, {})
+                        moves[move.packed] = moves.get(move.packed, 0) + weight
+                    game_state.makeMove(move)
+    with open(output_path, "wb") as book_file:
+        entry_count = 0
+        for key in sorted(weights):
+            moves = weights[key]
+            for move in sorted(moves, key=lambda book_move: -moves[book_move]):
+                book_file.write(ENTRY.pack(key, move, min(moves[move], MAX_WEIGHT)))
+                entry_count += 1
+    return game_count, entry_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PGN dosyalarından açılış kitabı oluşturur ya da kitabı sorgular")
+    parser.add_argument("pgn", nargs="*", help="PGN dosyaları")
+    parser.add_argument("--output", default="book.bin", help="kitap dosyası (varsayılan book.bin)")
+    parser.add_argument("--plies", type=int, default=20, help="oyun başına alınacak yarım hamle sayısı")
+    parser.add_argument("--probe", metavar="FEN", help="kitabı oluşturmak yerine bu pozisyonun hamlelerini listele")
+    args = parser.parse_args()
+    if args.probe is not None:
+        game_state = ChessEngine.GameState(args.probe)
+        book = OpeningBook(args.output)
+        for move, weight in book.getMoves(game_state.zobrist_key):
+            print("%s %d" % (ChessEngine.Move.fromPacked(move).getUciNotation(), weight))
+        book.close()
+        return
+    if not args.pgn:
+        parser.error("en az bir PGN dosyası gerekli")
+    game_count, entry_count = buildBook(args.pgn, args.output, args.plies)
+    print("%d oyun, %d kayıt -> %s" % (game_count, entry_count, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,143 @@ Satranç oyununun mevcut durumu ile ilgili tüm bilgileri saklamak.
 Mevcut durumda geçerli hamlelerin belirlenmesi.
 Hareket kaydını tutacaktır.
 """
+import random
+
+# Zobrist anahtarları: her taş ve kare, sıra, rok hakları ve geçerken alma sütunu için sabit 64 bitlik rastgele sayılar.
+# Tohum sabit tutulur, böylece aynı pozisyon her süreçte aynı anahtarı üretir.
+zobrist_random = random.Random(20210601)
+zobrist_pieces = {piece: [[zobrist_random.getrandbits(64) for col in range(8)] for row in range(8)]
+                  for piece in ("wp", "wN", "wB", "wR", "wQ", "wK", "bp", "bN", "bB", "bR", "bQ", "bK")}
+zobrist_black_to_move = zobrist_random.getrandbits(64)
+zobrist_castling = [zobrist_random.getrandbits(64) for i in range(16)]
+zobrist_enpassant = [zobrist_random.getrandbits(64) for col in range(8)]
+
+piece_score = {"K": 0, "Q": 9, "R": 5, "B": 3, "N": 3, "p": 1}
+
+knight_scores = [[0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0],
+                 [0.1, 0.3, 0.5, 0.5, 0.5, 0.5, 0.3, 0.1],
+                 [0.2, 0.5, 0.6, 0.65, 0.65, 0.6, 0.5, 0.2],
+                 [0.2, 0.55, 0.65, 0.7, 0.7, 0.65, 0.55, 0.2],
+                 [0.2, 0.5, 0.65, 0.7, 0.7, 0.65, 0.5, 0.2],
+                 [0.2, 0.55, 0.6, 0.65, 0.65, 0.6, 0.55, 0.2],
+                 [0.1, 0.3, 0.5, 0.55, 0.55, 0.5, 0.3, 0.1],
+                 [0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0]]
+
+bishop_scores = [[0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.0],
+                 [0.2, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.2],
+                 [0.2, 0.4, 0.5, 0.6, 0.6, 0.5, 0.4, 0.2],
+                 [0.2, 0.5, 0.5, 0.6, 0.6, 0.5, 0.5, 0.2],
+                 [0.2, 0.4, 0.6, 0.6, 0.6, 0.6, 0.4, 0.2],
+                 [0.2, 0.6, 0.6, 0.6, 0.6, 0.6, 0.6, 0.2],
+                 [0.2, 0.5, 0.4, 0.4, 0.4, 0.4, 0.5, 0.2],
+                 [0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.0]]
+
+rook_scores = [[0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25],
+               [0.5, 0.75, 0.75, 0.75, 0.75, 0.75, 0.75, 0.5],
+               [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+               [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+               [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+               [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+               [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+               [0.25, 0.25, 0.25, 0.5, 0.5, 0.25, 0.25, 0.25]]
+
+queen_scores = [[0.0, 0.2, 0.2, 0.3, 0.3, 0.2, 0.2, 0.0],
+                [0.2, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.2],
+                [0.2, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.2],
+                [0.3, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.3],
+                [0.4, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.3],
+                [0.2, 0.5, 0.5, 0.5, 0.5, 0.5, 0.4, 0.2],
+                [0.2, 0.4, 0.5, 0.4, 0.4, 0.4, 0.4, 0.2],
+                [0.0, 0.2, 0.2, 0.3, 0.3, 0.2, 0.2, 0.0]]
+
+pawn_scores = [[0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8],
+               [0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7],
+               [0.3, 0.3, 0.4, 0.5, 0.5, 0.4, 0.3, 0.3],
+               [0.25, 0.25, 0.3, 0.45, 0.45, 0.3, 0.25, 0.25],
+               [0.2, 0.2, 0.2, 0.4, 0.4, 0.2, 0.2, 0.2],
+               [0.25, 0.15, 0.1, 0.2, 0.2, 0.1, 0.15, 0.25],
+               [0.25, 0.3, 0.3, 0.0, 0.0, 0.3, 0.3, 0.25],
+               [0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2]]
+
+piece_position_scores = {"wN": knight_scores,
+                         "bN": knight_scores[::-1],
+                         "wB": bishop_scores,
+                         "bB": bishop_scores[::-1],
+                         "wQ": queen_scores,
+                         "bQ": queen_scores[::-1],
+                         "wR": rook_scores,
+                         "bR": rook_scores[::-1],
+                         "wp": pawn_scores,
+                         "bp": pawn_scores[::-1]}
+
+
+
+def buildTargetTable(steps):
+    """
+    Her kare için verilen adımlarla tahtada kalınarak ulaşılan karelerin listesi: tablo[satır][sütun] -> ((satır, sütun), ...)
+    """
+    return [[tuple((row + d_row, col + d_col) for d_row, d_col in steps
+                   if 0 <= row + d_row <= 7 and 0 <= col + d_col <= 7) for col in range(8)] for row in range(8)]
+
+
+def buildRayTable(directions):
+    """
+    Her kare için her yönde kareden tahtanın kenarına doğru sıralı kareler: tablo[satır][sütun][yön] -> ((satır, sütun), ...)
+    """
+    rays = [[[] for col in range(8)] for row in range(8)]
+    for row in range(8):
+        for col in range(8):
+            for d_row, d_col in directions:
+                rays[row][col].append(tuple((row + d_row * i, col + d_col * i) for i in range(1, 8)
+                                            if 0 <= row + d_row * i <= 7 and 0 <= col + d_col * i <= 7))
+    return rays
+
+
+# hamle üretimi ve saldırı sorguları için içe aktarımda bir kez hesaplanan tablolar;
+# iç döngüler koordinat aritmetiği ve sınır denetimi yapmaz
+knight_targets = buildTargetTable(((-2, -1), (-2, 1), (-1, 2), (1, 2), (2, -1), (2, 1), (-1, -2), (1, -2)))
+king_targets = buildTargetTable(((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)))
+# ilk dört yön dikey/yatay (kale), son dört yön çapraz (fil)
+ray_directions = ((-1, 0), (0, -1), (1, 0), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+direction_rays = buildRayTable(ray_directions)
+# saldırı haritası için kare kümeleri bit maskesi olarak (bit satır * 8 + sütun)
+knight_masks = [[sum(1 << (end_row * 8 + end_col) for end_row, end_col in targets) for targets in row_targets]
+                for row_targets in knight_targets]
+king_masks = [[sum(1 << (end_row * 8 + end_col) for end_row, end_col in targets) for targets in row_targets]
+              for row_targets in king_targets]
+ALL_SQUARES = (1 << 64) - 1
+ray_masks = [[[sum(1 << (end_row * 8 + end_col) for end_row, end_col in ray) for ray in rays] for rays in row_rays]
+             for row_rays in direction_rays]
+
+# artımlı değerlendirme için işaretli tablolar: beyaz taşlar pozitif, siyah taşlar negatif katkı yapar
+material_values = {piece: (1 if piece[0] == "w" else -1) * piece_score[piece[1]]
+                   for piece in ("wp", "wN", "wB", "wR", "wQ", "wK", "bp", "bN", "bB", "bR", "bQ", "bK")}
+position_values = {piece: [[(1 if piece[0] == "w" else -1) * piece_position_scores[piece][row][col]
+                            if piece in piece_position_scores else 0 for col in range(8)] for row in range(8)]
+                   for piece in material_values}
+
+# paketlenmiş hamle: tek bir tamsayı
+#   0-5. bitler başlangıç karesi, 6-11. bitler bitiş karesi (kare = satır * 8 + sütun)
+#   12-15. bitler hareket eden taş, 16-19. bitler yenen taş (0: yok), 23-26. bitler terfi edilen taş (0: terfi yok)
+#   27. bit geçerken alma, 28. bit rok
+# arama yalnızca bu tamsayılarla çalışır; Move nesnesi yalnızca arayüz ve notasyon için oluşturulur
+code_pieces = ("--", "wp", "wN", "wB", "wR", "wQ", "wK", "bp", "bN", "bB", "bR", "bQ", "bK")
+piece_codes = {piece: code for code, piece in enumerate(code_pieces)}
+MOVE_ENPASSANT = 1 << 27
+MOVE_CASTLE = 1 << 28
+MOVE_TACTICAL = 15 << 16 | 15 << 23  # yenen taş ya da terfi bitleri; taktik hamlelerde sıfırdan farklıdır
+# terfi bitleri, renge göre vezir, kale, fil, at sırasıyla; arama önce vezir terfisini görür
+promotion_codes = {color: [piece_codes[color + piece] << 23 for piece in "QRBN"] for color in "wb"}
 
 
 class GameState:
-    def __init__(self):
+    def __init__(self, fen=None):
         """
         Pano 8x8 2d bir listedir, listedeki her eleman 2 karakterden oluşur.
         İlk karakter, parçanın rengini temsil eder: "b" veya "w".
         İkinci karakter parçanın türünü temsil eder: 'R', 'N', 'B', 'Q', 'K' veya 'p'.
         "--" parçası olmayan boş bir alanı temsil eder.
+        fen verilirse başlangıç pozisyonu yerine o pozisyon kurulur.
         """
         self.board = [
             ["bR", "bN", "bB", "bQ", "bK", "bB", "bN", "bR"],
@@ -38,76 +166,278 @@ class GameState:
         self.current_castling_rights = CastleRights(True, True, True, True)
         self.castle_rights_log = [CastleRights(self.current_castling_rights.wks, self.current_castling_rights.bks,
                                                self.current_castling_rights.wqs, self.current_castling_rights.bqs)]
+        self.zobrist_key = self.computeZobristKey()
+        self.zobrist_key_log = [self.zobrist_key]
+        # beyaz açısından taş değerleri ve konum puanları toplamı; makeMove ve undoMove farkla günceller
+        self.material_score, self.position_score = self.computeEvaluation()
+        self.piece_count = 32  # tahtadaki taş sayısı (şahlar dahil); oyun sonu tablosu sorgusu için
+        # FEN'den gelen sayaçlar; güncel değerler hamle kaydından hesaplanır (getFen)
+        self.initial_halfmove_clock = 0
+        self.initial_fullmove_number = 1
+        self.initial_white_to_move = True
+        if fen is not None:
+            self.loadFen(fen)
+
+    def loadFen(self, fen):
+        """
+        FEN dizisindeki pozisyonu kurar; hamle kaydı ve geçmiş sıfırlanır.
+        Yarım hamle ve hamle sayacı alanları isteğe bağlıdır (EPD satırlarında yoktur).
+        Her tarafın tam bir şahı olmalı ve sıra alanı "w" ya da "b" olmalıdır; geçersiz FEN'de durum değişmez.
+        """
+        fields = fen.split()
+        if len(fields) < 4 or fields[1] not in ("w", "b"):
+            raise ValueError("Geçersiz FEN: " + fen)
+        rows = fields[0].split("/")
+        if len(rows) != 8:
+            raise ValueError("Geçersiz FEN: " + fen)
+        board = []
+        king_locations = {"wK": [], "bK": []}
+        for row, fen_row in enumerate(rows):
+            board_row = []
+            for char in fen_row:
+                if char.isdigit():
+                    board_row.extend(["--"] * int(char))
+                elif char.upper() in "PNBRQK":
+                    color = "w" if char.isupper() else "b"
+                    board_row.append(color + (char.upper() if char.upper() != "P" else "p"))
+                    if board_row[-1] in king_locations:
+                        king_locations[board_row[-1]].append((row, len(board_row) - 1))
+                else:
+                    raise ValueError("Geçersiz FEN: " + fen)
+            if len(board_row) != 8:
+                raise ValueError("Geçersiz FEN: " + fen)
+            board.append(board_row)
+        if len(king_locations["wK"]) != 1 or len(king_locations["bK"]) != 1:
+            raise ValueError("Geçersiz FEN (her tarafın tek şahı olmalı): " + fen)
+        self.board = board
+        self.white_king_location = king_locations["wK"][0]
+        self.black_king_location = king_locations["bK"][0]
+        self.white_to_move = fields[1] == "w"
+        self.current_castling_rights = CastleRights("K" in fields[2], "k" in fields[2], "Q" in fields[2],
+                                                    "q" in fields[2])
+        if fields[3] == "-":
+            self.enpassant_possible = ()
+        elif len(fields[3]) != 2 or fields[3][0] not in Move.files_to_cols or fields[3][1] not in Move.ranks_to_rows:
+            raise ValueError("Geçersiz FEN: " + fen)
+        else:
+            self.enpassant_possible = (Move.ranks_to_rows[fields[3][1]], Move.files_to_cols[fields[3][0]])
+        self.initial_halfmove_clock = int(fields[4]) if len(fields) > 4 and fields[4].isdigit() else 0
+        self.initial_fullmove_number = int(fields[5]) if len(fields) > 5 and fields[5].isdigit() else 1
+        self.initial_white_to_move = self.white_to_move
+        self.move_log = []
+        self.checkmate = False
+        self.stalemate = False
+        self.enpassant_possible_log = [self.enpassant_possible]
+        self.castle_rights_log = [CastleRights(self.current_castling_rights.wks, self.current_castling_rights.bks,
+                                               self.current_castling_rights.wqs, self.current_castling_rights.bqs)]
+        self.zobrist_key = self.computeZobristKey()
+        self.zobrist_key_log = [self.zobrist_key]
+        self.material_score, self.position_score = self.computeEvaluation()
+        self.piece_count = sum(piece != "--" for board_row in board for piece in board_row)
+
+    def getFen(self):
+        """
+        Mevcut pozisyonun FEN dizisi.
+        """
+        fen_rows = []
+        for board_row in self.board:
+            fen_row = ""
+            empty_squares = 0
+            for piece in board_row:
+                if piece == "--":
+                    empty_squares += 1
+                    continue
+                if empty_squares:
+                    fen_row += str(empty_squares)
+                    empty_squares = 0
+                fen_row += piece[1].upper() if piece[0] == "w" else piece[1].lower()
+            if empty_squares:
+                fen_row += str(empty_squares)
+            fen_rows.append(fen_row)
+        castling = ""
+        for right, char in ((self.current_castling_rights.wks, "K"), (self.current_castling_rights.wqs, "Q"),
+                            (self.current_castling_rights.bks, "k"), (self.current_castling_rights.bqs, "q")):
+            if right:
+                castling += char
+        if self.enpassant_possible != ():
+            enpassant = Move.cols_to_files[self.enpassant_possible[1]] + Move.rows_to_ranks[self.enpassant_possible[0]]
+        else:
+            enpassant = "-"
+        # yarım hamle sayacı son piyon hamlesinden ya da taş yemeden bu yana geçen hamle sayısıdır
+        halfmove_clock = 0
+        for move in reversed(self.move_log):
+            if move >> 16 & 15 or code_pieces[move >> 12 & 15][1] == "p":
+                break
+            halfmove_clock += 1
+        else:
+            halfmove_clock += self.initial_halfmove_clock
+        fullmove_number = self.initial_fullmove_number + (len(self.move_log) + (not self.initial_white_to_move)) // 2
+        return " ".join(("/".join(fen_rows), "w" if self.white_to_move else "b", castling or "-", enpassant,
+                         str(halfmove_clock), str(fullmove_number)))
+
+    def computeEvaluation(self):
+        """
+        Taş değerleri ve konum puanları toplamını tüm tahtayı dolaşarak hesaplar.
+        """
+        material_score = 0
+        position_score = 0
+        for row in range(8):
+            for col in range(8):
+                piece = self.board[row][col]
+                if piece != "--":
+                    material_score += material_values[piece]
+                    position_score += position_values[piece][row][col]
+        return material_score, position_score
+
+    def computeZobristKey(self):
+        """
+        Pozisyonun Zobrist anahtarını sıfırdan hesaplar.
+        makeMove ve undoMove anahtarı artımlı olarak günceller, bu yalnızca başlangıç ve kontrol içindir.
+        """
+        key = 0
+        for row in range(8):
+            for col in range(8):
+                piece = self.board[row][col]
+                if piece != "--":
+                    key ^= zobrist_pieces[piece][row][col]
+        if not self.white_to_move:
+            key ^= zobrist_black_to_move
+        key ^= zobrist_castling[self.current_castling_rights.getIndex()]
+        if self.enpassant_possible != ():
+            key ^= zobrist_enpassant[self.enpassant_possible[1]]
+        return key
 
     def makeMove(self, move):
         """
          Bir Taşı'yı parametre olarak alır ve yürütür.
-        (bu rok atma, piyon terfi ve geçerken alma için işe yaramaz)
+        Hamle paketlenmiş tamsayı ya da Move nesnesi olabilir; kayda tamsayı olarak yazılır.
         """
-        self.board[move.start_row][move.start_col] = "--"
-        self.board[move.end_row][move.end_col] = move.piece_moved
+        if not isinstance(move, int):
+            move = move.packed
+        start_row = move >> 3 & 7
+        start_col = move & 7
+        end_row = move >> 9 & 7
+        end_col = move >> 6 & 7
+        piece_moved = code_pieces[move >> 12 & 15]
+        piece_captured = code_pieces[move >> 16 & 15]
+        # eski rok hakları ve geçerken alma karesini anahtardan çıkar
+        key = self.zobrist_key ^ zobrist_black_to_move ^ zobrist_castling[self.current_castling_rights.getIndex()]
+        if self.enpassant_possible != ():
+            key ^= zobrist_enpassant[self.enpassant_possible[1]]
+        key ^= zobrist_pieces[piece_moved][start_row][start_col]
+        position_score = self.position_score - position_values[piece_moved][start_row][start_col]
+        if piece_captured != "--":
+            self.material_score -= material_values[piece_captured]
+            self.piece_count -= 1
+            if move & MOVE_ENPASSANT:
+                position_score -= position_values[piece_captured][start_row][end_col]
+            else:
+                key ^= zobrist_pieces[piece_captured][end_row][end_col]
+                position_score -= position_values[piece_captured][end_row][end_col]
+
+        self.board[start_row][start_col] = "--"
+        self.board[end_row][end_col] = piece_moved
         self.move_log.append(move)  # hareketi move'a kaydet, böylece daha sonra geri alabiliriz
         self.white_to_move = not self.white_to_move  # oyuncuları değiştir
         # taşındıysa kralın yerini güncelle
-        if move.piece_moved == "wK":
-            self.white_king_location = (move.end_row, move.end_col)
-        elif move.piece_moved == "bK":
-            self.black_king_location = (move.end_row, move.end_col)
+        if piece_moved == "wK":
+            self.white_king_location = (end_row, end_col)
+        elif piece_moved == "bK":
+            self.black_king_location = (end_row, end_col)
 
         # piyon terfisi
-        if move.is_pawn_promotion:
-            # if not is_AI:
-            #    promoted_piece = input("Promote to Q, R, B, or N:") #bunu daha sonra kullanıcı arayüzüne götür
-            #    self.board[move.end_row][move.end_col] = move.piece_moved[0] + promoted_piece
-            # else:
-            self.board[move.end_row][move.end_col] = move.piece_moved[0] + "Q"
+        if move >> 23 & 15:
+            promoted_piece = code_pieces[move >> 23 & 15]
+            self.board[end_row][end_col] = promoted_piece
+            self.material_score += material_values[promoted_piece] - material_values[piece_moved]
+        key ^= zobrist_pieces[self.board[end_row][end_col]][end_row][end_col]
+        position_score += position_values[self.board[end_row][end_col]][end_row][end_col]
 
         # geçiş haraketi
-        if move.is_enpassant_move:
-            self.board[move.start_row][move.end_col] = "--"
+        if move & MOVE_ENPASSANT:
+            self.board[start_row][end_col] = "--"
+            key ^= zobrist_pieces[piece_captured][start_row][end_col]
 
         # enpassant_possible parametresini güncelle
-        if move.piece_moved[1] == "p" and abs(move.start_row - move.end_row) == 2:  # sadece 2 kare piyon avansında
-            self.enpassant_possible = ((move.start_row + move.end_row) // 2, move.start_col)
+        if piece_moved[1] == "p" and abs(start_row - end_row) == 2:  # sadece 2 kare piyon avansında
+            self.enpassant_possible = ((start_row + end_row) // 2, start_col)
         else:
             self.enpassant_possible = ()
 
         # rok
-        if move.is_castle_move:
-            if move.end_col - move.start_col == 2:  # şah kanadına rok
-                self.board[move.end_row][move.end_col - 1] = self.board[move.end_row][
-                    move.end_col + 1]  # kaleyi yeni konumuna taşır
-                self.board[move.end_row][move.end_col + 1] = '--'  # eski kaleyi sil
+        if move & MOVE_CASTLE:
+            if end_col - start_col == 2:  # şah kanadına rok
+                self.board[end_row][end_col - 1] = self.board[end_row][
+                    end_col + 1]  # kaleyi yeni konumuna taşır
+                self.board[end_row][end_col + 1] = '--'  # eski kaleyi sil
+                rook_key = zobrist_pieces[self.board[end_row][end_col - 1]][end_row]
+                key ^= rook_key[end_col + 1] ^ rook_key[end_col - 1]
+                rook_values = position_values[self.board[end_row][end_col - 1]][end_row]
+                position_score += rook_values[end_col - 1] - rook_values[end_col + 1]
             else:  # vezir kanadına rok
-                self.board[move.end_row][move.end_col + 1] = self.board[move.end_row][
-                    move.end_col - 2]  # kaleyi yeni konumuna taşır
-                self.board[move.end_row][move.end_col - 2] = '--'  # eski kaleyi sil
+                self.board[end_row][end_col + 1] = self.board[end_row][
+                    end_col - 2]  # kaleyi yeni konumuna taşır
+                self.board[end_row][end_col - 2] = '--'  # eski kaleyi sil
+                rook_key = zobrist_pieces[self.board[end_row][end_col + 1]][end_row]
+                key ^= rook_key[end_col - 2] ^ rook_key[end_col + 1]
+                rook_values = position_values[self.board[end_row][end_col + 1]][end_row]
+                position_score += rook_values[end_col + 1] - rook_values[end_col - 2]
+        self.position_score = position_score
 
         self.enpassant_possible_log.append(self.enpassant_possible)
 
         # rok haklarını güncelle; kale veya şah hamlesi olduğunda
-        self.updateCastleRights(move)
+        # önce kopyala: geri alma sonrası mevcut haklar kayıttaki son nesneyle aynıdır ve değiştirilmemelidir
+        self.current_castling_rights = CastleRights(self.current_castling_rights.wks, self.current_castling_rights.bks,
+                                                    self.current_castling_rights.wqs, self.current_castling_rights.bqs)
+        self.updateCastleRights(piece_moved, piece_captured, start_row, start_col, end_row, end_col)
         self.castle_rights_log.append(CastleRights(self.current_castling_rights.wks, self.current_castling_rights.bks,
                                                    self.current_castling_rights.wqs, self.current_castling_rights.bqs))
 
+        # yeni rok hakları ve geçerken alma karesini anahtara ekle
+        key ^= zobrist_castling[self.current_castling_rights.getIndex()]
+        if self.enpassant_possible != ():
+            key ^= zobrist_enpassant[self.enpassant_possible[1]]
+        self.zobrist_key = key
+        self.zobrist_key_log.append(key)
+
     def undoMove(self):
         """
         Son hamleyi geri al
         """
         if len(self.move_log) != 0:  # geri alınacak bir hareket olduğundan emin olun
             move = self.move_log.pop()
-            self.board[move.start_row][move.start_col] = move.piece_moved
-            self.board[move.end_row][move.end_col] = move.piece_captured
+            start_row = move >> 3 & 7
+            start_col = move & 7
+            end_row = move >> 9 & 7
+            end_col = move >> 6 & 7
+            piece_moved = code_pieces[move >> 12 & 15]
+            piece_captured = code_pieces[move >> 16 & 15]
+            # değerlendirme farkını geri al; bitiş karesindeki taş terfi ettiyse vezirdir
+            placed_piece = self.board[end_row][end_col]
+            position_score = self.position_score - position_values[placed_piece][end_row][end_col] + \
+                position_values[piece_moved][start_row][start_col]
+            if move >> 23 & 15:
+                self.material_score += material_values[piece_moved] - material_values[placed_piece]
+            if piece_captured != "--":
+                self.material_score += material_values[piece_captured]
+                self.piece_count += 1
+                if move & MOVE_ENPASSANT:
+                    position_score += position_values[piece_captured][start_row][end_col]
+                else:
+                    position_score += position_values[piece_captured][end_row][end_col]
+            self.board[start_row][start_col] = piece_moved
+            self.board[end_row][end_col] = piece_captured
             self.white_to_move = not self.white_to_move  #oyuncuları değiştir
             # gerekirse şahın konumunu güncelleyin
-            if move.piece_moved == "wK":
-                self.white_king_location = (move.start_row, move.start_col)
-            elif move.piece_moved == "bK":
-                self.black_king_location = (move.start_row, move.start_col)
+            if piece_moved == "wK":
+                self.white_king_location = (start_row, start_col)
+            elif piece_moved == "bK":
+                self.black_king_location = (start_row, start_col)
             # geçen hamleleri geri almak
-            if move.is_enpassant_move:
-                self.board[move.end_row][move.end_col] = "--"  # rok alanını boş bırakın
-                self.board[move.start_row][move.end_col] = move.piece_captured
+            if move & MOVE_ENPASSANT:
+                self.board[end_row][end_col] = "--"  # rok alanını boş bırakın
+                self.board[start_row][end_col] = piece_captured
 
             self.enpassant_possible_log.pop()
             self.enpassant_possible = self.enpassant_possible_log[-1]
@@ -117,53 +447,94 @@ class GameState:
             self.current_castling_rights = self.castle_rights_log[
                 -1]  # mevcut rok haklarını listedeki sonuncuya ayarla
             # rok hareketini geri al
-            if move.is_castle_move:
-                if move.end_col - move.start_col == 2:  # şah kanadı
-                    self.board[move.end_row][move.end_col + 1] = self.board[move.end_row][move.end_col - 1]
-                    self.board[move.end_row][move.end_col - 1] = '--'
+            if move & MOVE_CASTLE:
+                if end_col - start_col == 2:  # şah kanadı
+                    self.board[end_row][end_col + 1] = self.board[end_row][end_col - 1]
+                    self.board[end_row][end_col - 1] = '--'
+                    rook_values = position_values[self.board[end_row][end_col + 1]][end_row]
+                    position_score += rook_values[end_col + 1] - rook_values[end_col - 1]
                 else:  # vezir kanadı
-                    self.board[move.end_row][move.end_col - 2] = self.board[move.end_row][move.end_col + 1]
-                    self.board[move.end_row][move.end_col + 1] = '--'
+                    self.board[end_row][end_col - 2] = self.board[end_row][end_col + 1]
+                    self.board[end_row][end_col + 1] = '--'
+                    rook_values = position_values[self.board[end_row][end_col - 2]][end_row]
+                    position_score += rook_values[end_col - 2] - rook_values[end_col + 1]
+            self.position_score = position_score
+            self.zobrist_key_log.pop()
+            self.zobrist_key = self.zobrist_key_log[-1]
             self.checkmate = False
             self.stalemate = False
 
-    def updateCastleRights(self, move):
+    def makeNullMove(self):
+        """
+        Taş oynatmadan sırayı rakibe verir (boş hamle budaması için).
+        Geçerken alma hakkı boş hamleyle kaybolur; anahtar ve geçerken alma kaydı buna göre güncellenir.
+        """
+        key = self.zobrist_key ^ zobrist_black_to_move
+        if self.enpassant_possible != ():
+            key ^= zobrist_enpassant[self.enpassant_possible[1]]
+        self.enpassant_possible = ()
+        self.enpassant_possible_log.append(self.enpassant_possible)
+        self.white_to_move = not self.white_to_move
+        self.zobrist_key = key
+        self.zobrist_key_log.append(key)
+
+    def undoNullMove(self):
+        self.enpassant_possible_log.pop()
+        self.enpassant_possible = self.enpassant_possible_log[-1]
+        self.zobrist_key_log.pop()
+        self.zobrist_key = self.zobrist_key_log[-1]
+        self.white_to_move = not self.white_to_move
+        self.checkmate = False
+        self.stalemate = False
+
+    def hasNonPawnMaterial(self):
+        """
+        Sıradaki tarafın şah ve piyonlar dışında taşı var mı; yoksa zugzwang olasılığı yüksektir.
+        """
+        ally_color = "w" if self.white_to_move else "b"
+        for board_row in self.board:
+            for piece in board_row:
+                if piece[0] == ally_color and piece[1] != "p" and piece[1] != "K":
+                    return True
+        return False
+
+    def updateCastleRights(self, piece_moved, piece_captured, start_row, start_col, end_row, end_col):
         """
         oynanan rok haklarını güncelle
         """
-        if move.piece_captured == "wR":
-            if move.end_col == 0:  # sol kale
+        if piece_captured == "wR" and end_row == 7:
+            if end_col == 0:  # sol kale
                 self.current_castling_rights.wqs = False
-            elif move.end_col == 7:  # sağ kale
+            elif end_col == 7:  # sağ kale
                 self.current_castling_rights.wks = False
-        elif move.piece_captured == "bR":
-            if move.end_col == 0:  # sol kale
+        elif piece_captured == "bR" and end_row == 0:
+            if end_col == 0:  # sol kale
                 self.current_castling_rights.bqs = False
-            elif move.end_col == 7:  # sağ kale
+            elif end_col == 7:  # sağ kale
                 self.current_castling_rights.bks = False
 
-        if move.piece_moved == 'wK':
+        if piece_moved == 'wK':
             self.current_castling_rights.wqs = False
             self.current_castling_rights.wks = False
-        elif move.piece_moved == 'bK':
+        elif piece_moved == 'bK':
             self.current_castling_rights.bqs = False
             self.current_castling_rights.bks = False
-        elif move.piece_moved == 'wR':
-            if move.start_row == 7:
-                if move.start_col == 0:  # sol kale
+        elif piece_moved == 'wR':
+            if start_row == 7:
+                if start_col == 0:  # sol kale
                     self.current_castling_rights.wqs = False
-                elif move.start_col == 7:  # sağ kale
+                elif start_col == 7:  # sağ kale
                     self.current_castling_rights.wks = False
-        elif move.piece_moved == 'bR':
-            if move.start_row == 0:
-                if move.start_col == 0:  # sol kale
+        elif piece_moved == 'bR':
+            if start_row == 0:
+                if start_col == 0:  # sol kale
                     self.current_castling_rights.bqs = False
-                elif move.start_col == 7:  # sağ kale
+                elif start_col == 7:  # sağ kale
                     self.current_castling_rights.bks = False
 
     def getValidMoves(self):
         """
-        Şahlar dikkate alınarak tüm haraketler
+        Şahlar dikkate alınarak tüm haraketler, paketlenmiş tamsayılar olarak
         """
         temp_castle_rights = CastleRights(self.current_castling_rights.wks, self.current_castling_rights.bks,
                                           self.current_castling_rights.wqs, self.current_castling_rights.bqs)
@@ -179,30 +550,7 @@ class GameState:
             king_col = self.black_king_location[1]
         if self.in_check:
             if len(self.checks) == 1:  # sadece 1 şah, şahı engelle veya Şahı(kralı) hareket ettir
-                moves = self.getAllPossibleMoves()
-                # şahı bloke etmek için, düşman taşı ile şahınız(kralınızın) arasındaki karelerden birine bir taş koymalısınız.
-                check = self.checks[0]  # Şahları kontrol et
-                check_row = check[0]
-                check_col = check[1]
-                piece_checking = self.board[check_row][check_col] # şaha neden olan düşman taşı
-                valid_squares = []  # Taşların taşınabileceği kareler
-                # At varsa, atı ele geçirmeliyiz veya şahı hareket ettirmeliyiz, diğer taşlar engellenebilir
-                if piece_checking[1] == "N":
-                    valid_squares = [(check_row, check_col)]
-                else:
-                    for i in range(1, 8):
-                        valid_square = (king_row + check[2] * i,
-                                        king_col + check[3] * i)  #2li ve 3lü şah kontrolu
-                        valid_squares.append(valid_square)
-                        if valid_square[0] == check_row and valid_square[
-                            1] == check_col:  # taşları ve şahları kontrol ettikten sonra
-                            break
-                # kontrolü engelleyen veya şahı hareket ettirmeyen tüm hamlelerden kurtulun
-                for i in range(len(moves) - 1, -1, -1):  # öğeleri kaldırırken listeyi geriye doğru yineleyin
-                    if moves[i].piece_moved[1] != "K":  # Şahı hareket ettiremiyoruz, bu yüzden şah engellenmeli veya ele geçirilmesi gerekir
-                        if not (moves[i].end_row,
-                                moves[i].end_col) in valid_squares:  # Harkaetimiz taşı engellemez veya ele geçiremez
-                            moves.remove(moves[i])
+                self.getEvasionMoves(king_row, king_col, self.getCheckMask(king_row, king_col), moves)
             else:  # çifte şah , kral hareket etmeli
                 self.getKingMoves(king_row, king_col, moves)
         else:  # şah yok tüm haraketler yapılabilir
@@ -225,6 +573,249 @@ class GameState:
         self.current_castling_rights = temp_castle_rights
         return moves
 
+    def getCheckMask(self, king_row, king_col):
+        """
+        Tek şah varken şah dışındaki taşların gidebileceği karelerin bit maskesi (bit satır * 8 + sütun):
+        şah çeken taşın karesi ve kayan taşsa şahla arasındaki kareler. self.checks güncel olmalıdır.
+        """
+        # şahı bloke etmek için, düşman taşı ile şahınız(kralınızın) arasındaki karelerden birine bir taş koymalısınız.
+        check = self.checks[0]  # Şahları kontrol et
+        check_row = check[0]
+        check_col = check[1]
+        piece_checking = self.board[check_row][check_col]  # şaha neden olan düşman taşı
+        # At varsa, atı ele geçirmeliyiz veya şahı hareket ettirmeliyiz, diğer taşlar engellenebilir
+        if piece_checking[1] == "N":
+            return 1 << (check_row * 8 + check_col)
+        check_mask = 0
+        check_ray = direction_rays[king_row][king_col][ray_directions.index((check[2], check[3]))]
+        for valid_row, valid_col in check_ray:  #2li ve 3lü şah kontrolu
+            check_mask |= 1 << (valid_row * 8 + valid_col)
+            if valid_row == check_row and valid_col == check_col:  # taşları ve şahları kontrol ettikten sonra
+                break
+        return check_mask
+
+    def getEvasionMoves(self, king_row, king_col, check_mask, moves):
+        """
+        Tek şah altındaki geçerli hamleler: şah hamleleri ve şah çeken taşı yiyen ya da araya giren hamleler.
+        Tüm taşların hamleleri üretilip süzülmez; check_mask'teki her kareden geriye doğru bakılarak
+        oraya gidebilen dost taşlar bulunur. Açmazdaki at ve kayan taş şahı kurtaramaz, çünkü açmaz doğrusu
+        şahtan çıkan başka bir ışındır; piyonlar ise açmaz, terfi ve geçerken alma için ortak üreticiden geçer.
+        """
+        board = self.board
+        ally_color = "w" if self.white_to_move else "b"
+        ally_knight, ally_pawn = ally_color + "N", ally_color + "p"
+        move_amount, start_row = (-1, 6) if self.white_to_move else (1, 1)
+        pinned_squares = {(pin[0], pin[1]) for pin in self.pins}
+        pawn_squares = []
+        mask = check_mask
+        while mask:
+            square_bit = mask & -mask
+            mask ^= square_bit
+            square = square_bit.bit_length() - 1
+            row, col = square >> 3, square & 7
+            target = square << 6 | piece_codes[board[row][col]] << 16
+            for from_row, from_col in knight_targets[row][col]:
+                if board[from_row][from_col] == ally_knight and (from_row, from_col) not in pinned_squares:
+                    moves.append(target | from_row * 8 + from_col | piece_codes[ally_knight] << 12)
+            for direction_index, ray in enumerate(direction_rays[row][col]):
+                for from_row, from_col in ray:
+                    piece = board[from_row][from_col]
+                    if piece != "--":
+                        if piece[0] == ally_color and (piece[1] == "Q" or piece[1] == (
+                                "R" if direction_index < 4 else "B")) and (from_row, from_col) not in pinned_squares:
+                            moves.append(target | from_row * 8 + from_col | piece_codes[piece] << 12)
+                        break
+            # bu kareye gelebilecek piyonlar: ileri itiş, çift itiş ve taş yeme
+            pawn_row = row - move_amount
+            if 0 <= pawn_row <= 7:
+                if board[row][col] == "--":
+                    if board[pawn_row][col] == ally_pawn:
+                        pawn_squares.append((pawn_row, col))
+                    elif pawn_row - move_amount == start_row and board[pawn_row][col] == "--" and \
+                            board[start_row][col] == ally_pawn:
+                        pawn_squares.append((start_row, col))
+                else:
+                    for pawn_col in (col - 1, col + 1):
+                        if 0 <= pawn_col <= 7 and board[pawn_row][pawn_col] == ally_pawn:
+                            pawn_squares.append((pawn_row, pawn_col))
+        if self.enpassant_possible != ():
+            # geçerken almada şah çeken piyon yenebilir; uygunluğu aşağıdaki süzme belirler
+            enpassant_row, enpassant_col = self.enpassant_possible
+            for pawn_col in (enpassant_col - 1, enpassant_col + 1):
+                if 0 <= pawn_col <= 7 and board[enpassant_row - move_amount][pawn_col] == ally_pawn:
+                    pawn_squares.append((enpassant_row - move_amount, pawn_col))
+        pawn_moves = []
+        for row, col in set(pawn_squares):
+            self.getPawnMoves(row, col, pawn_moves)
+        # geçerken almada yenen piyon bitiş karesinde değil, başlangıç satırındadır
+        for move in pawn_moves:
+            if check_mask >> (move >> 6 & 63) & 1 or move & MOVE_ENPASSANT and check_mask >> (move & 56 | move >> 6 & 7) & 1:
+                moves.append(move)
+        self.getKingMoves(king_row, king_col, moves)
+
+    def getAttackMap(self, zone=ALL_SQUARES):
+        """
+        Rakibin saldırdığı karelerin bit maskesi (bit satır * 8 + sütun), düğüm başına bir kez hesaplanır.
+        Sıradaki tarafın şahı tahtadan kalkmış sayılır, böylece kayan taşın şahın arkasındaki kareye
+        saldırısı da görülür; şahın bir kareye gidip gidemeyeceği tek bir bit testidir.
+        Yalnızca zone içindeki kareler kesindir: ışını zone'a değmeyen kayan taşlar yürütülmez.
+        """
+        board = self.board
+        enemy_color, ally_king = ("b", "wK") if self.white_to_move else ("w", "bK")
+        attacks = 0
+        for row, board_row in enumerate(board):
+            for col, piece in enumerate(board_row):
+                if piece[0] != enemy_color:
+                    continue
+                piece_type = piece[1]
+                if piece_type == "p":
+                    # beyaz piyon bir üst satıra, siyah piyon bir alt satıra saldırır
+                    attack_row = row - 1 if enemy_color == "w" else row + 1
+                    if 0 <= attack_row <= 7:
+                        if col > 0:
+                            attacks |= 1 << (attack_row * 8 + col - 1)
+                        if col < 7:
+                            attacks |= 1 << (attack_row * 8 + col + 1)
+                elif piece_type == "N":
+                    attacks |= knight_masks[row][col]
+                elif piece_type == "K":
+                    attacks |= king_masks[row][col]
+                else:
+                    directions = range(4) if piece_type == "R" else range(4, 8) if piece_type == "B" else range(8)
+                    rays = direction_rays[row][col]
+                    for direction_index in directions:
+                        if not ray_masks[row][col][direction_index] & zone:
+                            continue
+                        for end_row, end_col in rays[direction_index]:
+                            attacks |= 1 << (end_row * 8 + end_col)
+                            end_piece = board[end_row][end_col]
+                            if end_piece != "--" and end_piece != ally_king:
+                                break
+        return attacks
+
+    def hasLegalMove(self):
+        """
+        En az bir geçerli hamle var mı; ilk geçerli hamle bulununca durur, hamle listesi kurmaz.
+        getValidMoves gibi checkmate ve stalemate bayraklarını günceller; ufuk düğümlerinin
+        yalnızca oyunun bitip bitmediğini öğrenmesi içindir.
+        Rok hiç denenmez: rok geçerliyse şahın rok yönündeki tek kare hamlesi de geçerlidir.
+        Şahın hamleleri her kare için açmaz taraması gerektirdiğinden en sona bırakılır.
+        """
+        self.in_check, self.pins, self.checks = self.checkForPinsAndChecks()
+        king_row, king_col = self.white_king_location if self.white_to_move else self.black_king_location
+        has_move = False
+        if len(self.checks) < 2:  # çifte şahta yalnızca şah oynayabilir
+            check_mask = self.getCheckMask(king_row, king_col) if self.in_check else None
+            ally_color = "w" if self.white_to_move else "b"
+            moves = []
+            for row in range(8):
+                for col in range(8):
+                    piece = self.board[row][col]
+                    if piece[0] != ally_color or piece[1] == "K":
+                        continue
+                    self.moveFunctions[piece[1]](row, col, moves)
+                    if check_mask is None:
+                        has_move = bool(moves)
+                    else:
+                        has_move = any(check_mask >> (move >> 6 & 63) & 1 or move & MOVE_ENPASSANT and
+                                       check_mask >> (move & 56 | move >> 6 & 7) & 1 for move in moves)
+                        del moves[:]
+                    if has_move:
+                        break
+                if has_move:
+                    break
+        if not has_move:
+            king_moves = []
+            self.getKingMoves(king_row, king_col, king_moves)
+            has_move = bool(king_moves)
+        self.checkmate = not has_move and self.in_check
+        self.stalemate = not has_move and not self.in_check
+        return has_move
+
+    def getCaptureMoves(self):
+        """
+        Yalnızca taş yeme ve terfi hamleleri (geçerli olanlar), paketlenmiş tamsayılar olarak.
+        Sessiz hamleler hiç üretilmez; sakin arama (quiescence) içindir.
+        Şah altındayken kaçış hamleleri zaten az olduğundan getValidMoves süzülür.
+        checkmate ve stalemate bayraklarına dokunmaz.
+        """
+        self.in_check, self.pins, self.checks = self.checkForPinsAndChecks()
+        if self.in_check:
+            checkmate, stalemate = self.checkmate, self.stalemate
+            moves = [move for move in self.getValidMoves() if move & MOVE_TACTICAL]
+            self.checkmate, self.stalemate = checkmate, stalemate
+            return moves
+        ally_color, enemy_color = ("w", "b") if self.white_to_move else ("b", "w")
+        pin_directions = {(pin[0], pin[1]): (pin[2], pin[3]) for pin in self.pins}
+        board = self.board
+        moves = []
+        pawn_moves = []
+        for row in range(8):
+            for col in range(8):
+                piece = board[row][col]
+                if piece[0] != ally_color:
+                    continue
+                piece_type = piece[1]
+                base = row * 8 + col | piece_codes[piece] << 12
+                if piece_type == "p":
+                    # piyonda sessiz hamle en fazla iki tane; ortak üretici açmaz ve geçerken almayı zaten doğru işler
+                    self.getPawnMoves(row, col, pawn_moves)
+                elif piece_type == "N":
+                    if (row, col) in pin_directions:
+                        continue
+                    for end_row, end_col in knight_targets[row][col]:
+                        end_piece = board[end_row][end_col]
+                        if end_piece[0] == enemy_color:
+                            moves.append(base | (end_row * 8 + end_col) << 6 | piece_codes[end_piece] << 16)
+                elif piece_type == "K":
+                    attacks = self.getAttackMap(king_masks[row][col])
+                    for end_row, end_col in king_targets[row][col]:
+                        end_piece = board[end_row][end_col]
+                        if end_piece[0] == enemy_color and not attacks >> (end_row * 8 + end_col) & 1:
+                            moves.append(base | (end_row * 8 + end_col) << 6 | piece_codes[end_piece] << 16)
+                else:
+                    directions = range(4) if piece_type == "R" else range(4, 8) if piece_type == "B" else range(8)
+                    pin_direction = pin_directions.get((row, col))
+                    for direction_index in directions:
+                        direction = ray_directions[direction_index]
+                        if pin_direction is not None and pin_direction != direction and \
+                                pin_direction != (-direction[0], -direction[1]):
+                            continue
+                        for end_row, end_col in direction_rays[row][col][direction_index]:
+                            end_piece = board[end_row][end_col]
+                            if end_piece != "--":
+                                if end_piece[0] == enemy_color:
+                                    moves.append(base | (end_row * 8 + end_col) << 6 | piece_codes[end_piece] << 16)
+                                break
+        for move in pawn_moves:
+            if move & MOVE_TACTICAL:
+                moves.append(move)
+        return moves
+
+    def getStagedMoves(self, hash_move=None, killers=(), capture_key=None, quiet_key=None):
+        """
+        Geçerli hamleleri aşama aşama, istendikçe üreten nesne (bkz. StagedMoves).
+        Arama ilk hamlelerde kesme yaparsa sonraki aşamalar hiç üretilmez.
+        """
+        return StagedMoves(self, hash_move, killers, capture_key, quiet_key)
+
+    def getPieceMoves(self, row, col):
+        """
+        Yalnızca (row, col) karesindeki taşın hamleleri (şahsa rok dahil); açmaz ve şah bilgisi güncel olmalıdır.
+        """
+        moves = []
+        piece = self.board[row][col]
+        self.moveFunctions[piece[1]](row, col, moves)
+        if piece[1] == "K" and not self.in_check:
+            self.getCastleMoves(row, col, moves)
+        return moves
+
+    def getValidMoveObjects(self):
+        """
+        Geçerli hamlelerin Move görünümleri; arayüz ve notasyon içindir, arama paketlenmiş hamleleri kullanır.
+        """
+        return [Move.fromPacked(move) for move in self.getValidMoves()]
+
     def inCheck(self):
         """
         Mevcut bir taşın şah açmazında olup olmadığını kontrol edin
@@ -236,14 +827,36 @@ class GameState:
 
     def squareUnderAttack(self, row, col):
         """
-        Düşmanın r, c karesine saldırıp saldıramayacağını belirleyin
+        Düşmanın r, c karesine saldırıp saldıramayacağını belirleyin.
+        Rakip hamleleri üretilmez: kareden dışarı doğru at/şah sıçramalarına, piyon çaprazlarına
+        ve sekiz ışın boyunca ilk taşa bakılır.
         """
-        self.white_to_move = not self.white_to_move  # rakibin bakış açısına geç
-        opponents_moves = self.getAllPossibleMoves()
-        self.white_to_move = not self.white_to_move
-        for move in opponents_moves:
-            if move.end_row == row and move.end_col == col:  #kare saldırı altında
+        board = self.board
+        enemy_color = "b" if self.white_to_move else "w"
+        enemy_knight = enemy_color + "N"
+        for end_row, end_col in knight_targets[row][col]:
+            if board[end_row][end_col] == enemy_knight:
+                return True
+        enemy_king = enemy_color + "K"
+        for end_row, end_col in king_targets[row][col]:
+            if board[end_row][end_col] == enemy_king:
+                return True
+        # beyaz piyon bir üst satıra, siyah piyon bir alt satıra saldırır
+        pawn_row = row + 1 if enemy_color == "w" else row - 1
+        if 0 <= pawn_row <= 7:
+            enemy_pawn = enemy_color + "p"
+            if (col > 0 and board[pawn_row][col - 1] == enemy_pawn) or (
+                    col < 7 and board[pawn_row][col + 1] == enemy_pawn):
                 return True
+        # kayan taşlar: her ışında ilk dolu kare belirleyicidir
+        for direction_index, ray in enumerate(direction_rays[row][col]):
+            for end_row, end_col in ray:
+                end_piece = board[end_row][end_col]
+                if end_piece != "--":
+                    if end_piece[0] == enemy_color and (end_piece[1] == "Q" or end_piece[1] == (
+                            "R" if direction_index < 4 else "B")):
+                        return True
+                    break
         return False
 
     def getAllPossibleMoves(self):
@@ -274,53 +887,43 @@ class GameState:
             start_row = self.black_king_location[0]
             start_col = self.black_king_location[1]
         # Şahın(kralın) haraket edebileceği karaler
-        directions = ((-1, 0), (0, -1), (1, 0), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
-        for j in range(len(directions)):
-            direction = directions[j]
+        board = self.board
+        for j, ray in enumerate(direction_rays[start_row][start_col]):
             possible_pin = ()  # tutulan karaleri sıfırla
-            for i in range(1, 8):
-                end_row = start_row + direction[0] * i
-                end_col = start_col + direction[1] * i
-                if 0 <= end_row <= 7 and 0 <= end_col <= 7:
-                    end_piece = self.board[end_row][end_col]
-                    if end_piece[0] == ally_color and end_piece[1] != "K":
-                        if possible_pin == ():  # 1. dost taş koyulabilir
-                            possible_pin = (end_row, end_col, direction[0], direction[1])
-                        else:  # 2. dost taş  bu yönde şah veya tutulan kale yok
+            for i, (end_row, end_col) in enumerate(ray, 1):
+                end_piece = board[end_row][end_col]
+                if end_piece[0] == ally_color and end_piece[1] != "K":
+                    if possible_pin == ():  # 1. dost taş koyulabilir
+                        possible_pin = (end_row, end_col, ray_directions[j][0], ray_directions[j][1])
+                    else:  # 2. dost taş  bu yönde şah veya tutulan kale yok
+                        break
+                elif end_piece[0] == enemy_color:
+                    enemy_type = end_piece[1]
+                    # Bu karmaşık koşulda 5 olasılık
+                    # 1.) kraldan ortogonal olarak uzakta ve taş bir kaledir
+                    # 2) kraldan çapraz olarak uzakta ve taş bir fildir
+                    # 3.) Şahtan çapraz olarak 1 kare uzakta ve taş bir piyon
+                    # 4) Herhangi bir yön ve parça bir vezirdir
+                    # 5.) 1 kare uzaklıkta herhangi bir yön ve taş kraldır
+                    if (0 <= j <= 3 and enemy_type == "R") or (4 <= j <= 7 and enemy_type == "B") or (
+                            i == 1 and enemy_type == "p" and (
+                            (enemy_color == "w" and 6 <= j <= 7) or (enemy_color == "b" and 4 <= j <= 5))) or (
+                            enemy_type == "Q") or (i == 1 and enemy_type == "K"):
+                        if possible_pin == ():  # parça engellemesi yok, bu yüzden şah
+                            in_check = True
+                            checks.append((end_row, end_col, ray_directions[j][0], ray_directions[j][1]))
                             break
-                    elif end_piece[0] == enemy_color:
-                        enemy_type = end_piece[1]
-                        # Bu karmaşık koşulda 5 olasılık
-                        # 1.) kraldan ortogonal olarak uzakta ve taş bir kaledir
-                        # 2) kraldan çapraz olarak uzakta ve taş bir fildir
-                        # 3.) Şahtan çapraz olarak 1 kare uzakta ve taş bir piyon
-                        # 4) Herhangi bir yön ve parça bir vezirdir
-                        # 5.) 1 kare uzaklıkta herhangi bir yön ve taş kraldır
-                        if (0 <= j <= 3 and enemy_type == "R") or (4 <= j <= 7 and enemy_type == "B") or (
-                                i == 1 and enemy_type == "p" and (
-                                (enemy_color == "w" and 6 <= j <= 7) or (enemy_color == "b" and 4 <= j <= 5))) or (
-                                enemy_type == "Q") or (i == 1 and enemy_type == "K"):
-                            if possible_pin == ():  # parça engellemesi yok, bu yüzden şah
-                                in_check = True
-                                checks.append((end_row, end_col, direction[0], direction[1]))
-                                break
-                            else:  # taş engelliyor bu yüzden şah yok
-                                pins.append(possible_pin)
-                                break
-                        else:  # düşman taşı var bu yüzden şah yok
+                        else:  # taş engelliyor bu yüzden şah yok
+                            pins.append(possible_pin)
                             break
-                else:
-                    break
+                    else:  # düşman taşı var bu yüzden şah yok
+                        break
         # At şahlarının kontrolü
-        knight_moves = ((-2, -1), (-2, 1), (-1, 2), (1, 2), (2, -1), (2, 1), (-1, -2), (1, -2))
-        for move in knight_moves:
-            end_row = start_row + move[0]
-            end_col = start_col + move[1]
-            if 0 <= end_row <= 7 and 0 <= end_col <= 7:
-                end_piece = self.board[end_row][end_col]
-                if end_piece[0] == enemy_color and end_piece[1] == "N":  # Şaha saldıran düşman at
-                    in_check = True
-                    checks.append((end_row, end_col, move[0], move[1]))
+        enemy_knight = enemy_color + "N"
+        for end_row, end_col in knight_targets[start_row][start_col]:
+            if board[end_row][end_col] == enemy_knight:  # Şaha saldıran düşman at
+                in_check = True
+                checks.append((end_row, end_col, end_row - start_row, end_col - start_col))
         return in_check, pins, checks
 
     def getPawnMoves(self, row, col, moves):
@@ -346,16 +949,22 @@ class GameState:
             start_row = 1
             enemy_color = "w"
             king_row, king_col = self.black_king_location
+        # paketlenmiş hamlelerin ortak kısmı: başlangıç karesi ve piyon
+        base = row * 8 + col | piece_codes[self.board[row][col]] << 12
+        first_move = len(moves)
+        end_square = (row + move_amount) * 8 + col
+        end_row_pieces = self.board[row + move_amount]
+        enpassant_capture = piece_codes[enemy_color + "p"] << 16 | MOVE_ENPASSANT
 
         if self.board[row + move_amount][col] == "--":  # 1 kare piyon ilerlemesi
             if not piece_pinned or pin_direction == (move_amount, 0):
-                moves.append(Move((row, col), (row + move_amount, col), self.board))
+                moves.append(base | end_square << 6)
                 if row == start_row and self.board[row + 2 * move_amount][col] == "--":  # 2 kare piyon ilerlemesi
-                    moves.append(Move((row, col), (row + 2 * move_amount, col), self.board))
+                    moves.append(base | (end_square + 8 * move_amount) << 6)
         if col - 1 >= 0:  # sola taş yeme
             if not piece_pinned or pin_direction == (move_amount, -1):
                 if self.board[row + move_amount][col - 1][0] == enemy_color:
-                    moves.append(Move((row, col), (row + move_amount, col - 1), self.board))
+                    moves.append(base | (end_square - 1) << 6 | piece_codes[end_row_pieces[col - 1]] << 16)
                 if (row + move_amount, col - 1) == self.enpassant_possible:
                     attacking_piece = blocking_piece = False
                     if king_row == row:
@@ -370,18 +979,20 @@ class GameState:
                         for i in inside_range:
                             if self.board[row][i] != "--":  # bazı taşlar piyonları engelliyor
                                 blocking_piece = True
-                        for i in outside_range:
+                        for i in outside_range:  # yalnızca dışarıdaki ilk taş önemlidir
                             square = self.board[row][i]
                             if square[0] == enemy_color and (square[1] == "R" or square[1] == "Q"):
                                 attacking_piece = True
+                                break
                             elif square != "--":
                                 blocking_piece = True
+                                break
                     if not attacking_piece or blocking_piece:
-                        moves.append(Move((row, col), (row + move_amount, col - 1), self.board, is_enpassant_move=True))
+                        moves.append(base | (end_square - 1) << 6 | enpassant_capture)
         if col + 1 <= 7:  # sağa yakalama
             if not piece_pinned or pin_direction == (move_amount, +1):
                 if self.board[row + move_amount][col + 1][0] == enemy_color:
-                    moves.append(Move((row, col), (row + move_amount, col + 1), self.board))
+                    moves.append(base | (end_square + 1) << 6 | piece_codes[end_row_pieces[col + 1]] << 16)
                 if (row + move_amount, col + 1) == self.enpassant_possible:
                     attacking_piece = blocking_piece = False
                     if king_row == row:
@@ -396,14 +1007,23 @@ class GameState:
                         for i in inside_range:
                             if self.board[row][i] != "--":  # bazı taşlar piyonları engelliyor
                                 blocking_piece = True
-                        for i in outside_range:
+                        for i in outside_range:  # yalnızca dışarıdaki ilk taş önemlidir
                             square = self.board[row][i]
                             if square[0] == enemy_color and (square[1] == "R" or square[1] == "Q"):
                                 attacking_piece = True
+                                break
                             elif square != "--":
                                 blocking_piece = True
+                                break
                     if not attacking_piece or blocking_piece:
-                        moves.append(Move((row, col), (row + move_amount, col + 1), self.board, is_enpassant_move=True))
+                        moves.append(base | (end_square + 1) << 6 | enpassant_capture)
+        # son satıra varan her hamle dört terfi hamlesine açılır
+        if row + move_amount == 0 or row + move_amount == 7:
+            promotions = moves[first_move:]
+            del moves[first_move:]
+            for move in promotions:
+                for promotion_code in promotion_codes[self.board[row][col][0]]:
+                    moves.append(move | promotion_code)
 
     def getRookMoves(self, row, col, moves):
         """
@@ -420,24 +1040,21 @@ class GameState:
                     self.pins.remove(self.pins[i])
                 break
 
-        directions = ((-1, 0), (0, -1), (1, 0), (0, 1))  # yukarı, sol, aşağı, sağ
         enemy_color = "b" if self.white_to_move else "w"
-        for direction in directions:
-            for i in range(1, 8):
-                end_row = row + direction[0] * i
-                end_col = col + direction[1] * i
-                if 0 <= end_row <= 7 and 0 <= end_col <= 7:  # haraketlerin tahtada olup olmadığını kontrol edin
-                    if not piece_pinned or pin_direction == direction or pin_direction == (
-                            -direction[0], -direction[1]):
-                        end_piece = self.board[end_row][end_col]
-                        if end_piece == "--":  # boş alan geçerlidir
-                            moves.append(Move((row, col), (end_row, end_col), self.board))
-                        elif end_piece[0] == enemy_color:  # düşman taşını ele geçirmek
-                            moves.append(Move((row, col), (end_row, end_col), self.board))
-                            break
-                        else:  # dost taş
-                            break
-                else:
+        board = self.board
+        base = row * 8 + col | piece_codes[board[row][col]] << 12
+        for direction_index in range(4):  # yukarı, sol, aşağı, sağ
+            direction = ray_directions[direction_index]
+            if piece_pinned and pin_direction != direction and pin_direction != (-direction[0], -direction[1]):
+                continue
+            for end_row, end_col in direction_rays[row][col][direction_index]:
+                end_piece = board[end_row][end_col]
+                if end_piece == "--":  # boş alan geçerlidir
+                    moves.append(base | (end_row * 8 + end_col) << 6)
+                elif end_piece[0] == enemy_color:  # düşman taşını ele geçirmek
+                    moves.append(base | (end_row * 8 + end_col) << 6 | piece_codes[end_piece] << 16)
+                    break
+                else:  # dost taş
                     break
 
     def getKnightMoves(self, row, col, moves):
@@ -451,17 +1068,15 @@ class GameState:
                 self.pins.remove(self.pins[i])
                 break
 
-        knight_moves = ((-2, -1), (-2, 1), (-1, 2), (1, 2), (2, -1), (2, 1), (-1, -2),
-                        (1, -2))  # yukarı / sol yukarı / sağ sağ / yukarı sağ / aşağı aşağı / sol aşağı / sağ sol / yukarı sola / aşağı
+        if piece_pinned:
+            return  # açmazdaki at hiçbir yöne gidemez
         ally_color = "w" if self.white_to_move else "b"
-        for move in knight_moves:
-            end_row = row + move[0]
-            end_col = col + move[1]
-            if 0 <= end_row <= 7 and 0 <= end_col <= 7:
-                if not piece_pinned:
-                    end_piece = self.board[end_row][end_col]
-                    if end_piece[0] != ally_color:  # ya düşman taşı ya da boş kare
-                        moves.append(Move((row, col), (end_row, end_col), self.board))
+        board = self.board
+        base = row * 8 + col | piece_codes[board[row][col]] << 12
+        for end_row, end_col in knight_targets[row][col]:
+            end_piece = board[end_row][end_col]
+            if end_piece[0] != ally_color:  # ya düşman taşı ya da boş kare
+                moves.append(base | (end_row * 8 + end_col) << 6 | piece_codes[end_piece] << 16)
 
     def getBishopMoves(self, row, col, moves):
         """
@@ -476,59 +1091,45 @@ class GameState:
                 self.pins.remove(self.pins[i])
                 break
 
-        directions = ((-1, -1), (-1, 1), (1, 1), (1, -1))  # köşegenler: yukarı / sol yukarı / sağ aşağı / sağ aşağı / sol
         enemy_color = "b" if self.white_to_move else "w"
-        for direction in directions:
-            for i in range(1, 8):
-                end_row = row + direction[0] * i
-                end_col = col + direction[1] * i
-                if 0 <= end_row <= 7 and 0 <= end_col <= 7:  # haraketlerin tahtada lup olmadığını kontrol edin
-                    if not piece_pinned or pin_direction == direction or pin_direction == (
-                            -direction[0], -direction[1]):
-                        end_piece = self.board[end_row][end_col]
-                        if end_piece == "--": #boş alan geçerlidir
-                            moves.append(Move((row, col), (end_row, end_col), self.board))
-                        elif end_piece[0] == enemy_color:  # düşman taşını ele geçirmek
-                            moves.append(Move((row, col), (end_row, end_col), self.board))
-                            break
-                        else:  # dost taş
-                            break
-                else:
+        board = self.board
+        base = row * 8 + col | piece_codes[board[row][col]] << 12
+        for direction_index in range(4, 8):  # köşegenler: yukarı / sol, yukarı / sağ, aşağı / sol, aşağı / sağ
+            direction = ray_directions[direction_index]
+            if piece_pinned and pin_direction != direction and pin_direction != (-direction[0], -direction[1]):
+                continue
+            for end_row, end_col in direction_rays[row][col][direction_index]:
+                end_piece = board[end_row][end_col]
+                if end_piece == "--":  # boş alan geçerlidir
+                    moves.append(base | (end_row * 8 + end_col) << 6)
+                elif end_piece[0] == enemy_color:  # düşman taşını ele geçirmek
+                    moves.append(base | (end_row * 8 + end_col) << 6 | piece_codes[end_piece] << 16)
+                    break
+                else:  # dost taş
                     break
 
     def getQueenMoves(self, row, col, moves):
         """
         Satırda ve sütünda bulunan vezir için tüm vezir hareketlerini alın ve move'a ekleyin.
         """
+        self.getRookMoves(row, col, moves)  # önce kale: açmaz kaydını fil hamleleri için bırakır
         self.getBishopMoves(row, col, moves)
-        self.getRookMoves(row, col, moves)
 
     def getKingMoves(self, row, col, moves):
         """
         Satırda ve sütünda bulunan şah için tüm şah hareketlerini alın ve move'a ekleyin.
         """
-        row_moves = (-1, -1, -1, 0, 0, 1, 1, 1)
-        col_moves = (-1, 0, 1, -1, 1, -1, 0, 1)
         ally_color = "w" if self.white_to_move else "b"
-        for i in range(8):
-            end_row = row + row_moves[i]
-            end_col = col + col_moves[i]
-            if 0 <= end_row <= 7 and 0 <= end_col <= 7:
-                end_piece = self.board[end_row][end_col]
-                if end_piece[0] != ally_color:  # bir dost taş değil - boş veya düşman
-                    # Şahı(kralı) bitiş karesine yerleştirin ve şahları kontrol edin
-                    if ally_color == "w":
-                        self.white_king_location = (end_row, end_col)
-                    else:
-                        self.black_king_location = (end_row, end_col)
-                    in_check, pins, checks = self.checkForPinsAndChecks()
-                    if not in_check:
-                        moves.append(Move((row, col), (end_row, end_col), self.board))
-                    # Şahı orijinal konumuna geri yerleştir
-                    if ally_color == "w":
-                        self.white_king_location = (row, col)
-                    else:
-                        self.black_king_location = (row, col)
+        base = row * 8 + col | piece_codes[self.board[row][col]] << 12
+        targets = [(end_row, end_col) for end_row, end_col in king_targets[row][col]
+                   if self.board[end_row][end_col][0] != ally_color]  # bir dost taş değil - boş veya düşman
+        if not targets:
+            return  # şah kendi taşlarıyla çevriliyse saldırı haritası gerekmez
+        # her hedef için açmaz taraması yerine rakibin şahın çevresine saldırı haritası bir kez çıkarılır
+        attacks = self.getAttackMap(king_masks[row][col])
+        for end_row, end_col in targets:
+            if not attacks >> (end_row * 8 + end_col) & 1:
+                moves.append(base | (end_row * 8 + end_col) << 6 | piece_codes[self.board[end_row][end_col]] << 16)
 
     def getCastleMoves(self, row, col, moves):
         """
@@ -546,12 +1147,115 @@ class GameState:
     def getKingsideCastleMoves(self, row, col, moves):
         if self.board[row][col + 1] == '--' and self.board[row][col + 2] == '--':
             if not self.squareUnderAttack(row, col + 1) and not self.squareUnderAttack(row, col + 2):
-                moves.append(Move((row, col), (row, col + 2), self.board, is_castle_move=True))
+                start_square = row * 8 + col
+                moves.append(start_square | (start_square + 2) << 6 | piece_codes[self.board[row][col]] << 12 | MOVE_CASTLE)
 
     def getQueensideCastleMoves(self, row, col, moves):
         if self.board[row][col - 1] == '--' and self.board[row][col - 2] == '--' and self.board[row][col - 3] == '--':
             if not self.squareUnderAttack(row, col - 1) and not self.squareUnderAttack(row, col - 2):
-                moves.append(Move((row, col), (row, col - 2), self.board, is_castle_move=True))
+                start_square = row * 8 + col
+                moves.append(start_square | (start_square - 2) << 6 | piece_codes[self.board[row][col]] << 12 | MOVE_CASTLE)
+
+
+class StagedMoves:
+    """
+    Aşamalı hamle üretimi: önce transpozisyon tablosu hamlesi, sonra taş yemeler ve terfiler,
+    sonra katil hamleler, sonra sessiz hamleler, en son rok. Her aşama yalnızca bir önceki aşamanın
+    hamleleri kesme yapmadan tükendiyse üretilir.
+    Transpozisyon ve katil hamleleri başka pozisyonlardan gelebildiği için yalnızca başlangıç karesindeki
+    taşın hamleleri üretilerek denetlenir; diğer aşamalar açmaz bilgisiyle doğrudan geçerli hamle üretir.
+    Şah altındayken kaçışlar az olduğundan getValidMoves bir kez çağrılır ve aynı sırayla verilir.
+    Aramada hamleler yapılıp geri alınırken GameState'in açmaz ve şah alanları değişir,
+    bu yüzden her aşamadan önce bu düğümün değerleri geri yüklenir.
+    """
+
+    def __init__(self, game_state, hash_move=None, killers=(), capture_key=None, quiet_key=None):
+        self.game_state = game_state
+        self.hash_move = hash_move
+        self.killers = []
+        for killer in killers:
+            if killer is not None and killer != hash_move and killer not in self.killers:
+                self.killers.append(killer)
+        self.capture_key = capture_key
+        self.quiet_key = quiet_key
+        self.generated_count = 0  # üretilen hamle sayısı (geçerlilik denetimi için üretilenler hariç)
+        self.move_count = 0  # verilen hamle sayısı; tükendiğinde sıfırsa pozisyon mat ya da pattır
+        self.in_check = False
+
+    def __iter__(self):
+        game_state = self.game_state
+        in_check, pins, checks = game_state.checkForPinsAndChecks()
+        self.in_check = in_check
+        if in_check:
+            moves = game_state.getValidMoves()
+            self.generated_count += len(moves)
+            for move in self.orderEvasions(moves):
+                self.move_count += 1
+                yield move
+            return
+        if self.hash_move is not None:
+            game_state.in_check, game_state.pins, game_state.checks = in_check, list(pins), checks
+            if self.isPieceMove(self.hash_move):
+                self.generated_count += 1
+                self.move_count += 1
+                yield self.hash_move
+        captures = [move for move in game_state.getCaptureMoves() if move != self.hash_move]
+        self.generated_count += len(captures)
+        if self.capture_key is not None:
+            captures.sort(key=self.capture_key, reverse=True)
+        for move in captures:
+            self.move_count += 1
+            yield move
+        for killer in self.killers:
+            game_state.in_check, game_state.pins, game_state.checks = in_check, list(pins), checks
+            if not killer & MOVE_TACTICAL and self.isPieceMove(killer):
+                self.generated_count += 1
+                self.move_count += 1
+                yield killer
+        game_state.in_check, game_state.pins, game_state.checks = in_check, list(pins), checks
+        skipped_moves = [self.hash_move] + self.killers
+        quiet_moves = [move for move in game_state.getAllPossibleMoves()
+                       if not move & MOVE_TACTICAL and move not in skipped_moves]
+        self.generated_count += len(quiet_moves)
+        if self.quiet_key is not None:
+            quiet_moves.sort(key=self.quiet_key, reverse=True)
+        for move in quiet_moves:
+            self.move_count += 1
+            yield move
+        castle_moves = []
+        king_row, king_col = game_state.white_king_location if game_state.white_to_move else \
+            game_state.black_king_location
+        game_state.getCastleMoves(king_row, king_col, castle_moves)
+        self.generated_count += len(castle_moves)
+        for move in castle_moves:
+            if move not in skipped_moves:
+                self.move_count += 1
+                yield move
+
+    def isPieceMove(self, move):
+        """
+        Hamle bu pozisyonda geçerli mi; yalnızca başlangıç karesindeki taşın hamleleri üretilir.
+        """
+        game_state = self.game_state
+        piece = game_state.board[move >> 3 & 7][move & 7]
+        if piece[0] != ("w" if game_state.white_to_move else "b") or piece_codes[piece] != move >> 12 & 15:
+            return False
+        return move in game_state.getPieceMoves(move >> 3 & 7, move & 7)
+
+    def orderEvasions(self, moves):
+        """
+        Şah altındaki geçerli hamleleri aşama sırasına dizer.
+        """
+        ordered = [self.hash_move] if self.hash_move in moves else []
+        captures = [move for move in moves if move & MOVE_TACTICAL and move != self.hash_move]
+        if self.capture_key is not None:
+            captures.sort(key=self.capture_key, reverse=True)
+        ordered += captures
+        ordered += [killer for killer in self.killers if killer in moves and not killer & MOVE_TACTICAL]
+        quiet_moves = [move for move in moves if not move & MOVE_TACTICAL and move not in ordered]
+        if self.quiet_key is not None:
+            quiet_moves.sort(key=self.quiet_key, reverse=True)
+        return ordered + quiet_moves
 
 
 class CastleRights:
@@ -561,6 +1265,12 @@ class CastleRights:
         self.wqs = wqs
         self.bqs = bqs
 
+    def getIndex(self):
+        """
+        Rok haklarını 0-15 arası tek bir sayıya çevirir (Zobrist tablosu için).
+        """
+        return self.wks | self.wqs << 1 | self.bks << 2 | self.bqs << 3
+
 
 class Move:
     # satrançta, tahtadaki alanlar, biri 1-8 arası sayı olan (satırlara karşılık gelen) iki sembolle tanımlanır
@@ -572,6 +1282,9 @@ class Move:
     files_to_cols = {"a": 0, "b": 1, "c": 2, "d": 3,
                      "e": 4, "f": 5, "g": 6, "h": 7}
     cols_to_files = {v: k for k, v in files_to_cols.items()}
+    # Move yalnızca arayüz ve notasyon için paketlenmiş hamlenin okunabilir görünümüdür; __slots__ belleği küçük tutar
+    __slots__ = ("start_row", "start_col", "end_row", "end_col", "piece_moved", "piece_captured", "is_pawn_promotion",
+                 "is_enpassant_move", "is_castle_move", "is_capture", "packed")
 
     def __init__(self, start_square, end_square, board, is_enpassant_move=False, is_castle_move=False):
         self.start_row = start_square[0]
@@ -591,16 +1304,45 @@ class Move:
         self.is_castle_move = is_castle_move
 
         self.is_capture = self.piece_captured != "--"
-        self.moveID = self.start_row * 1000 + self.start_col * 100 + self.end_row * 10 + self.end_col
+        self.packed = self.start_row * 8 + self.start_col | (self.end_row * 8 + self.end_col) << 6 | \
+            piece_codes[self.piece_moved] << 12 | piece_codes[self.piece_captured] << 16
+        if self.is_pawn_promotion:
+            self.packed |= piece_codes[self.piece_moved[0] + "Q"] << 23
+        if self.is_enpassant_move:
+            self.packed |= MOVE_ENPASSANT
+        if self.is_castle_move:
+            self.packed |= MOVE_CASTLE
+
+    @classmethod
+    def fromPacked(cls, packed):
+        """
+        Paketlenmiş hamleden Move görünümü oluşturur; tahtaya ihtiyaç duymaz.
+        """
+        move = cls.__new__(cls)
+        move.start_row = packed >> 3 & 7
+        move.start_col = packed & 7
+        move.end_row = packed >> 9 & 7
+        move.end_col = packed >> 6 & 7
+        move.piece_moved = code_pieces[packed >> 12 & 15]
+        move.piece_captured = code_pieces[packed >> 16 & 15]
+        move.is_pawn_promotion = packed >> 23 & 15 != 0
+        move.is_enpassant_move = packed & MOVE_ENPASSANT != 0
+        move.is_castle_move = packed & MOVE_CASTLE != 0
+        move.is_capture = move.piece_captured != "--"
+        move.packed = packed
+        return move
 
     def __eq__(self, other):
+        """
+        Hamleler başlangıç ve bitiş karesi aynıysa eşittir (arayüzde tıklanan hamleyi bulmak için).
+        """
         if isinstance(other, Move):
-            return self.moveID == other.moveID
+            return self.packed & 4095 == other.packed & 4095
         return False
 
     def getChessNotation(self):
         if self.is_pawn_promotion:
-            return self.getRankFile(self.end_row, self.end_col) + "Q"
+            return self.getRankFile(self.end_row, self.end_col) + self.getPromotionPiece()
         if self.is_castle_move:
             if self.end_col == 1:
                 return "0-0-0"
@@ -626,6 +1368,19 @@ class Move:
     def getRankFile(self, row, col):
         return self.cols_to_files[col] + self.rows_to_ranks[row]
 
+    def getPromotionPiece(self):
+        """
+        Terfi edilen taşın harfi ("Q", "R", "B", "N"); terfi yoksa boş dizi.
+        """
+        return code_pieces[self.packed >> 23 & 15][1] if self.is_pawn_promotion else ""
+
+    def getUciNotation(self):
+        """
+        Başlangıç ve bitiş karesiyle uzun cebirsel gösterim, terfide küçük harfli taş eklenir ("e7e8q").
+        """
+        return self.getRankFile(self.start_row, self.start_col) + self.getRankFile(self.end_row, self.end_col) + \
+            self.getPromotionPiece().lower()
+
     def __str__(self):
         if self.is_castle_move:
             return "0-0" if self.end_col == 6 else "0-0-0"
@@ -634,9 +1389,9 @@ class Move:
 
         if self.piece_moved[1] == "p":
             if self.is_capture:
-                return self.cols_to_files[self.start_col] + "x" + end_square
+                return self.cols_to_files[self.start_col] + "x" + end_square + self.getPromotionPiece()
             else:
-                return end_square + "Q" if self.is_pawn_promotion else end_square
+                return end_square + self.getPromotionPiece()
 
         move_string = self.piece_moved[1]
         if self.is_capture:
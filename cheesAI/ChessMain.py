@@ -4,10 +4,9 @@ Kullanıcı girdisini işliyor.
 Mevcut GameStatus nesnesinde görüntüleniyor.
 """
 import sys
-from multiprocessing import Process, Queue
 import pygame as p
-import ChessAI
 import ChessEngine
+import ChessWorker
 
 BOARD_WIDTH = BOARD_HEIGHT = 512
 MOVE_LOG_PANEL_WIDTH = 250
@@ -15,6 +14,8 @@ MOVE_LOG_PANEL_HEIGHT = BOARD_HEIGHT
 DIMENSION = 8
 SQUARE_SIZE = BOARD_HEIGHT // DIMENSION
 MAX_FPS = 15
+SHOW_SEARCH_STATISTICS = True  # yapay zekanın arama istatistikleri hamle panelinin altında gösterilsin ('i' ile açılıp kapanır)
+STATISTICS_ITERATIONS = 4  # panelde süresi gösterilen son iterasyon sayısı
 IMAGES = {}
 
 
@@ -33,13 +34,12 @@ def main():
     Kodumuzun ana driverı.
     Bu, kullanıcı girişini ve grafikleri güncellemeyi idare edecektir.
     """
-    global return_queue
     p.init()
     screen = p.display.set_mode((BOARD_WIDTH + MOVE_LOG_PANEL_WIDTH, BOARD_HEIGHT))
     clock = p.time.Clock()
     screen.fill(p.Color("white"))
     game_state = ChessEngine.GameState()
-    valid_moves = game_state.getValidMoves()
+    valid_moves = game_state.getValidMoveObjects()
     move_made = False  # bir hareketin ne zaman yapıldığına ilişkin bayrak değişkeni
     animate = False  # bir hareketi ne zaman canlandırmamız gerektiğine ilişkin bayrak değişkeni
     loadImages()  # döngü sırasında bunu yalnızca bir kez yapın
@@ -49,15 +49,18 @@ def main():
     game_over = False
     ai_thinking = False
     move_undone = False
-    move_finder_process = None
+    engine = ChessWorker.EngineWorker()  # yapay zeka süreci oyun boyunca yaşar
     move_log_font = p.font.SysFont("Arial", 14, False, False)
     player_one = True  # eğer bir insan beyaz oynuyorsa, bu True olacak, aksi takdirde False
     player_two = False  # insan beyaz oynuyorsa, bu True olacak, aksi takdirde False
+    ponder = True  # insanın sırasında yapay zeka beklenen cevabı düşünsün
+    show_statistics = SHOW_SEARCH_STATISTICS
 
     while running:
         human_turn = (game_state.white_to_move and player_one) or (not game_state.white_to_move and player_two)
         for e in p.event.get():
             if e.type == p.QUIT:
+                engine.quit()
                 p.quit()
                 sys.exit()
             # mouse işleyici
@@ -77,57 +80,60 @@ def main():
                         for i in range(len(valid_moves)):
                             if move == valid_moves[i]:
                                 game_state.makeMove(valid_moves[i])
+                                engine.makeMove(valid_moves[i])
                                 move_made = True
                                 animate = True
                                 square_selected = ()  # kullanıcı tıklamalarını sıfırla
                                 player_clicks = []
+                                break  # terfide ilk eşleşen vezir terfisidir
                         if not move_made:
                             player_clicks = [square_selected]
 
             # anahtar işleyici
             elif e.type == p.KEYDOWN:
                 if e.key == p.K_z:  # 'z' tuşuna basıldığında geri al
-                    game_state.undoMove()
+                    engine.cancel()
+                    ai_thinking = False
+                    if game_state.move_log:
+                        game_state.undoMove()
+                        engine.undoMove()
                     move_made = True
                     animate = False
                     game_over = False
-                    if ai_thinking:
-                        move_finder_process.terminate()
-                        ai_thinking = False
                     move_undone = True
                 if e.key == p.K_r:  #'r' tuşuna basıldığında oyunu sıfırla
                     game_state = ChessEngine.GameState()
-                    valid_moves = game_state.getValidMoves()
+                    valid_moves = game_state.getValidMoveObjects()
                     square_selected = ()
                     player_clicks = []
                     move_made = False
                     animate = False
                     game_over = False
-                    if ai_thinking:
-                        move_finder_process.terminate()
-                        ai_thinking = False
+                    engine.setPosition()
+                    ai_thinking = False
                     move_undone = True
+                if e.key == p.K_i:  # 'i' tuşuna basıldığında arama istatistiklerini aç/kapat
+                    show_statistics = not show_statistics
         # AI hareket bulucu
         if not game_over and not human_turn and not move_undone:
             if not ai_thinking:
                 ai_thinking = True
-                return_queue = Queue()  # iş parçacıkları arasında veri iletmek için kullanılır
-                move_finder_process = Process(target=ChessAI.findBestMove, args=(game_state, valid_moves, return_queue))
-                move_finder_process.start()
-
-            if not move_finder_process.is_alive():
-                ai_move = return_queue.get()
-                if ai_move is None:
-                    ai_move = ChessAI.findRandomMove(valid_moves)
+                engine.startSearch()  # yalnızca komut gönderilir, oyun durumu kopyalanmaz
+
+            ai_move = engine.getBestMove()
+            if ai_move is not None:
                 game_state.makeMove(ai_move)
+                engine.makeMove(ai_move)
+                if ponder and ((game_state.white_to_move and player_one) or (not game_state.white_to_move and player_two)):
+                    engine.startPondering()  # insan düşünürken beklenen cevabı ara
                 move_made = True
                 animate = True
                 ai_thinking = False
 
         if move_made:
             if animate:
-                animateMove(game_state.move_log[-1], screen, game_state.board, clock)
-            valid_moves = game_state.getValidMoves()
+                animateMove(ChessEngine.Move.fromPacked(game_state.move_log[-1]), screen, game_state.board, clock)
+            valid_moves = game_state.getValidMoveObjects()
             move_made = False
             animate = False
             move_undone = False
@@ -135,7 +141,7 @@ def main():
         drawGameState(screen, game_state, valid_moves, square_selected)
 
         if not game_over:
-            drawMoveLog(screen, game_state, move_log_font)
+            drawMoveLog(screen, game_state, move_log_font, engine.statistics if show_statistics else None)
 
         if game_state.checkmate:
             game_over = True
@@ -179,7 +185,7 @@ def highlightSquares(screen, game_state, valid_moves, square_selected):
     Seçilen kareyi vurgular ve seçilen parça için hareket eder.
     """
     if (len(game_state.move_log)) > 0:
-        last_move = game_state.move_log[-1]
+        last_move = ChessEngine.Move.fromPacked(game_state.move_log[-1])
         s = p.Surface((SQUARE_SIZE, SQUARE_SIZE))
         s.set_alpha(100)
         s.fill(p.Color('green'))
@@ -211,13 +217,13 @@ def drawPieces(screen, board):
                 screen.blit(IMAGES[piece], p.Rect(column * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
 
 
-def drawMoveLog(screen, game_state, font):
+def drawMoveLog(screen, game_state, font, statistics=None):
     """
-    Haraket log'u çizer
+    Haraket log'u çizer; statistics verilirse yapay zekanın son aramasının istatistikleri panelin altına yazılır.
     """
     move_log_rect = p.Rect(BOARD_WIDTH, 0, MOVE_LOG_PANEL_WIDTH, MOVE_LOG_PANEL_HEIGHT)
     p.draw.rect(screen, p.Color('black'), move_log_rect)
-    move_log = game_state.move_log
+    move_log = [ChessEngine.Move.fromPacked(move) for move in game_state.move_log]
     move_texts = []
     for i in range(0, len(move_log), 2):
         move_string = str(i // 2 + 1) + '. ' + str(move_log[i]) + " "
@@ -240,6 +246,14 @@ def drawMoveLog(screen, game_state, font):
         screen.blit(text_object, text_location)
         text_y += text_object.get_height() + line_spacing
 
+    if statistics is not None:
+        # son satır panelin en altında olacak şekilde aşağıdan yukarı yazılır
+        text_y = MOVE_LOG_PANEL_HEIGHT - padding
+        for line in reversed(statistics.getSummaryLines(STATISTICS_ITERATIONS)):
+            text_object = font.render(line, True, p.Color('gray'))
+            text_y -= text_object.get_height() + line_spacing
+            screen.blit(text_object, move_log_rect.move(padding, text_y))
+
 
 def drawEndGameText(screen, text):
     font = p.font.SysFont("Helvetica", 32, True, False)
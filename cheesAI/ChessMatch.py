@@ -0,0 +1,190 @@
+"""
+Arayüzsüz motor-motor turnuvası.
+İki motor ayarını çeşitli açılışlardan başlayan oyunlarda karşılaştırır; her açılış iki kez, renkler
+değiştirilerek oynanır. Oyunlar süreç havuzunda paralel oynanır, her süreç kendi motor durumunu tutar.
+Oyun mat ya da patla (GameState bayrakları), üç kez tekrarla ya da yarım hamle sınırında beraberlikle biter.
+Rapor: galibiyet/beraberlik/yenilgi, puan, %95 güven aralığıyla Elo farkı ve her ayarın ortalama düğüm/sn'si.
+Süre sınırlı ayarlarda işçi sayısı çekirdek sayısını geçmemelidir, yoksa süreçler birbirinin süresini yer.
+Ayar "anahtar=değer" çiftlerinin virgülle ayrılmış listesidir:
+  depth=3, time=0.5 (hamle başına saniye; verilirse derinlik üst sınır olur),
+  ordering, staged, quiescence, null, lmr, pvs, aspiration, tablebases = 0/1 (ChessAI anahtarları)
+Kullanım: python ChessMatch.py "depth=3" "depth=3,null=0,lmr=0" [--games 24] [--workers 4] [--max-plies 200]
+"""
+import argparse
+import math
+import multiprocessing
+import queue
+import time
+import ChessAI
+import ChessBenchmark
+
+# ayar anahtarından ChessAI modül anahtarına
+FEATURE_SWITCHES = {"ordering": "MOVE_ORDERING", "staged": "STAGED_MOVE_GENERATION", "quiescence": "QUIESCENCE",
+                    "null": "NULL_MOVE", "lmr": "LATE_MOVE_REDUCTIONS", "pvs": "PRINCIPAL_VARIATION_SEARCH",
+                    "aspiration": "ASPIRATION_WINDOWS", "tablebases": "TABLEBASES"}
+DEFAULT_SWITCHES = {name: getattr(ChessAI, name) for name in FEATURE_SWITCHES.values()}  # ayarda verilmeyenler
+# başlangıç pozisyonundan oynanan açılış dizileri; her biri iki oyunda, renkler değiştirilerek kullanılır
+OPENINGS = list(ChessBenchmark.BENCHMARK_POSITIONS.values()) + [
+    "e2e4 e7e6 d2d4 d7d5 b1c3 g8f6",  # fransız
+    "e2e4 c7c6 d2d4 d7d5 b1c3 d5e4 c3e4",  # caro-kann
+    "d2d4 g8f6 c2c4 g7g6 b1c3 f8g7 e2e4 d7d6",  # kral hint
+    "c2c4 e7e5 b1c3 g8f6 g1f3 b8c6",  # ingiliz
+    "e2e4 e7e5 g1f3 b8c6 f1b5 a7a6 b5a4 g8f6",  # ispanyol
+    "d2d4 d7d5 c2c4 c7c6 g1f3 g8f6 b1c3 d5c4",  # slav
+    "e2e4 d7d6 d2d4 g8f6 b1c3 g7g6",  # pirc
+]
+DEFAULT_DEPTH = 3
+REPETITION_LIMIT = 3  # aynı pozisyon bu kadar kez oluşursa beraberlik
+
+
+def parseConfiguration(text):
+    """
+    "depth=3,time=0.5,null=0" biçimindeki ayarı {"max_depth", "time_limit", "switches"} sözlüğüne çevirir.
+    """
+    configuration = {"name": text, "max_depth": None, "time_limit": None, "switches": {}}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        key, separator, value = item.partition("=")
+        if not separator:
+            raise ValueError("Ayar anahtar=değer olmalı: " + item)
+        if key == "depth":
+            configuration["max_depth"] = int(value)
+        elif key == "time":
+            configuration["time_limit"] = float(value)
+        elif key in FEATURE_SWITCHES:
+            configuration["switches"][FEATURE_SWITCHES[key]] = value not in ("0", "false", "off")
+        else:
+            raise ValueError("Bilinmeyen ayar: " + key)
+    if configuration["max_depth"] is None:
+        configuration["max_depth"] = ChessAI.MAX_DEPTH if configuration["time_limit"] is not None else DEFAULT_DEPTH
+    return configuration
+
+
+class MatchEngine:
+    """
+    Tek süreçte iki ayarın sırayla arama yapabilmesi için her ayarın kendi transpozisyon ve geçmiş tabloları;
+    hamleden önce ChessAI'nin modül anahtarları ve tabloları bu ayarınkilerle değiştirilir.
+    """
+
+    def __init__(self, configuration):
+        self.configuration = configuration
+        self.transposition_table = ChessAI.TranspositionTable()
+        self.history_scores = {}
+        self.nodes = 0
+        self.elapsed = 0.0
+
+    def findMove(self, game_state, valid_moves):
+        for name in FEATURE_SWITCHES.values():
+            setattr(ChessAI, name, self.configuration["switches"].get(name, DEFAULT_SWITCHES[name]))
+        ChessAI.transposition_table = self.transposition_table
+        ChessAI.history_scores = self.history_scores
+        best_move, score, line, statistics = ChessAI.findBestMove(
+            game_state, valid_moves, queue.Queue(), time_limit=self.configuration["time_limit"],
+            max_depth=self.configuration["max_depth"], workers=1, use_book=False)
+        self.nodes += statistics.counters["nodes_searched"]
+        self.elapsed += statistics.elapsed
+        return best_move if best_move is not None else ChessAI.findRandomMove(valid_moves)
+
+
+def playGame(task):
+    """
+    İşçi süreçte tek oyun oynar. task: (oyun no, açılış, beyaz ayar no, ayarlar, yarım hamle sınırı).
+    (oyun no, beyaz ayar no, beyazın puanı, bitiş nedeni, yarım hamle, {ayar no: (düğüm, süre)}) döndürür.
+    """
+    game_index, opening, white_index, configurations, max_plies = task
+    engines = {white_index: MatchEngine(configurations[white_index]),
+               1 - white_index: MatchEngine(configurations[1 - white_index])}
+    game_state = ChessBenchmark.loadPosition(opening)
+    repetitions = {game_state.zobrist_key: 1}
+    result, reason = 0.5, "sınır"
+    while len(game_state.move_log) < max_plies:
+        valid_moves = game_state.getValidMoves()
+        if game_state.checkmate:
+            result, reason = (0.0 if game_state.white_to_move else 1.0), "mat"
+            break
+        if game_state.stalemate:
+            reason = "pat"
+            break
+        engine = engines[white_index if game_state.white_to_move else 1 - white_index]
+        game_state.makeMove(engine.findMove(game_state, valid_moves))
+        repetitions[game_state.zobrist_key] = repetitions.get(game_state.zobrist_key, 0) + 1
+        if repetitions[game_state.zobrist_key] >= REPETITION_LIMIT:
+            reason = "tekrar"
+            break
+    return (game_index, white_index, result, reason, len(game_state.move_log),
+            {index: (engine.nodes, engine.elapsed) for index, engine in engines.items()})
+
+
+def computeElo(wins, draws, losses):
+    """
+    İlk ayarın sonuçlarından Elo farkı ve %95 güven aralığının yarı genişliği; aralık oyun puanlarının
+    (1, 1/2, 0) örnek varyansından hesaplanır, böylece beraberlikler belirsizliği azaltır.
+    Puan 0 ya da 1 ise fark ve aralık sonsuzdur.
+    """
+    def eloFromScore(value):
+        if value <= 0.0:
+            return -math.inf
+        if value >= 1.0:
+            return math.inf
+        return 400.0 * math.log10(value / (1.0 - value))
+
+    games = wins + draws + losses
+    score = (wins + 0.5 * draws) / games
+    if not 0.0 < score < 1.0:
+        return eloFromScore(score), math.inf
+    variance = (wins + 0.25 * draws) / games - score * score
+    error = 1.96 * math.sqrt(variance / games)
+    return eloFromScore(score), (eloFromScore(score + error) - eloFromScore(score - error)) / 2.0
+
+
+def runMatch(configurations, games, workers, max_plies, verbose=True):
+    """
+    Oyunları havuzda oynatır; her ayar için (galibiyet, beraberlik, yenilgi, düğüm, süre) özetini döndürür.
+    """
+    tasks = [(game_index, OPENINGS[game_index // 2 % len(OPENINGS)], game_index % 2, configurations, max_plies)
+             for game_index in range(games)]
+    totals = [[0, 0, 0, 0, 0.0] for configuration in configurations]
+    pool = multiprocessing.Pool(workers)
+    try:
+        for game_index, white_index, result, reason, plies, usage in pool.imap_unordered(playGame, tasks):
+            first_score = result if white_index == 0 else 1.0 - result
+            for index in (0, 1):
+                score = first_score if index == 0 else 1.0 - first_score
+                totals[index][0 if score == 1.0 else 1 if score == 0.5 else 2] += 1
+                totals[index][3] += usage[index][0]
+                totals[index][4] += usage[index][1]
+            if verbose:
+                print("oyun %d: beyaz %s, sonuç %s (%s, %d yarım hamle)" % (
+                    game_index + 1, configurations[white_index]["name"],
+                    {1.0: "1-0", 0.0: "0-1", 0.5: "1/2-1/2"}[result], reason, plies))
+    finally:
+        pool.close()
+        pool.join()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İki motor ayarı arasında arayüzsüz turnuva")
+    parser.add_argument("first", help='ilk ayar, ör. "depth=3"')
+    parser.add_argument("second", help='ikinci ayar, ör. "depth=3,null=0"')
+    parser.add_argument("--games", type=int, default=2 * len(OPENINGS), help="oyun sayısı (çift olmalı)")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--max-plies", type=int, default=200, help="bu kadar yarım hamleden sonra beraberlik")
+    parser.add_argument("--quiet", action="store_true", help="oyun sonuçlarını tek tek yazma")
+    args = parser.parse_args()
+    configurations = [parseConfiguration(args.first), parseConfiguration(args.second)]
+
+    start_time = time.time()
+    totals = runMatch(configurations, args.games, args.workers, args.max_plies, not args.quiet)
+    elo, error = computeElo(*totals[0][:3])
+    print("%-28s %5s %5s %5s %8s %10s" % ("ayar", "+", "=", "-", "puan", "düğüm/sn"))
+    for configuration, total in zip(configurations, totals):
+        nodes, elapsed = total[3:]
+        print("%-28s %5d %5d %5d %7.1f%% %10.0f" % (configuration["name"], total[0], total[1], total[2],
+                                                   100.0 * (total[0] + 0.5 * total[1]) / args.games,
+                                                   nodes / elapsed if elapsed else 0.0))
+    print("Elo farkı (ilk - ikinci): %+.0f ± %.0f (%%95), %d oyun, %.1f sn" % (elo, error, args.games,
+                                                                             time.time() - start_time))
+
+
+if __name__ == "__main__":
+    main()
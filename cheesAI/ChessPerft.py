@@ -0,0 +1,132 @@
+"""
+Perft: hamle üreticisinin doğruluk ve hız kıyaslaması.
+Bilinen referans pozisyonlarında her derinlikteki yaprak düğüm sayısını beklenen değerlerle karşılaştırır
+ve saniyedeki düğüm sayısını raporlar. Sayılardan biri tutmazsa çıkış kodu 1 olur,
+böylece hamle üreticisindeki her değişiklikten sonra regresyon testi olarak çalıştırılabilir.
+Kullanım: python ChessPerft.py [--depth 3] [--position kiwipete] [--fen "..."] [--divide] [--bitboard]
+"""
+import argparse
+import sys
+import time
+import ChessEngine
+
+# (FEN, 1. derinlikten başlayarak beklenen düğüm sayıları)
+REFERENCE_POSITIONS = {
+    "başlangıç": ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+                  [20, 400, 8902, 197281, 4865609]),
+    # rok, geçerken alma, açmaz ve terfi içeren karmaşık orta oyun
+    "kiwipete": ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                 [48, 2039, 97862, 4085603]),
+    # yatay açmazda geçerken alma ve piyonla şah çekme
+    "geçerken alma": ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+                      [14, 191, 2812, 43238, 674624]),
+    # rok hakları, alt terfiler ve şah altında terfi
+    "rok": ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+            [6, 264, 9467, 422333]),
+    # aynı pozisyonun renkleri değiştirilmiş hali, sayılar aynı olmalı
+    "rok (ayna)": ("r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+                   [6, 264, 9467, 422333]),
+    "terfi": ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+              [44, 1486, 62379, 2103487]),
+    "orta oyun": ("r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+                  [46, 2079, 89890, 3894594]),
+}
+
+
+def perft(game_state, depth):
+    """
+    Verilen derinlikteki yaprak düğüm sayısı.
+    """
+    moves = game_state.getValidMoves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        game_state.makeMove(move)
+        nodes += perft(game_state, depth - 1)
+        game_state.undoMove()
+    return nodes
+
+
+def divide(game_state, depth):
+    """
+    Kökteki her hamle için alt ağaçtaki yaprak sayısı: [(hamle, düğüm sayısı), ...].
+    Yanlış sayının hangi hamleden geldiğini bulmak için referans bir motorla karşılaştırılır.
+    """
+    results = []
+    for move in game_state.getValidMoves():
+        game_state.makeMove(move)
+        nodes = 1 if depth == 1 else perft(game_state, depth - 1)
+        game_state.undoMove()
+        results.append((ChessEngine.Move.fromPacked(move).getUciNotation(), nodes))
+    return sorted(results)
+
+
+def runPerft(game_state, depth):
+    """
+    Perft çalıştırır ve (düğüm sayısı, saniyedeki düğüm) döndürür.
+    """
+    start_time = time.perf_counter()
+    nodes = perft(game_state, depth)
+    return nodes, nodes / max(time.perf_counter() - start_time, 1e-9)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Referans pozisyonlarda perft doğruluk ve hız testi")
+    parser.add_argument("--depth", type=int, default=3, help="en büyük derinlik (varsayılan 3)")
+    parser.add_argument("--position", choices=sorted(REFERENCE_POSITIONS), help="yalnızca bu referans pozisyon")
+    parser.add_argument("--fen", help="referans dışı bir pozisyon (beklenen sayı yoktur)")
+    parser.add_argument("--divide", action="store_true", help="kök hamlelerine göre düğüm sayılarını yazdır")
+    parser.add_argument("--bitboard", action="store_true", help="bitboard tabanlı hamle üreticisini kullan")
+    args = parser.parse_args()
+
+    state_class = ChessEngine.GameState
+    if args.bitboard:
+        import ChessBitboard
+        state_class = ChessBitboard.BitboardGameState
+    if args.fen is not None:
+        positions = {"fen": (args.fen, [])}
+    elif args.position is not None:
+        positions = {args.position: REFERENCE_POSITIONS[args.position]}
+    else:
+        positions = REFERENCE_POSITIONS
+
+    if args.divide:
+        for name, (fen, expected_counts) in positions.items():
+            print(name + ": " + fen)
+            results = divide(state_class(fen), args.depth)
+            for move_string, nodes in results:
+                print("%s: %d" % (move_string, nodes))
+            total_nodes = sum(nodes for move_string, nodes in results)
+            print("toplam: %d" % total_nodes)
+            if args.depth <= len(expected_counts) and total_nodes != expected_counts[args.depth - 1]:
+                print("HATA: beklenen %d" % expected_counts[args.depth - 1])
+                sys.exit(1)
+        return
+
+    print("%-16s %6s %10s %10s %10s" % ("pozisyon", "derinlik", "düğüm", "beklenen", "düğüm/sn"))
+    failures = 0
+    total_nodes = 0
+    total_time = 0.0
+    for name, (fen, expected_counts) in positions.items():
+        depths = range(1, args.depth + 1) if not expected_counts else range(1, min(args.depth, len(expected_counts)) + 1)
+        for depth in depths:
+            nodes, nodes_per_second = runPerft(state_class(fen), depth)
+            total_nodes += nodes
+            total_time += nodes / nodes_per_second
+            expected = expected_counts[depth - 1] if depth <= len(expected_counts) else None
+            status = ""
+            if expected is not None and nodes != expected:
+                failures += 1
+                status = "  HATA"
+            print("%-16s %6d %10d %10s %10.0f%s" % (name, depth, nodes, "-" if expected is None else expected,
+                                                     nodes_per_second, status))
+    print("toplam %d düğüm, %.2f sn, %.0f düğüm/sn" % (total_nodes, total_time, total_nodes / max(total_time, 1e-9)))
+    if failures:
+        print("%d sayı EŞLEŞMİYOR" % failures)
+        sys.exit(1)
+    print("tüm sayılar eşleşiyor")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Arayüzsüz profil çıkarma.
+Sabit bir iş yükünü (kıyaslama pozisyonlarında sabit derinlikte arama ya da referans pozisyonlarda perft)
+cProfile altında çalıştırır; pygame hiç içe aktarılmaz, yalnızca ChessEngine ve ChessAI ölçülür.
+Çıktı JSON'dur: izlenen sıcak fonksiyonların (getValidMoves, checkForPinsAndChecks, squareUnderAttack,
+Move.__init__, scoreBoard, makeMove, undoMove ...) çağrı sayısı, kendi süresi ve toplam süresi,
+ayrıca ChessEngine ve ChessAI içinde kendi süresi en yüksek fonksiyonlar. Anahtarlar sıralı yazıldığından
+iki sürümün çıktısı doğrudan diff'lenebilir; --compare ile önceki bir çıktıyla süre oranları yazdırılır.
+Kullanım: python ChessProfile.py [--workload search|perft] [--depth 3] [--top 20] [--output profil.json]
+          python ChessProfile.py --compare eski.json [--workload ...]
+"""
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import queue
+import sys
+import time
+import ChessAI
+import ChessBenchmark
+import ChessEngine
+import ChessPerft
+
+# raporda her zaman yer alan fonksiyonlar; çağrılmasalar da sıfır değerle yazılırlar
+TRACKED_FUNCTIONS = {
+    "GameState.getValidMoves": ChessEngine.GameState.getValidMoves,
+    "GameState.getCaptureMoves": ChessEngine.GameState.getCaptureMoves,
+    "GameState.hasLegalMove": ChessEngine.GameState.hasLegalMove,
+    "GameState.checkForPinsAndChecks": ChessEngine.GameState.checkForPinsAndChecks,
+    "GameState.squareUnderAttack": ChessEngine.GameState.squareUnderAttack,
+    "GameState.getAttackMap": ChessEngine.GameState.getAttackMap,
+    "GameState.makeMove": ChessEngine.GameState.makeMove,
+    "GameState.undoMove": ChessEngine.GameState.undoMove,
+    "Move.__init__": ChessEngine.Move.__init__,
+    "ChessAI.scoreBoard": ChessAI.scoreBoard,
+    "ChessAI.findMoveNegaMaxAlphaBeta": ChessAI.findMoveNegaMaxAlphaBeta,
+    "ChessAI.quiescenceSearch": ChessAI.quiescenceSearch,
+}
+PROFILED_MODULES = (ChessEngine, ChessAI)
+
+
+def runSearchWorkload(depth):
+    """
+    Her kıyaslama pozisyonunu soğuk tablolarla sabit derinliğe kadar arar; toplam düğüm sayısını döndürür.
+    """
+    nodes = 0
+    for move_strings in ChessBenchmark.BENCHMARK_POSITIONS.values():
+        game_state = ChessBenchmark.loadPosition(move_strings)
+        ChessBenchmark.resetSearch(True)
+        ChessAI.findBestMove(game_state, game_state.getValidMoves(), queue.Queue(), time_limit=None, max_depth=depth,
+                             use_book=False)
+        nodes += ChessAI.nodes_searched
+    return nodes
+
+
+def runPerftWorkload(depth):
+    """
+    Her referans pozisyonda verilen derinlikte perft; toplam yaprak sayısını döndürür.
+    """
+    return sum(ChessPerft.perft(ChessEngine.GameState(fen), depth)
+               for fen, expected_counts in ChessPerft.REFERENCE_POSITIONS.values())
+
+
+WORKLOADS = {"search": runSearchWorkload, "perft": runPerftWorkload}
+
+
+def getFunctionKey(function):
+    """
+    pstats'in fonksiyon anahtarı: (dosya, ilk satır, ad).
+    """
+    code = function.__code__
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+def getQualifiedNames():
+    """
+    Profillenen modüllerdeki fonksiyon ve metotların anahtarından "Sınıf.metot" ya da "Modül.fonksiyon" adına eşleme;
+    cProfile yalnızca kısa adı tuttuğu için aynı adlı metotlar (ör. __init__) böyle ayırt edilir.
+    """
+    names = {}
+    for module in PROFILED_MODULES:
+        for name, value in vars(module).items():
+            if isinstance(value, type) and value.__module__ == module.__name__:
+                for method_name, method in vars(value).items():
+                    if hasattr(method, "__code__"):
+                        names[getFunctionKey(method)] = value.__name__ + "." + method_name
+            elif hasattr(value, "__code__") and value.__module__ == module.__name__:
+                names[getFunctionKey(value)] = module.__name__ + "." + name
+    return names
+
+
+def describeFunction(statistics, key):
+    primitive_calls, calls, own_time, total_time = statistics.get(key, (0, 0, 0.0, 0.0, None))[:4]
+    return {"calls": calls, "primitive_calls": primitive_calls, "tottime": round(own_time, 6),
+            "cumtime": round(total_time, 6),
+            "percall_us": round(own_time / calls * 1e6, 3) if calls else 0.0}
+
+
+def profileWorkload(workload, depth, top):
+    """
+    İş yükünü cProfile altında çalıştırır ve JSON'a yazılacak sözlüğü döndürür.
+    """
+    profiler = cProfile.Profile()
+    start_time = time.perf_counter()
+    profiler.enable()
+    nodes = WORKLOADS[workload](depth)
+    profiler.disable()
+    elapsed = time.perf_counter() - start_time
+    statistics = pstats.Stats(profiler).stats
+    names = getQualifiedNames()
+    tracked = {name: describeFunction(statistics, getFunctionKey(function))
+               for name, function in TRACKED_FUNCTIONS.items()}
+    profiled_files = {os.path.abspath(module.__file__) for module in PROFILED_MODULES}
+    own_keys = [key for key in statistics if os.path.abspath(key[0]) in profiled_files]
+    own_keys.sort(key=lambda key: statistics[key][2], reverse=True)
+    hottest = [dict(describeFunction(statistics, key), name=names.get(key, "%s:%d(%s)" % (
+        os.path.basename(key[0]), key[1], key[2]))) for key in own_keys[:top]]
+    return {"workload": workload, "depth": depth, "nodes": nodes, "elapsed": round(elapsed, 6),
+            "python": sys.version.split()[0], "functions": tracked, "hottest": hottest}
+
+
+def printComparison(old_report, new_report):
+    """
+    İzlenen fonksiyonların kendi sürelerini eski raporla karşılaştırır (sekmeyle ayrılmış satırlar).
+    """
+    print("fonksiyon\teski sn\tyeni sn\toran\teski çağrı\tyeni çağrı")
+    for name, new in sorted(new_report["functions"].items()):
+        old = old_report["functions"].get(name)
+        if old is None:
+            continue
+        ratio = new["tottime"] / old["tottime"] if old["tottime"] else 0.0
+        print("%s\t%.3f\t%.3f\t%.2f\t%d\t%d" % (name, old["tottime"], new["tottime"], ratio, old["calls"],
+                                               new["calls"]))
+    print("toplam\t%.3f\t%.3f\t%.2f\t%d\t%d" % (old_report["elapsed"], new_report["elapsed"],
+                                                new_report["elapsed"] / old_report["elapsed"], old_report["nodes"],
+                                                new_report["nodes"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Motor ve arama sıcak yollarının arayüzsüz profili (JSON)")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="search", help="profillenecek iş yükü")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--top", type=int, default=20, help="kendi süresi en yüksek kaç fonksiyon yazılsın")
+    parser.add_argument("--output", help="JSON dosyası (varsayılan standart çıktı)")
+    parser.add_argument("--compare", metavar="JSON", help="önceki bir çıktıyla karşılaştır")
+    args = parser.parse_args()
+    report = profileWorkload(args.workload, args.depth, args.top)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as old_file:
+            printComparison(json.load(old_file), report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2, sort_keys=True, ensure_ascii=False)
+            output_file.write("\n")
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True, ensure_ascii=False)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,523 @@
+"""
+Oyun sonu tabloları (mata uzaklık, DTM).
+3 ve 4 taşlı oyun sonlarının her pozisyonu için mata kaç yarım hamle kaldığı, ChessEngine'in hamle
+üreticisi kullanılarak geriye doğru analizle (retrograde) önceden hesaplanır ve dosyaya yazılır.
+Arama ve kök, tablodaki pozisyonları sabit sürede sorgular: tahta taranır, tablo adı ve dizin hesaplanır,
+değer tek bir dizi erişimiyle okunur.
+
+Tablo adı beyaz ve siyah taşlardır ("KQvK", "KRvKP"); daha güçlü taraf her zaman beyazdır,
+siyahın güçlü olduğu pozisyonlar renkler ve satırlar çevrilerek sorgulanır.
+Dizin: sıra, beyaz şahın karesi, sonra diğer taşların kareleri (64 tabanında). Piyonsuz tablolarda beyaz şah
+simetriyle a1-d1-d4 üçgenine (10 kare), piyonlu tablolarda a-d sütunlarına (32 kare) taşınır.
+Değerler işaretli birer bayttır: 0 beraberlik (ya da geçersiz pozisyon), pozitif d sıradaki taraf d yarım
+hamlede mat eder, negatif v sıradaki taraf -v - 1 yarım hamlede mat olur (-1: mat olmuş).
+Dosya, 8 baytlık başlıktan sonra değer dizisinin ham baytlarıdır; tek okumayla diziye alınır.
+Rok hakkı olan pozisyonlar sorgulanmaz; iki tarafın da piyonu olan tablolar (geçerken alma) üretilmez.
+Kullanım: python ChessTablebase.py [KQvK KRvK ...] [--four] [--directory tablebases]
+          python ChessTablebase.py --probe "FEN" [--directory tablebases]
+"""
+import argparse
+import array
+import itertools
+import os
+import time
+import ChessEngine
+
+TABLEBASE_DIRECTORY = "tablebases"
+MAX_PIECES = 4
+FILE_HEADER = b"CHESSDTM"
+PIECE_ORDER = "KQRBNP"
+PIECE_VALUES = {"K": 0, "Q": 9, "R": 5, "B": 3, "N": 3, "P": 1}
+THREE_PIECE_ENDINGS = ("KQvK", "KRvK", "KPvK")
+# mat mümkün olmadığından tablo gerektirmeyen oyun sonları
+DRAWN_ENDINGS = ("KvK", "KBvK", "KNvK")
+# üretim sırasında pozisyon durumları
+UNKNOWN = 0
+ILLEGAL = 1
+RESOLVED = 2
+
+
+def buildSymmetries():
+    """
+    Tahtanın 8 simetrisi, kare -> kare listeleri olarak; ilki özdeşliktir.
+    """
+    symmetries = []
+    for diagonal in (False, True):
+        for flip_rows in (False, True):
+            for flip_cols in (False, True):
+                symmetry = []
+                for square in range(64):
+                    row, col = square >> 3, square & 7
+                    if diagonal:
+                        row, col = 7 - col, 7 - row
+                    if flip_rows:
+                        row = 7 - row
+                    if flip_cols:
+                        col = 7 - col
+                    symmetry.append(row * 8 + col)
+                symmetries.append(symmetry)
+    return symmetries
+
+
+symmetries = buildSymmetries()
+diagonal_symmetry = symmetries[4]  # a1-h8 köşegenine göre yansıma
+# piyonsuz tablolarda beyaz şah a1-d1-d4 üçgenine, piyonlu tablolarda a-d sütunlarına taşınır
+pawnless_king_squares = [square for square in range(64) if (square & 7) <= 3 and (square >> 3) >= 7 - (square & 7)]
+pawnless_transforms = [next(symmetry for symmetry in symmetries if symmetry[square] in pawnless_king_squares)
+                       for square in range(64)]
+pawn_king_squares = [square for square in range(64) if (square & 7) <= 3]
+pawn_transforms = [symmetries[0] if (square & 7) <= 3 else symmetries[1] for square in range(64)]
+
+loaded_tables = {}  # tablo adı -> Tablebase; dosyası olmayanlar None
+available_tables = None  # dizindeki tablo adları, ilk sorguda okunur
+
+
+class Tablebase:
+    def __init__(self, name, values=None):
+        self.name = name
+        white, black = name.split("v")
+        self.pieces = [color + (letter if letter != "P" else "p") for color, side in (("w", white), ("b", black))
+                       for letter in side]
+        self.black_king_index = len(white)
+        self.has_pawns = "P" in name
+        self.king_squares = pawn_king_squares if self.has_pawns else pawnless_king_squares
+        self.transforms = pawn_transforms if self.has_pawns else pawnless_transforms
+        self.king_slots = {square: slot for slot, square in enumerate(self.king_squares)}
+        self.size = 2 * len(self.king_squares) * 64 ** (len(self.pieces) - 1)
+        self.values = values
+
+    def getIndex(self, squares, white_to_move):
+        """
+        Kareleri tablonun taş sırasında verilen pozisyonun dizini; simetri burada uygulanır.
+        """
+        transform = self.transforms[squares[0]]
+        index = self.king_slots[transform[squares[0]]] + (0 if white_to_move else len(self.king_squares))
+        for square in squares[1:]:
+            index = index * 64 + transform[square]
+        return index
+
+    def getSquares(self, index):
+        """
+        getIndex'in tersi: (kareler, beyaz mı oynar).
+        """
+        squares = []
+        for i in range(len(self.pieces) - 1):
+            index, square = divmod(index, 64)
+            squares.append(square)
+        side, slot = divmod(index, len(self.king_squares))
+        squares.append(self.king_squares[slot])
+        squares.reverse()
+        return squares, side == 0
+
+    def orderSquares(self, pieces):
+        """
+        [(taş, kare), ...] listesini tablonun taş sırasındaki karelere çevirir.
+        """
+        remaining = list(pieces)
+        squares = []
+        for table_piece in self.pieces:
+            for i, (piece, square) in enumerate(remaining):
+                if piece == table_piece:
+                    squares.append(square)
+                    del remaining[i]
+                    break
+        return squares
+
+    def getTwinIndex(self, squares, white_to_move):
+        """
+        Piyonsuz tabloda beyaz şah köşegendeyse pozisyonun köşegen yansıması da ayrı bir dizinde saklanır;
+        o dizin, yoksa None.
+        """
+        if self.has_pawns or (squares[0] >> 3) != 7 - (squares[0] & 7):
+            return None
+        return self.getIndex([diagonal_symmetry[square] for square in squares], white_to_move)
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, self.name + ".dtm"), "wb") as table_file:
+            table_file.write(FILE_HEADER)
+            table_file.write(self.values.tobytes())
+
+
+def loadTable(name, directory=None):
+    """
+    Tabloyu ilk istendiğinde dosyadan okur; dosya yoksa None.
+    """
+    if name in loaded_tables:
+        return loaded_tables[name]
+    if directory is None:
+        directory = TABLEBASE_DIRECTORY
+    table = None
+    path = os.path.join(directory, name + ".dtm")
+    if os.path.exists(path):
+        table = Tablebase(name)
+        with open(path, "rb") as table_file:
+            if table_file.read(len(FILE_HEADER)) != FILE_HEADER:
+                raise ValueError("Geçersiz tablo dosyası: " + path)
+            table.values = array.array("b")
+            table.values.frombytes(table_file.read())
+        if len(table.values) != table.size:
+            raise ValueError("Tablo boyutu uyuşmuyor: " + path)
+    loaded_tables[name] = table
+    return table
+
+
+def getTableName(pieces):
+    """
+    [(taş, kare), ...] için (tablo adı, renkler çevrilecek mi).
+    """
+    sides = []
+    for color in "wb":
+        letters = sorted((piece[1].upper() for piece, square in pieces if piece[0] == color), key=PIECE_ORDER.index)
+        sides.append("".join(letters))
+    white, black = sides
+    if sideStrength(black) > sideStrength(white):
+        return black + "v" + white, True
+    return white + "v" + black, False
+
+
+def sideStrength(side):
+    return sum(PIECE_VALUES[letter] for letter in side), [-PIECE_ORDER.index(letter) for letter in side]
+
+
+def probePieces(pieces, white_to_move):
+    """
+    [(taş, kare), ...] ile verilen pozisyonun tablo değeri; tablo yoksa None.
+    """
+    name, flip = getTableName(pieces)
+    if name in DRAWN_ENDINGS:
+        return 0
+    table = loadTable(name)
+    if table is None:
+        return None
+    if flip:
+        pieces = [(("b" if piece[0] == "w" else "w") + piece[1], square ^ 56) for piece, square in pieces]
+        white_to_move = not white_to_move
+    return table.values[table.getIndex(table.orderSquares(pieces), white_to_move)]
+
+
+def probe(game_state):
+    """
+    Pozisyonun tablo değeri; taş sayısı fazlaysa, rok hakkı varsa ya da tablo yoksa None.
+    """
+    global available_tables
+    if game_state.piece_count > MAX_PIECES or game_state.current_castling_rights.getIndex():
+        return None
+    if available_tables is None:
+        directory = TABLEBASE_DIRECTORY
+        available_tables = set(file_name[:-4] for file_name in os.listdir(directory)
+                               if file_name.endswith(".dtm")) if os.path.isdir(directory) else set()
+    if not available_tables:
+        return None
+    pieces = []
+    for row, board_row in enumerate(game_state.board):
+        for col, piece in enumerate(board_row):
+            if piece != "--":
+                pieces.append((piece, row * 8 + col))
+    name, flip = getTableName(pieces)
+    if name not in available_tables and name not in DRAWN_ENDINGS:
+        return None
+    return probePieces(pieces, game_state.white_to_move)
+
+
+def valueScore(value):
+    """
+    Tablo değerini karşılaştırılabilir puana çevirir: kısa galibiyet en iyi, uzun yenilgi kısa yenilgiden iyi.
+    """
+    if value > 0:
+        return 1000 - value
+    if value < 0:
+        return -1000 - value - 1
+    return 0
+
+
+def findTablebaseMove(game_state):
+    """
+    Pozisyon tablodaysa en iyi hamle (kazanırken en kısa mat, kaybederken en uzun direniş); değilse None.
+    """
+    if probe(game_state) is None:
+        return None
+    best_move = None
+    best_score = None
+    for move in game_state.getValidMoves():
+        game_state.makeMove(move)
+        value = probe(game_state)
+        game_state.undoMove()
+        if value is None:
+            return None  # taş yeme ya da terfi tablosu olmayan bir oyun sonuna gidiyor
+        score = -valueScore(value)
+        if best_score is None or score > best_score:
+            best_move, best_score = move, score
+    return best_move
+
+
+def getAllEndings(piece_count):
+    """
+    piece_count taşlı, tablo gerektiren tüm oyun sonu adları (iki tarafın da piyonu olanlar hariç).
+    """
+    names = []
+    for extra_pieces in itertools.combinations_with_replacement("QRBNP", piece_count - 2):
+        for white_count in range(len(extra_pieces), -1, -1):
+            for white_extra in set(itertools.combinations(extra_pieces, white_count)):
+                black_extra = list(extra_pieces)
+                for letter in white_extra:
+                    black_extra.remove(letter)
+                if "P" in white_extra and "P" in black_extra:
+                    continue
+                name, flip = getTableName([("w" + letter, 0) for letter in "K" + "".join(white_extra)] +
+                                          [("b" + letter, 0) for letter in "K" + "".join(black_extra)])
+                if name not in names and name not in DRAWN_ENDINGS:
+                    names.append(name)
+    return names
+
+
+def getRequiredTables(name):
+    """
+    Taş yeme ve terfiyle ulaşılan, önce üretilmesi gereken tablolar.
+    """
+    white, black = name.split("v")
+    required = []
+    for side_index, side in enumerate((white, black)):
+        for i, letter in enumerate(side):
+            if letter == "K":
+                continue
+            replacements = [""] + (list("QRBN") if letter == "P" else [])
+            for replacement in replacements:
+                new_side = side[:i] + replacement + side[i + 1:]
+                new_sides = [white, black]
+                new_sides[side_index] = new_side
+                pieces = [(color + letter, 0) for color, new_side in zip("wb", new_sides) for letter in new_side]
+                table_name = getTableName(pieces)[0]
+                if table_name not in DRAWN_ENDINGS and table_name not in required:
+                    required.append(table_name)
+    return required
+
+
+def generateTable(name):
+    """
+    Tabloyu geriye doğru analizle üretir. Alt tablolar (taş yeme ve terfi sonrası) yüklenebilir olmalıdır.
+    1. Her pozisyon bir kez kurulur, geçerli hamleleri üretilir: matlar 0. seviyedir; taş yeme ve terfi
+       hamlelerinin değeri alt tablodan okunur ve ilgili seviyeye ertelenir.
+    2. Seviye seviye ilerlenir: tek seviyede, yeni mat olan pozisyonların bir önceki pozisyonları (geri hamleler)
+       kazanır; çift seviyede, yeni kazanan pozisyonların öncülleri tüm hamleleri kaybettiriyorsa kaybeder.
+    Hiçbir seviyede çözülmeyen pozisyonlar beraberedir.
+    """
+    table = Tablebase(name)
+    values = array.array("b", bytes(table.size))
+    status = bytearray(table.size)
+    # FEN'de iki şah bulunmalı; tahta yalnızca şahlarla kurulup boşaltılır, taşları setPosition yerleştirir
+    game_state = ChessEngine.GameState("4k3/8/8/8/8/8/8/4K3 w - - 0 1")
+    board = game_state.board
+    board[0][4] = board[7][4] = "--"
+    black_king_index = table.black_king_index
+    pieces = table.pieces
+    win_schedule = {}  # seviye -> taş yeme/terfiyle o seviyede kazanan pozisyonlar
+    loss_schedule = {}  # seviye -> taş yeme/terfi hamleleri en geç o seviyede kaybettiren pozisyonlar
+    frontier = []
+    placed_squares = []
+
+    def setPosition(squares, white_to_move):
+        for square in placed_squares:
+            board[square >> 3][square & 7] = "--"
+        placed_squares[:] = squares
+        for piece, square in zip(pieces, squares):
+            board[square >> 3][square & 7] = piece
+        game_state.white_king_location = (squares[0] >> 3, squares[0] & 7)
+        game_state.black_king_location = (squares[black_king_index] >> 3, squares[black_king_index] & 7)
+        game_state.white_to_move = white_to_move
+
+    def getChildren(squares, white_to_move):
+        """
+        Geçerli hamlelerden sonraki pozisyonlar: (tablo içi dizin, None) ya da (None, alt tablo değeri).
+        """
+        children = []
+        for move in game_state.getValidMoves():
+            start_square, end_square = move & 63, move >> 6 & 63
+            moving_index = squares.index(start_square)
+            if move & ChessEngine.MOVE_TACTICAL:
+                child_pieces = []
+                for piece, square in zip(pieces, squares):
+                    if square == start_square:
+                        if move >> 23 & 15:
+                            piece = ChessEngine.code_pieces[move >> 23 & 15]
+                        child_pieces.append((piece, end_square))
+                    elif square != end_square:
+                        child_pieces.append((piece, square))
+                value = probePieces(child_pieces, not white_to_move)
+                if value is None:
+                    raise ValueError("Önce üretilmesi gereken tablo: " + getTableName(child_pieces)[0])
+                children.append((None, value))
+            else:
+                child_squares = list(squares)
+                child_squares[moving_index] = end_square
+                children.append((table.getIndex(child_squares, not white_to_move), None))
+        return children
+
+    def resolve(index, squares, white_to_move, value, resolved):
+        for resolved_index in (index, table.getTwinIndex(squares, white_to_move)):
+            if resolved_index is not None and status[resolved_index] == UNKNOWN:
+                values[resolved_index] = value
+                status[resolved_index] = RESOLVED
+                resolved.append(resolved_index)
+
+    # 1. geçerlilik, matlar ve alt tablolara giden hamleler
+    for index in range(table.size):
+        squares, white_to_move = table.getSquares(index)
+        if len(set(squares)) != len(squares) or any(
+                piece[1] == "p" and square >> 3 in (0, 7) for piece, square in zip(pieces, squares)):
+            status[index] = ILLEGAL
+            continue
+        setPosition(squares, not white_to_move)
+        if game_state.inCheck():  # sırası olmayan taraf şah altında
+            status[index] = ILLEGAL
+            continue
+        game_state.white_to_move = white_to_move
+        children = getChildren(squares, white_to_move)
+        if not children:
+            if game_state.checkmate:
+                resolve(index, squares, white_to_move, -1, frontier)
+            else:
+                status[index] = RESOLVED  # pat
+            continue
+        conversion_values = [value for child_index, value in children if child_index is None]
+        if not conversion_values:
+            continue
+        wins = [-value for value in conversion_values if value < 0]
+        if wins:
+            win_schedule.setdefault(min(wins), []).append(index)
+        elif all(value > 0 for value in conversion_values):
+            loss_schedule.setdefault(max(conversion_values) + 1, []).append(index)
+
+    # 2. seviye seviye geriye doğru analiz
+    level = 0
+    while frontier or any(scheduled > level for scheduled in list(win_schedule) + list(loss_schedule)):
+        level += 1
+        if level > 126:
+            raise ValueError(name + ": mat uzaklığı 126 yarım hamleyi aşıyor")
+        candidates = []
+        for index in frontier:
+            squares, white_to_move = table.getSquares(index)
+            for predecessor in getPredecessors(table, squares, white_to_move):
+                predecessor_index = table.getIndex(predecessor, not white_to_move)
+                if status[predecessor_index] == UNKNOWN:
+                    candidates.append(predecessor_index)
+        resolved = []
+        if level % 2:
+            candidates.extend(win_schedule.pop(level, ()))
+            for index in candidates:
+                if status[index] == UNKNOWN:
+                    squares, white_to_move = table.getSquares(index)
+                    resolve(index, squares, white_to_move, level, resolved)
+        else:
+            candidates.extend(loss_schedule.pop(level, ()))
+            for index in candidates:
+                if status[index] != UNKNOWN:
+                    continue
+                squares, white_to_move = table.getSquares(index)
+                setPosition(squares, white_to_move)
+                # tüm hamleler rakibe en geç level - 1 yarım hamlede kazandırıyorsa kayıp
+                for child_index, value in getChildren(squares, white_to_move):
+                    if child_index is not None:
+                        if status[child_index] != RESOLVED:
+                            break
+                        value = values[child_index]
+                    if value <= 0 or value >= level:
+                        break
+                else:
+                    resolve(index, squares, white_to_move, -level - 1, resolved)
+        frontier = resolved
+    table.values = values
+    return table
+
+
+def getPredecessors(table, squares, white_to_move):
+    """
+    Pozisyona sessiz bir hamleyle (taş yemeden ve terfi etmeden) gelinebilecek önceki pozisyonların kareleri.
+    Hamleyi yapan taraf sıradaki tarafın rakibidir; geçerlilik dizin durumundan okunur.
+    """
+    mover_color = "b" if white_to_move else "w"
+    occupied = set(squares)
+    for i, piece in enumerate(table.pieces):
+        if piece[0] != mover_color:
+            continue
+        square = squares[i]
+        row, col = square >> 3, square & 7
+        origins = []
+        if piece[1] == "p":
+            step = 1 if mover_color == "w" else -1  # beyaz piyon bir alt satırdan gelmiştir
+            origin = square + step * 8
+            if 1 <= row + step <= 6 and origin not in occupied:
+                origins.append(origin)
+                if row == (4 if mover_color == "w" else 3) and origin + step * 8 not in occupied:
+                    origins.append(origin + step * 8)
+        elif piece[1] == "N" or piece[1] == "K":
+            targets = ChessEngine.knight_targets if piece[1] == "N" else ChessEngine.king_targets
+            origins = [origin_row * 8 + origin_col for origin_row, origin_col in targets[row][col]
+                       if origin_row * 8 + origin_col not in occupied]
+        else:
+            directions = range(4) if piece[1] == "R" else range(4, 8) if piece[1] == "B" else range(8)
+            for direction_index in directions:
+                for origin_row, origin_col in ChessEngine.direction_rays[row][col][direction_index]:
+                    if origin_row * 8 + origin_col in occupied:
+                        break
+                    origins.append(origin_row * 8 + origin_col)
+        for origin in origins:
+            predecessor = list(squares)
+            predecessor[i] = origin
+            yield predecessor
+
+
+def generateTables(names, directory):
+    """
+    Tabloları ve gerektirdikleri alt tabloları (dosyası yoksa) sırayla üretip diske yazar.
+    """
+    for name in names:
+        if loadTable(name, directory) is not None:
+            continue
+        generateTables(getRequiredTables(name), directory)
+        start_time = time.perf_counter()
+        table = generateTable(name)
+        table.save(directory)
+        loaded_tables[name] = table
+        if available_tables is not None:
+            available_tables.add(name)
+        wins = sum(1 for value in table.values if value > 0)
+        losses = sum(1 for value in table.values if value < 0)
+        print("%-8s %9d dizin, %8d kazanç, %8d kayıp, en uzun mat %d yarım hamle, %.1f sn" % (
+            name, table.size, wins, losses, max(table.values), time.perf_counter() - start_time))
+
+
+def main():
+    global TABLEBASE_DIRECTORY
+    parser = argparse.ArgumentParser(description="Oyun sonu tablolarını üretir ya da bir pozisyonu sorgular")
+    parser.add_argument("endings", nargs="*", help="üretilecek oyun sonları (varsayılan: 3 taşlılar)")
+    parser.add_argument("--four", action="store_true", help="tüm 4 taşlı oyun sonlarını da üret")
+    parser.add_argument("--directory", default=TABLEBASE_DIRECTORY, help="tablo dizini (varsayılan tablebases)")
+    parser.add_argument("--probe", metavar="FEN", help="üretmek yerine pozisyonun değerini ve en iyi hamlesini yaz")
+    args = parser.parse_args()
+    TABLEBASE_DIRECTORY = args.directory
+    if args.probe is not None:
+        game_state = ChessEngine.GameState(args.probe)
+        value = probe(game_state)
+        if value is None:
+            print("tabloda yok")
+        elif value == 0:
+            print("beraberlik")
+        else:
+            print("%s %d yarım hamlede" % ("mat eder" if value > 0 else "mat olur", value if value > 0 else -value - 1))
+        best_move = findTablebaseMove(game_state)
+        if best_move is not None:
+            print("en iyi hamle: " + ChessEngine.Move.fromPacked(best_move).getUciNotation())
+        return
+    endings = list(args.endings) or list(THREE_PIECE_ENDINGS)
+    if args.four:
+        endings += [name for name in getAllEndings(4) if name not in endings]
+    for name in endings:
+        if getTableName([(color + letter, 0) for color, side in zip("wb", name.split("v"))
+                         for letter in side])[0] != name:
+            parser.error("geçersiz oyun sonu adı (güçlü taraf beyaz olmalı): " + name)
+    generateTables(endings, args.directory)
+
+
+if __name__ == "__main__":
+    main()
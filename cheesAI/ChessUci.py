@@ -0,0 +1,244 @@
+"""
+UCI protokolü ön yüzü.
+Standart girdiden UCI komutlarını okur, standart çıktıya yanıt yazar; pygame içe aktarılmaz, pencere açılmaz.
+ChessEngine ve ChessAI ilk "isready", "position" ya da "go" komutunda içe aktarılır; böylece "uci" yanıtı
+milisaniyeler içinde gelir ve maç yöneticisi altında yüzlerce örnek ekransız sunucularda hızla başlatılabilir.
+Desteklenen komutlar: uci, isready, ucinewgame, setoption (Threads, OwnBook), position (startpos | fen ... moves ...),
+go (wtime btime winc binc movestogo movetime depth infinite), stop, quit.
+Arama ayrı bir iş parçacığında yapılır; her tamamlanan iterasyondan sonra "info" satırı yazılır.
+Kullanım: python ChessUci.py
+"""
+import queue
+import sys
+import threading
+
+ENGINE_NAME = "PythonChessAI"
+ENGINE_AUTHOR = "Hasan Kaya Yanıkömeroğlu"
+MOVES_TO_GO = 30  # movestogo verilmezse kalan sürenin bu kadar hamleye yetmesi beklenir
+MOVE_OVERHEAD = 0.05  # iletişim gecikmesi için her hamle bütçesinden düşülen süre (saniye)
+MIN_TIME_LIMIT = 0.01  # süre ne kadar az kalırsa kalsın en az bu kadar düşünülür (saniye)
+
+# ilk kullanımda içe aktarılır, bkz. loadEngine
+ChessAI = None
+ChessEngine = None
+
+
+def loadEngine():
+    """
+    Motor modüllerini içe aktarır; ChessEngine'in tabloları ve ChessAI'nin bağımlılıkları
+    ancak ilk ihtiyaç duyulduğunda kurulur.
+    """
+    global ChessAI, ChessEngine
+    if ChessAI is None:
+        import ChessAI
+        import ChessEngine
+
+
+def computeTimeLimit(options, white_to_move):
+    """
+    "go" parametrelerinden hamle başına süre (saniye); süre sınırı yoksa None.
+    Kalan süre movestogo (verilmezse MOVES_TO_GO) hamleye bölünür ve artışın çoğu eklenir,
+    ama kalan sürenin yarısı hiç geçilmez.
+    """
+    if "infinite" in options:
+        return None
+    if "movetime" in options:
+        return max(options["movetime"] / 1000.0 - MOVE_OVERHEAD, MIN_TIME_LIMIT)
+    remaining = options.get("wtime" if white_to_move else "btime")
+    if remaining is None:
+        return None if "depth" in options else ChessAI.TIME_LIMIT
+    remaining /= 1000.0
+    increment = options.get("winc" if white_to_move else "binc", 0) / 1000.0
+    time_limit = min(remaining / options.get("movestogo", MOVES_TO_GO) + 0.75 * increment, remaining / 2)
+    return max(time_limit - MOVE_OVERHEAD, MIN_TIME_LIMIT)
+
+
+def formatScore(score):
+    """
+    Sıradaki taraf açısından piyon cinsinden skoru UCI biçimine çevirir. Mat puanı CHECKMATE - ply,
+    oyun sonu tablosu puanı TABLEBASE_WIN - ply olduğundan mat uzaklığı her ikisinde de puandan çıkarılır.
+    """
+    if abs(score) >= ChessAI.MATE_BOUND:
+        moves = (ChessAI.CHECKMATE - int(round(abs(score))) + 1) // 2
+        return "mate %d" % (moves if score > 0 else -moves)
+    if abs(score) > ChessAI.TABLEBASE_WIN // 2:
+        moves = (ChessAI.TABLEBASE_WIN - int(abs(score)) + 1) // 2
+        return "mate %d" % (moves if score > 0 else -moves)
+    return "cp %d" % round(score * 100)
+
+
+class UciEngine:
+    """
+    Protokol durumu: mevcut pozisyon, bu pozisyona götüren hamleler ve arama iş parçacığı.
+    Aynı oyunda her "position" komutu tüm hamle listesini yeniden gönderir; liste öncekinin devamıysa
+    yalnızca yeni hamleler yapılır.
+    """
+
+    def __init__(self, output=sys.stdout):
+        self.output = output
+        self.output_lock = threading.Lock()  # arama iş parçacığı ve ana döngü aynı anda yazabilir
+        self.game_state = None
+        self.start_fen = None  # None ise başlangıç pozisyonu
+        self.move_strings = []
+        self.search_thread = None
+        self.stop_event = threading.Event()
+        self.use_book = True
+
+    def send(self, line):
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def run(self, commands=sys.stdin):
+        for command in commands:
+            if not self.handleCommand(command.split()):
+                break
+        self.waitForSearch(stop=True)
+        if ChessAI is not None:
+            ChessAI.closeSearchPool()
+
+    def handleCommand(self, tokens):
+        """
+        Tek bir komutu işler; "quit" gelirse False döndürür. Bilinmeyen komutlar yok sayılır.
+        """
+        if not tokens:
+            return True
+        command = tokens[0]
+        if command == "uci":
+            self.send("id name " + ENGINE_NAME)
+            self.send("id author " + ENGINE_AUTHOR)
+            self.send("option name Threads type spin default 1 min 1 max 64")
+            self.send("option name OwnBook type check default true")
+            self.send("uciok")
+        elif command == "isready":
+            loadEngine()
+            self.send("readyok")
+        elif command == "setoption":
+            self.setOption(tokens)
+        elif command == "ucinewgame":
+            self.waitForSearch(stop=True)
+            loadEngine()
+            ChessAI.transposition_table.clear()
+            ChessAI.history_scores.clear()
+            self.game_state = None
+        elif command == "position":
+            self.waitForSearch(stop=True)
+            self.setPosition(tokens[1:])
+        elif command == "go":
+            self.waitForSearch(stop=True)
+            self.startSearch(tokens[1:])
+        elif command == "stop":
+            self.waitForSearch(stop=True)
+        elif command == "quit":
+            return False
+        return True
+
+    def setOption(self, tokens):
+        """
+        "setoption name <ad> value <değer>"; ad ve değer boşluk içerebilir.
+        """
+        text = " ".join(tokens[1:])
+        name, separator, value = text.partition(" value ")
+        name = name[len("name "):].strip().lower() if name.startswith("name ") else name.strip().lower()
+        loadEngine()
+        if name == "threads":
+            ChessAI.SEARCH_WORKERS = max(1, int(value))
+            # havuz burada, ana iş parçacığında açılır: arama iş parçacığında açılsaydı çatallanan süreçler
+            # ana iş parçacığının standart girdi okurken tuttuğu kilidi kilitli devralıp takılırdı
+            ChessAI.closeSearchPool()
+            if ChessAI.SEARCH_WORKERS > 1:
+                ChessAI.getSearchPool(ChessAI.SEARCH_WORKERS)
+        elif name == "ownbook":
+            self.use_book = value.strip().lower() == "true"
+
+    def setPosition(self, tokens):
+        """
+        "startpos" ya da "fen <6 alan>", ardından isteğe bağlı "moves <hamleler>".
+        """
+        loadEngine()
+        if "moves" in tokens:
+            index = tokens.index("moves")
+            position_tokens, move_strings = tokens[:index], tokens[index + 1:]
+        else:
+            position_tokens, move_strings = tokens, []
+        start_fen = " ".join(position_tokens[1:]) if position_tokens and position_tokens[0] == "fen" else None
+        if self.game_state is not None and start_fen == self.start_fen and \
+                move_strings[:len(self.move_strings)] == self.move_strings:
+            new_moves = move_strings[len(self.move_strings):]  # yalnızca son hamleler eklendi
+        else:
+            self.game_state = ChessEngine.GameState(start_fen)
+            self.start_fen = start_fen
+            self.move_strings = []
+            new_moves = move_strings
+        for move_string in new_moves:
+            move = self.findMove(move_string)
+            if move is None:
+                self.send("info string geçersiz hamle " + move_string)
+                break
+            self.game_state.makeMove(move)
+            self.move_strings.append(move_string)
+
+    def findMove(self, move_string):
+        """
+        Uzun cebirsel gösterimdeki hamleyi geçerli paketlenmiş hamleler arasında bulur; yoksa None.
+        """
+        for move in self.game_state.getValidMoves():
+            if ChessEngine.Move.fromPacked(move).getUciNotation() == move_string:
+                return move
+        return None
+
+    def startSearch(self, tokens):
+        options = {}
+        for index, token in enumerate(tokens):
+            if token == "infinite":
+                options[token] = True
+            elif token in ("wtime", "btime", "winc", "binc", "movestogo", "movetime", "depth") and \
+                    index + 1 < len(tokens):
+                options[token] = int(tokens[index + 1])
+        loadEngine()
+        if self.game_state is None:
+            self.game_state = ChessEngine.GameState()
+        self.stop_event.clear()
+        self.search_thread = threading.Thread(target=self.search, args=(options,), daemon=True)
+        self.search_thread.start()
+
+    def waitForSearch(self, stop):
+        if self.search_thread is not None:
+            if stop:
+                self.stop_event.set()
+            self.search_thread.join()
+            self.search_thread = None
+
+    def search(self, options):
+        """
+        Arama iş parçacığı. "infinite" aramada sonuç "stop" gelene kadar yazılmaz.
+        """
+        valid_moves = self.game_state.getValidMoves()
+        best_move = None
+        if valid_moves:
+            ChessAI.search_interrupt = self.stop_event.is_set
+            best_move = ChessAI.findBestMove(
+                self.game_state, valid_moves, queue.Queue(),
+                time_limit=computeTimeLimit(options, self.game_state.white_to_move),
+                max_depth=options.get("depth", ChessAI.MAX_DEPTH), use_book=self.use_book,
+                on_iteration=self.sendInfo)[0]
+            if best_move is None:
+                best_move = ChessAI.findRandomMove(valid_moves)
+        if "infinite" in options:
+            self.stop_event.wait()
+        self.send("bestmove " + (ChessEngine.Move.fromPacked(best_move).getUciNotation() if best_move is not None
+                                 else "0000"))
+
+    def sendInfo(self, statistics):
+        self.send("info depth %d score %s nodes %d nps %d time %d pv %s" % (
+            statistics.depth, formatScore(statistics.score), statistics.counters["nodes_searched"],
+            statistics.nodesPerSecond(), statistics.elapsed * 1000,
+            " ".join(ChessEngine.Move.fromPacked(move).getUciNotation() for move in statistics.line)))
+
+
+def main():
+    UciEngine().run()
+
+
+if __name__ == "__main__":
+    main()
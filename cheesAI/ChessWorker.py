@@ -0,0 +1,290 @@
+"""
+Kalıcı yapay zeka süreci.
+Oyun boyunca tek bir süreç çalışır ve kendi GameState kopyasını tutar; arayüz ona her hamlede
+tüm oyun durumunu değil yalnızca son hamleyi (ya da yeni pozisyon için FEN) boru üzerinden gönderir.
+Transpozisyon ve geçmiş tabloları süreçte kaldığı için hamleler arasında sıcak kalır.
+Arama sürerken gelen herhangi bir komut aramayı keser; iptal edilen aramanın sonucu gönderilmez.
+
+Düşünme (ponder): yapay zeka hamlesini oynadıktan sonra insanın beklenen cevabını tahtaya koyup
+insan düşünürken aramaya devam eder. İnsan beklenen hamleyi oynarsa (isabet) arama kesilmez,
+düşünmeye başladığı andan itibaren normal süresini alır; başka bir hamle oynarsa arama kesilir,
+beklenen hamle geri alınır ve yeni arama transpozisyon tablosunda kalanlarla başlar.
+"""
+import atexit
+import collections
+import queue
+import time
+from multiprocessing import Pipe, Process
+import ChessAI
+import ChessEngine
+
+
+class EngineProcess:
+    """
+    Yapay zeka sürecinin tarafı. Komutlar demet olarak gelir:
+    ("position", fen), ("move", hamle), ("undo",), ("go", arama no, süre, derinlik),
+    ("ponder", süre, derinlik), ("cancel",), ("quit",).
+    Tamamlanan arama ("bestmove", arama no, hamle) olarak yanıtlanır; "go" aramasında her tamamlanan
+    iterasyondan sonra ve arama bitince ("info", arama no, ChessAI.SearchStatistics) da gönderilir.
+    """
+
+    def __init__(self, connection, fen=None):
+        self.connection = connection
+        self.game_state = ChessEngine.GameState(fen)
+        self.pending_commands = collections.deque()  # arama sırasında okunmuş, henüz işlenmemiş komutlar
+        self.ponder_move = None  # düşünme sırasında tahtaya konmuş beklenen insan hamlesi
+        self.ponder_hit = False
+        self.ponder_start = 0.0
+        self.ponder_time_limit = None
+        self.ponder_search_id = None  # isabetten sonra gelen "go" komutunun numarası
+        self.ponder_result = None  # insan oynamadan biten düşünmenin sonucu
+        self.ponder_statistics = None  # düşünmenin son istatistikleri; arama numarası gelince gönderilir
+        self.last_line = []  # son "go" aramasının ana varyantı; beklenen insan hamlesi ikinci hamlesidir
+
+    def run(self):
+        ChessAI.search_interrupt = self.isInterrupted
+        while True:
+            if self.pending_commands:
+                command = self.pending_commands.popleft()
+            else:
+                try:
+                    command = self.connection.recv()
+                except EOFError:  # arayüz kapandı
+                    break
+            if command[0] == "quit":
+                break
+            self.handleCommand(command)
+        ChessAI.closeSearchPool()
+        self.connection.close()
+
+    def handleCommand(self, command):
+        if command[0] == "move" and self.ponder_move is not None:
+            if command[1] == self.ponder_move:
+                self.ponder_hit = True  # hamle zaten tahtada
+                return
+            self.stopPondering()
+        elif command[0] == "go" and self.ponder_hit and self.ponder_result is not None:
+            if self.ponder_statistics is not None:
+                self.connection.send(("info", command[1], self.ponder_statistics))
+            self.connection.send(("bestmove", command[1], self.ponder_result))
+            self.stopPondering(keep_move=True)
+            return
+        elif self.ponder_move is not None:
+            self.stopPondering(keep_move=self.ponder_hit)
+
+        if command[0] == "position":
+            self.game_state = ChessEngine.GameState(command[1])
+        elif command[0] == "move":
+            self.game_state.makeMove(command[1])
+        elif command[0] == "undo":
+            self.game_state.undoMove()
+        elif command[0] == "go":
+            search_id, time_limit, max_depth = command[1:]
+            best_move = self.search(time_limit, max_depth, search_id)
+            if not self.isCommandWaiting():  # yeni bir komutla kesilen aramanın sonucu geçersizdir
+                self.connection.send(("bestmove", search_id, best_move))
+        elif command[0] == "ponder":
+            self.ponder(*command[1:])
+        # "cancel" yalnızca aramayı kesmek içindir, başka iş gerektirmez
+
+    def isCommandWaiting(self):
+        return bool(self.pending_commands) or self.connection.poll()
+
+    def search(self, time_limit, max_depth, search_id):
+        """
+        Mevcut pozisyonu arar; geçerli hamle yoksa None döndürür. İstatistikler arama sürerken gönderilir.
+        """
+        valid_moves = self.game_state.getValidMoves()
+        if not valid_moves:
+            return None
+        return_queue = queue.Queue()
+
+        def sendStatistics(statistics):
+            self.connection.send(("info", search_id, statistics))
+
+        best_move, score, self.last_line, statistics = ChessAI.findBestMove(
+            self.game_state, valid_moves, return_queue, time_limit=time_limit, max_depth=max_depth,
+            on_iteration=sendStatistics)
+        sendStatistics(statistics)
+        if best_move is None:
+            best_move = ChessAI.findRandomMove(valid_moves)
+        return best_move
+
+    def ponder(self, time_limit, max_depth):
+        """
+        Beklenen insan hamlesini yapar ve süre sınırı olmadan arar. Beklenen hamle son aramanın ana
+        varyantındaki ikinci hamledir; varyant kısaysa ya da oynanan hamleyle başlamıyorsa transpozisyon
+        tablosundaki en iyi hamle kullanılır.
+        İsabet olursa süre sınırı düşünmenin başladığı andan itibaren işler.
+        İstatistikler arama numarası ("go" ile) gelince o numarayla gönderilir.
+        """
+        move_log = self.game_state.move_log
+        if len(self.last_line) > 1 and move_log and move_log[-1] == self.last_line[0]:
+            expected_move = self.last_line[1]
+        else:
+            entry = ChessAI.transposition_table.probe(self.game_state.zobrist_key)
+            expected_move = entry[4] if entry is not None else None
+        if expected_move is None or expected_move not in self.game_state.getValidMoves():
+            return  # beklenen hamle yok, düşünülmez
+        self.ponder_move = expected_move
+        self.ponder_hit = False
+        self.ponder_search_id = None
+        self.ponder_result = None
+        self.ponder_statistics = None
+        self.ponder_time_limit = time_limit
+        self.ponder_start = time.time()
+        self.game_state.makeMove(self.ponder_move)
+        valid_moves = self.game_state.getValidMoves()
+        if not valid_moves:
+            return
+        return_queue = queue.Queue()
+
+        def storeStatistics(statistics):
+            self.ponder_statistics = statistics
+            if self.ponder_search_id is not None:
+                self.connection.send(("info", self.ponder_search_id, statistics))
+
+        best_move, score, line, statistics = ChessAI.findBestMove(self.game_state, valid_moves, return_queue,
+                                                                  time_limit=None, max_depth=max_depth,
+                                                                  on_iteration=storeStatistics)
+        self.ponder_statistics = statistics
+        self.last_line = line  # isabette sonraki düşünme bu varyanttan beklenen hamleyi alır
+        # araya giren komutlar pending_commands'tadır; boruda bekleyen "go" ise sonucu geçersiz kılmaz
+        if self.ponder_hit and not self.pending_commands:
+            if best_move is None:
+                best_move = ChessAI.findRandomMove(valid_moves)
+            if self.ponder_search_id is not None:
+                self.connection.send(("info", self.ponder_search_id, statistics))
+                self.connection.send(("bestmove", self.ponder_search_id, best_move))
+                self.stopPondering(keep_move=True)
+            else:
+                self.ponder_result = best_move  # "go" gelince hemen gönderilir
+        elif not ChessAI.search_stopped:
+            self.ponder_result = best_move  # insan henüz oynamadı, arama derinlik sınırında bitti
+
+    def stopPondering(self, keep_move=False):
+        """
+        Düşünme durumunu temizler; iskada beklenen hamle tahtadan geri alınır.
+        """
+        if self.ponder_move is not None and not keep_move:
+            self.game_state.undoMove()
+        self.ponder_move = None
+        self.ponder_hit = False
+        self.ponder_search_id = None
+        self.ponder_result = None
+        self.ponder_statistics = None
+
+    def ponderDeadline(self):
+        """
+        İsabetten sonraki süre sınırı: düşünmenin başladığı an artı normal düşünme süresi.
+        """
+        return None if self.ponder_time_limit is None else self.ponder_start + self.ponder_time_limit
+
+    def isInterrupted(self):
+        """
+        Arama sırasında 64 düğümde bir çağrılır. Normal aramada her yeni komut aramayı durdurur.
+        Düşünürken beklenen hamle gelirse süre başlatılır ve arama sürer; ardından gelen "go" da aramayı
+        durdurmaz, yalnızca sonucun hangi numarayla gönderileceğini belirler.
+        """
+        if not self.connection.poll():
+            return False
+        if self.ponder_move is None:
+            return True
+        command = self.connection.recv()
+        if command[0] == "move" and not self.ponder_hit and command[1] == self.ponder_move:
+            self.ponder_hit = True
+            ChessAI.search_deadline = self.ponderDeadline()
+            return False
+        if command[0] == "go" and self.ponder_hit and self.ponder_search_id is None:
+            self.ponder_search_id = command[1]
+            self.ponder_time_limit = command[2]
+            ChessAI.search_deadline = self.ponderDeadline()
+            if self.ponder_statistics is not None:  # düşünmenin şimdiye kadarki istatistikleri
+                self.connection.send(("info", self.ponder_search_id, self.ponder_statistics))
+            return False
+        self.pending_commands.append(command)
+        return True
+
+
+def workerLoop(connection, fen=None):
+    EngineProcess(connection, fen).run()
+
+
+class EngineWorker:
+    """
+    Arayüz tarafındaki vekil: yapay zeka sürecini başlatır, komut gönderir ve sonucu bloklamadan okur.
+    """
+
+    def __init__(self, fen=None):
+        self.connection, worker_connection = Pipe()
+        # daemon değil, çünkü paralel aramada kendi işçi süreçlerini açabilmeli;
+        # bu yüzden program çıkarken atexit ile kapatılır
+        self.process = Process(target=workerLoop, args=(worker_connection, fen))
+        self.process.start()
+        worker_connection.close()
+        atexit.register(self.quit)
+        self.search_id = 0
+        self.searching = False
+        self.statistics = None  # son aramanın en güncel ChessAI.SearchStatistics nesnesi
+
+    def setPosition(self, fen=None):
+        """
+        Yeni pozisyon; fen None ise başlangıç pozisyonu. Süren arama iptal edilir.
+        """
+        self.searching = False
+        self.connection.send(("position", fen))
+
+    def makeMove(self, move):
+        """
+        Oynanan hamleyi (paketlenmiş tamsayı ya da Move) yapay zekanın tahtasına uygular.
+        Düşünme sürerken beklenen hamleyse arama kesilmez.
+        """
+        self.connection.send(("move", move if isinstance(move, int) else move.packed))
+
+    def undoMove(self):
+        self.searching = False
+        self.connection.send(("undo",))
+
+    def startSearch(self, time_limit=ChessAI.TIME_LIMIT, max_depth=ChessAI.MAX_DEPTH):
+        self.search_id += 1
+        self.searching = True
+        self.connection.send(("go", self.search_id, time_limit, max_depth))
+
+    def startPondering(self, time_limit=ChessAI.TIME_LIMIT, max_depth=ChessAI.MAX_DEPTH):
+        """
+        Yapay zeka hamlesi makeMove ile bildirildikten sonra, insanın sırasında çağrılır.
+        time_limit isabet durumunda düşünmenin başından itibaren kullanılacak süredir.
+        """
+        self.connection.send(("ponder", time_limit, max_depth))
+
+    def cancel(self):
+        """
+        Süren aramayı ya da düşünmeyi keser; sonucu geldiyse de yok sayılır.
+        """
+        self.searching = False
+        self.connection.send(("cancel",))
+
+    def getBestMove(self):
+        """
+        Arama bittiyse en iyi hamleyi (paketlenmiş tamsayı) döndürür, bitmediyse None.
+        Eski aramalara ait yanıtlar atlanır; aramanın istatistikleri geldikçe self.statistics güncellenir.
+        """
+        while self.searching and self.connection.poll():
+            message = self.connection.recv()
+            if message[0] == "info" and message[1] == self.search_id:
+                self.statistics = message[2]
+            elif message[0] == "bestmove" and message[1] == self.search_id:
+                self.searching = False
+                return message[2]
+        return None
+
+    def quit(self):
+        if not self.process.is_alive():
+            return
+        try:
+            self.connection.send(("quit",))
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()